@@ -0,0 +1,153 @@
+"""promote packed wardrobe attributes to real columns
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+Gender, style, fabric and occasions used to live in a JSON string in
+``wardrobe_items.occasion``. This moves them into ``gender``, ``style``,
+``material`` and ``occasions`` plus the ``wardrobe_item_occasions``
+association table, back-filling existing rows.
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ITEM_INDEXES = {
+    "ix_wardrobe_items_category": ["category"],
+    "ix_wardrobe_items_material": ["material"],
+    "ix_wardrobe_items_style": ["style"],
+    "ix_wardrobe_items_gender": ["gender"],
+}
+
+
+def _inspect():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    inspector = _inspect()
+    columns = {c["name"] for c in inspector.get_columns("wardrobe_items")}
+
+    # Databases created before these columns existed on the model
+    with op.batch_alter_table("wardrobe_items") as batch:
+        for name, type_ in (
+            ("material", sa.String()),
+            ("style", sa.String()),
+            ("gender", sa.String()),
+            ("occasions", sa.JSON()),
+        ):
+            if name not in columns:
+                batch.add_column(sa.Column(name, type_, nullable=True))
+
+    if not inspector.has_table("wardrobe_item_occasions"):
+        op.create_table(
+            "wardrobe_item_occasions",
+            sa.Column("item_id", sa.Integer(), sa.ForeignKey("wardrobe_items.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("occasion", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("item_id", "occasion"),
+        )
+        op.create_index(
+            "ix_wardrobe_item_occasions_occasion_item",
+            "wardrobe_item_occasions",
+            ["occasion", "item_id"],
+        )
+
+    existing = {ix["name"] for ix in _inspect().get_indexes("wardrobe_items")}
+    for name, cols in ITEM_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "wardrobe_items", cols)
+
+    # Back-fill from the packed JSON blob
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, occasion, material, style, gender FROM wardrobe_items "
+        "WHERE occasion IS NOT NULL AND occasion != ''"
+    )).fetchall()
+
+    links = []
+    for row in rows:
+        try:
+            packed = json.loads(row.occasion)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(packed, dict):
+            continue
+
+        # Display values keep their case; only the lookup keys are lowercased
+        occasions, keys = [], []
+        for occasion in packed.get("occasions") or []:
+            display = str(occasion).strip()
+            key = display.lower()
+            if key and key not in keys:
+                occasions.append(display)
+                keys.append(key)
+
+        bind.execute(
+            sa.text(
+                "UPDATE wardrobe_items SET material = :material, style = :style, "
+                "gender = :gender, occasions = :occasions WHERE id = :id"
+            ),
+            {
+                "id": row.id,
+                "material": row.material or packed.get("fabric") or "",
+                "style": row.style or packed.get("style") or "",
+                "gender": row.gender or packed.get("gender") or "unisex",
+                "occasions": json.dumps(occasions),
+            },
+        )
+        links.extend({"item_id": row.id, "occasion": key} for key in keys)
+
+    if links:
+        occasions_table = sa.table(
+            "wardrobe_item_occasions",
+            sa.column("item_id", sa.Integer),
+            sa.column("occasion", sa.String),
+        )
+        op.bulk_insert(occasions_table, links)
+
+    print(f"✅ Back-filled attributes for {len(rows)} wardrobe items ({len(links)} occasion links)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, material, style, gender, occasions FROM wardrobe_items"
+    )).fetchall()
+
+    # Re-pack into the legacy JSON column so older code keeps working
+    for row in rows:
+        try:
+            occasions = json.loads(row.occasions) if row.occasions else []
+        except (TypeError, ValueError):
+            occasions = []
+        bind.execute(
+            sa.text("UPDATE wardrobe_items SET occasion = :packed WHERE id = :id"),
+            {
+                "id": row.id,
+                "packed": json.dumps({
+                    "gender": row.gender or "unisex",
+                    "style": row.style or "",
+                    "occasions": occasions,
+                    "fabric": row.material or "",
+                }),
+            },
+        )
+
+    existing = {ix["name"] for ix in _inspect().get_indexes("wardrobe_items")}
+    for name in ITEM_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="wardrobe_items")
+
+    op.drop_index("ix_wardrobe_item_occasions_occasion_item", table_name="wardrobe_item_occasions")
+    op.drop_table("wardrobe_item_occasions")
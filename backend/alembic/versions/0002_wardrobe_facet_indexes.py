@@ -0,0 +1,46 @@
+"""index the wardrobe facet columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 11:00:00
+
+Each facet count is a GROUP BY over one column. With an index on that
+column SQLite answers it from the index alone, without reading rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FACET_INDEXES = {
+    "ix_wardrobe_items_color": ["color"],
+    "ix_wardrobe_items_season": ["season"],
+    "ix_wardrobe_items_pattern": ["pattern"],
+    "ix_wardrobe_items_brand": ["brand"],
+}
+
+
+def _existing_indexes():
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("wardrobe_items")}
+
+
+def upgrade() -> None:
+    existing = _existing_indexes()
+    for name, cols in FACET_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "wardrobe_items", cols)
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    for name in FACET_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="wardrobe_items")
@@ -0,0 +1,258 @@
+"""normalized wardrobe colors with CIELAB coordinates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 13:00:00
+
+Adds the canonical palette name, palette family and LAB values next to
+the free-text color and back-fills them. The palette and normalization
+rules are frozen below as they stood at this revision, so the back-fill
+does not change when app.services.color_service does.
+"""
+import re
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLOR_COLUMNS = [
+    ("color_name", sa.String()),
+    ("color_family", sa.String()),
+    ("color_l", sa.Float()),
+    ("color_a", sa.Float()),
+    ("color_b", sa.Float()),
+]
+
+COLOR_INDEXES = {
+    "ix_wardrobe_items_color_name": ["color_name"],
+    "ix_wardrobe_items_color_family": ["color_family"],
+}
+
+
+# ========================================
+# FROZEN COLOR NORMALIZATION (palette v1)
+# ========================================
+
+# Canonical palette: name -> (hex, family). Family roots ("red", "blue", ...)
+# are palette entries themselves so a bare family word always resolves.
+PALETTE: Dict[str, Tuple[str, str]] = {
+    # Neutrals
+    "black": ("#000000", "black"),
+    "charcoal": ("#36454f", "grey"),
+    "grey": ("#808080", "grey"),
+    "silver": ("#c0c0c0", "grey"),
+    "white": ("#ffffff", "white"),
+    "off white": ("#faf9f6", "white"),
+    "ivory": ("#fffff0", "white"),
+    "cream": ("#fffdd0", "white"),
+    "beige": ("#f5f5dc", "beige"),
+    "nude": ("#e3bc9a", "beige"),
+    "khaki": ("#c3b091", "beige"),
+    "tan": ("#d2b48c", "brown"),
+    "camel": ("#c19a6b", "brown"),
+    "brown": ("#8b4513", "brown"),
+    "chocolate": ("#7b3f00", "brown"),
+    "coffee": ("#6f4e37", "brown"),
+    # Reds
+    "red": ("#d0021b", "red"),
+    "crimson": ("#dc143c", "red"),
+    "scarlet": ("#ff2400", "red"),
+    "cherry": ("#990f02", "red"),
+    "maroon": ("#800000", "red"),
+    "burgundy": ("#800020", "red"),
+    "wine": ("#722f37", "red"),
+    "rust": ("#b7410e", "orange"),
+    # Pinks
+    "pink": ("#ffc0cb", "pink"),
+    "blush pink": ("#de5d83", "pink"),
+    "baby pink": ("#f4c2c2", "pink"),
+    "hot pink": ("#ff69b4", "pink"),
+    "fuchsia": ("#ff00ff", "pink"),
+    "magenta": ("#ca1f7b", "pink"),
+    "rose": ("#ff007f", "pink"),
+    "peach": ("#ffcba4", "orange"),
+    "coral": ("#ff7f50", "orange"),
+    # Oranges and yellows
+    "orange": ("#ff8c00", "orange"),
+    "saffron": ("#f4c430", "yellow"),
+    "yellow": ("#ffd700", "yellow"),
+    "lemon yellow": ("#fff44f", "yellow"),
+    "mustard yellow": ("#e1ad01", "yellow"),
+    "gold": ("#d4af37", "yellow"),
+    # Greens
+    "green": ("#228b22", "green"),
+    "lime green": ("#32cd32", "green"),
+    "mint green": ("#98ff98", "green"),
+    "sage green": ("#9caf88", "green"),
+    "olive": ("#808000", "green"),
+    "emerald green": ("#50c878", "green"),
+    "bottle green": ("#006a4e", "green"),
+    "teal": ("#008080", "green"),
+    # Blues
+    "blue": ("#1f4fd1", "blue"),
+    "sky blue": ("#87ceeb", "blue"),
+    "baby blue": ("#89cff0", "blue"),
+    "powder blue": ("#b0e0e6", "blue"),
+    "turquoise": ("#40e0d0", "blue"),
+    "aqua": ("#00ffff", "blue"),
+    "denim blue": ("#1560bd", "blue"),
+    "royal blue": ("#4169e1", "blue"),
+    "cobalt blue": ("#0047ab", "blue"),
+    "navy blue": ("#000080", "blue"),
+    # Purples
+    "purple": ("#800080", "purple"),
+    "lavender": ("#e6e6fa", "purple"),
+    "lilac": ("#c8a2c8", "purple"),
+    "mauve": ("#e0b0ff", "purple"),
+    "violet": ("#8f00ff", "purple"),
+    "plum": ("#8e4585", "purple"),
+}
+
+# Spellings and short forms -> palette name
+ALIASES = {
+    "gray": "grey",
+    "charcoal grey": "charcoal",
+    "charcoal gray": "charcoal",
+    "navy": "navy blue",
+    "offwhite": "off white",
+    "mustard": "mustard yellow",
+    "emerald": "emerald green",
+    "mint": "mint green",
+    "sage": "sage green",
+    "lime": "lime green",
+    "olive green": "olive",
+    "bottle": "bottle green",
+    "blush": "blush pink",
+    "denim": "denim blue",
+    "cobalt": "cobalt blue",
+    "royal": "royal blue",
+    "wine red": "wine",
+    "maroon red": "maroon",
+    "golden": "gold",
+    "violet purple": "violet",
+    "multicolor": None,
+    "multicolour": None,
+    "multi": None,
+}
+
+# Modifiers shift lightness but keep the canonical name
+MODIFIERS = {
+    "light": 12.0,
+    "pale": 15.0,
+    "pastel": 15.0,
+    "soft": 6.0,
+    "bright": 4.0,
+    "dark": -14.0,
+    "deep": -10.0,
+    "dusty": -4.0,
+    "muted": -4.0,
+}
+
+WORD_RE = re.compile(r"[a-z]+")
+
+# Multi-word names first so "navy blue" wins over "blue"
+PHRASES = sorted(
+    list(PALETTE) + [alias for alias, target in ALIASES.items() if target],
+    key=lambda phrase: -len(phrase.split())
+)
+
+
+def hex_to_lab(hex_color: str) -> Tuple[float, float, float]:
+    """sRGB hex -> CIELAB (D65)"""
+    hex_color = hex_color.lstrip("#")
+    rgb = [int(hex_color[i:i + 2], 16) / 255.0 for i in (0, 2, 4)]
+    r, g, b = [c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in rgb]
+
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / 1.00000
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def canonical(phrase: str) -> Optional[str]:
+    if phrase in PALETTE:
+        return phrase
+    return ALIASES.get(phrase)
+
+
+def normalize(text: str) -> Optional[Tuple[str, str, Tuple[float, float, float]]]:
+    """Free-text color -> (palette name, family, LAB), None when it is not in the palette"""
+    words = WORD_RE.findall((text or "").lower())
+    if not words:
+        return None
+
+    shift = sum(MODIFIERS.get(word, 0.0) for word in words)
+    joined = " ".join(word for word in words if word not in MODIFIERS)
+
+    name = canonical(joined)
+    if not name:
+        padded = f" {joined} "
+        name = next((canonical(phrase) for phrase in PHRASES if f" {phrase} " in padded), None)
+    if not name:
+        return None
+
+    hex_color, family = PALETTE[name]
+    L, a, b = hex_to_lab(hex_color)
+    return name, family, (max(0.0, min(100.0, L + shift)), a, b)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("wardrobe_items")}
+
+    with op.batch_alter_table("wardrobe_items") as batch:
+        for name, type_ in COLOR_COLUMNS:
+            if name not in columns:
+                batch.add_column(sa.Column(name, type_, nullable=True))
+
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("wardrobe_items")}
+    for name, cols in COLOR_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "wardrobe_items", cols)
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, color FROM wardrobe_items WHERE color IS NOT NULL AND color != ''"
+    )).fetchall()
+
+    updates = []
+    for row in rows:
+        match = normalize(row.color)
+        if match:
+            name, family, (L, a, b) = match
+            updates.append({"id": row.id, "name": name, "family": family, "l": L, "a": a, "b": b})
+
+    if updates:
+        bind.execute(
+            sa.text(
+                "UPDATE wardrobe_items SET color_name = :name, color_family = :family, "
+                "color_l = :l, color_a = :a, color_b = :b WHERE id = :id"
+            ),
+            updates,
+        )
+
+    print(f"✅ Normalized colors for {len(updates)}/{len(rows)} wardrobe items")
+
+
+def downgrade() -> None:
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("wardrobe_items")}
+    for name in COLOR_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="wardrobe_items")
+
+    with op.batch_alter_table("wardrobe_items") as batch:
+        for name, _ in COLOR_COLUMNS:
+            batch.drop_column(name)
@@ -0,0 +1,34 @@
+"""per-user wardrobe revision counter
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 15:00:00
+
+Adds ``wardrobe_revisions``, bumped with every item write. The wardrobe
+read endpoints derive their ETags from it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("wardrobe_revisions"):
+        op.create_table(
+            "wardrobe_revisions",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("revision", sa.Integer(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("user_id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("wardrobe_revisions")
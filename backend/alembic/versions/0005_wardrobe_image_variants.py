@@ -0,0 +1,125 @@
+"""stored image variants for wardrobe items
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:00:00
+
+Adds ``wardrobe_items.image_variants`` (size-capped master plus
+thumbnail URLs) and re-encodes existing uploads. The ingest step is frozen
+below as the image service did it at this revision: <stem>.<ext> masters
+with <stem>_<size>.<ext> thumbnails in the flat uploads directory.
+"""
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, Sequence, Tuple, Union
+
+from alembic import op
+from PIL import Image, ImageOps, UnidentifiedImageError
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UPLOAD_DIR = Path(__file__).resolve().parents[3] / "frontend" / "uploads"
+UPLOAD_URL = "/uploads"
+
+IMAGE_MAX_SIDE = int(os.getenv("IMAGE_MAX_SIDE", "1600"))
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "82"))
+PIL_FORMAT, EXTENSION = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}.get(
+    os.getenv("IMAGE_FORMAT", "webp").lower(), ("WEBP", "webp")
+)
+
+THUMBNAIL_SIZES = {"sm": 160, "md": 320, "lg": 640}
+
+
+# ========================================
+# FROZEN INGEST
+# ========================================
+
+def encode(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    options = {"quality": IMAGE_QUALITY}
+    if PIL_FORMAT == "JPEG":
+        options.update(optimize=True, progressive=True)
+    else:
+        options.update(method=4)
+    image.save(buffer, PIL_FORMAT, **options)
+    return buffer.getvalue()
+
+
+def open_image(image_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft("RGB", (IMAGE_MAX_SIDE, IMAGE_MAX_SIDE))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ("RGBA", "LA", "P"):
+        # Flatten transparency onto white
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def ingest(image_bytes: bytes, stem: str) -> Tuple[str, Dict]:
+    """Store <stem>.<ext> plus thumbnails -> (master URL, variants); undecodable bytes are left as they are"""
+    try:
+        image = open_image(image_bytes)
+    except (UnidentifiedImageError, OSError) as e:
+        print(f"⚠️  Could not decode {stem} ({e}) - keeping original bytes")
+        filename = f"{stem}.jpg"
+        (UPLOAD_DIR / filename).write_bytes(image_bytes)
+        return f"{UPLOAD_URL}/{filename}", {"master": f"{UPLOAD_URL}/{filename}", "thumbnails": {}}
+
+    image.thumbnail((IMAGE_MAX_SIDE, IMAGE_MAX_SIDE), Image.LANCZOS)
+    master_name = f"{stem}.{EXTENSION}"
+    (UPLOAD_DIR / master_name).write_bytes(encode(image))
+
+    thumbnails = {}
+    for size_name, side in THUMBNAIL_SIZES.items():
+        thumb = image.copy()
+        thumb.thumbnail((side, side), Image.LANCZOS)
+        filename = f"{stem}_{size_name}.{EXTENSION}"
+        (UPLOAD_DIR / filename).write_bytes(encode(thumb))
+        thumbnails[size_name] = f"{UPLOAD_URL}/{filename}"
+
+    master_url = f"{UPLOAD_URL}/{master_name}"
+    return master_url, {"master": master_url, "width": image.width, "height": image.height, "thumbnails": thumbnails}
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("wardrobe_items")}
+    if "image_variants" not in columns:
+        with op.batch_alter_table("wardrobe_items") as batch:
+            batch.add_column(sa.Column("image_variants", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, image_url FROM wardrobe_items WHERE image_url LIKE :prefix"
+    ), {"prefix": f"{UPLOAD_URL}/%"}).fetchall()
+
+    ingested = 0
+    for row in rows:
+        path = UPLOAD_DIR / row.image_url[len(UPLOAD_URL) + 1:]
+        if not path.is_file():
+            continue
+        url, variants = ingest(path.read_bytes(), path.stem)
+        bind.execute(
+            sa.text("UPDATE wardrobe_items SET image_url = :url, image_variants = :variants WHERE id = :id"),
+            {"id": row.id, "url": url, "variants": json.dumps(variants)},
+        )
+        ingested += 1
+
+    print(f"✅ Generated image variants for {ingested}/{len(rows)} wardrobe items")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("wardrobe_items") as batch:
+        batch.drop_column("image_variants")
@@ -0,0 +1,48 @@
+"""vision result cache
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 17:00:00
+
+Adds ``vision_cache``: detected clothing attributes keyed by image hash
+and prompt version, with perceptual-hash bands for near-duplicate hits.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("vision_cache"):
+        return
+
+    op.create_table(
+        "vision_cache",
+        sa.Column("image_hash", sa.String(), nullable=False),
+        sa.Column("prompt_version", sa.String(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("phash", sa.String(), nullable=True),
+        sa.Column("phash_band0", sa.Integer(), nullable=True),
+        sa.Column("phash_band1", sa.Integer(), nullable=True),
+        sa.Column("phash_band2", sa.Integer(), nullable=True),
+        sa.Column("phash_band3", sa.Integer(), nullable=True),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("image_hash", "prompt_version"),
+    )
+    op.create_index("ix_vision_cache_last_used_at", "vision_cache", ["last_used_at"])
+    for band in range(4):
+        op.create_index(f"ix_vision_cache_band{band}", "vision_cache", ["prompt_version", f"phash_band{band}"])
+
+
+def downgrade() -> None:
+    op.drop_table("vision_cache")
@@ -0,0 +1,46 @@
+"""llm response cache table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:00:00
+
+Adds ``llm_cache``: parsed answers of deterministic text prompts (outfit
+suggestions, body shape, comparisons, insights) keyed by a hash of model,
+prompt version and normalized inputs, so they survive a restart.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("llm_cache"):
+        return
+
+    op.create_table(
+        "llm_cache",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("site", sa.String(), nullable=False),
+        sa.Column("value", sa.JSON(), nullable=False),
+        sa.Column("cost_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_llm_cache_site", "llm_cache", ["site"])
+    op.create_index("ix_llm_cache_expires_at", "llm_cache", ["expires_at"])
+    op.create_index("ix_llm_cache_last_used_at", "llm_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("llm_cache")
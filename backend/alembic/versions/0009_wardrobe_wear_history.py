@@ -0,0 +1,52 @@
+"""wear history columns on wardrobe items
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 21:00:00
+
+Adds ``wardrobe_items.wear_count`` and an indexed ``wardrobe_items.last_worn``
+so outfit suggestions can leave out recently worn items in the query, and
+backfills both from ``wear_logs``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("wardrobe_items")}
+    with op.batch_alter_table("wardrobe_items") as batch:
+        if "wear_count" not in columns:
+            batch.add_column(sa.Column("wear_count", sa.Integer(), nullable=False, server_default="0"))
+        if "last_worn" not in columns:
+            batch.add_column(sa.Column("last_worn", sa.DateTime(timezone=True), nullable=True))
+
+    indexes = {i["name"] for i in inspector.get_indexes("wardrobe_items")}
+    if "ix_wardrobe_items_last_worn" not in indexes:
+        op.create_index("ix_wardrobe_items_last_worn", "wardrobe_items", ["last_worn"])
+
+    if inspector.has_table("wear_logs"):
+        op.execute(
+            """
+            UPDATE wardrobe_items SET
+                wear_count = (SELECT COUNT(*) FROM wear_logs WHERE wear_logs.item_id = wardrobe_items.id),
+                last_worn = (SELECT MAX(worn_date) FROM wear_logs WHERE wear_logs.item_id = wardrobe_items.id)
+            WHERE id IN (SELECT item_id FROM wear_logs)
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wardrobe_items_last_worn", table_name="wardrobe_items")
+    with op.batch_alter_table("wardrobe_items") as batch:
+        batch.drop_column("last_worn")
+        batch.drop_column("wear_count")
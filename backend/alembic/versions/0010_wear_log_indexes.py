@@ -0,0 +1,53 @@
+"""wear log table and history indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 22:00:00
+
+Creates ``wear_logs`` where it is missing (without the foreign keys to the
+users/outfits tables this schema does not have) and indexes it on
+``(user_id, worn_date)`` and ``(item_id, worn_date)`` for the history
+queries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_wear_logs_user_worn": ["user_id", "worn_date"],
+    "ix_wear_logs_item_worn": ["item_id", "worn_date"],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("wear_logs"):
+        op.create_table(
+            "wear_logs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("item_id", sa.Integer(), nullable=False),
+            sa.Column("outfit_id", sa.Integer(), nullable=True),
+            sa.Column("worn_date", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(["item_id"], ["wardrobe_items.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_wear_logs_id", "wear_logs", ["id"])
+
+    existing = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("wear_logs")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "wear_logs", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="wear_logs")
@@ -0,0 +1,101 @@
+"""content-addressed wardrobe uploads
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 23:00:00
+
+Copies the flat-layout uploads that wardrobe items point at (as written by
+0005) into the content-addressed layout: <ab>/<cd>/<sha256>.<ext> masters
+with <sha256>_<size>.<ext> thumbnails beside them, then rewrites
+``image_url`` and ``image_variants``. The layout is frozen below as the
+image store defined it at this revision. The flat files stay where they
+are; the uploads GC leaves that layout alone.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPLOAD_DIR = Path(__file__).resolve().parents[3] / "frontend" / "uploads"
+UPLOAD_URL = "/uploads"
+
+SHARDED_URL = re.compile(rf"^{UPLOAD_URL}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}")
+
+
+def flat_path(url: Optional[str]) -> Optional[Path]:
+    """Local file of a flat-layout upload URL, None when there is none to move"""
+    if not url or not url.startswith(f"{UPLOAD_URL}/") or SHARDED_URL.match(url):
+        return None
+    path = (UPLOAD_DIR / url[len(UPLOAD_URL) + 1:]).resolve()
+    if not path.is_relative_to(UPLOAD_DIR.resolve()) or not path.is_file():
+        return None
+    return path
+
+
+def store(source: Path, key: str, suffix: str = "") -> str:
+    """Copy a file to <ab>/<cd>/<key><suffix>.<ext> (atomically, once); returns its URL"""
+    relative = f"{key[:2]}/{key[2:4]}/{key}{suffix}{source.suffix}"
+    target = UPLOAD_DIR / relative
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(source.read_bytes())
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return f"{UPLOAD_URL}/{relative}"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, image_url, image_variants FROM wardrobe_items WHERE image_url LIKE :prefix"
+    ), {"prefix": f"{UPLOAD_URL}/%"}).fetchall()
+
+    moved = 0
+    for row in rows:
+        master = flat_path(row.image_url)
+        if not master:
+            continue
+
+        key = hashlib.sha256(master.read_bytes()).hexdigest()
+        url = store(master, key)
+
+        variants = row.image_variants
+        if isinstance(variants, str):
+            variants = json.loads(variants)
+        variants = dict(variants or {})
+        thumbnails = {}
+        for size_name, thumb_url in (variants.get("thumbnails") or {}).items():
+            thumb = flat_path(thumb_url)
+            thumbnails[size_name] = store(thumb, key, f"_{size_name}") if thumb else thumb_url
+        variants.update(master=url, thumbnails=thumbnails)
+
+        bind.execute(
+            sa.text("UPDATE wardrobe_items SET image_url = :url, image_variants = :variants WHERE id = :id"),
+            {"id": row.id, "url": url, "variants": json.dumps(variants)},
+        )
+        moved += 1
+
+    print(f"✅ Moved {moved}/{len(rows)} wardrobe uploads to content-addressed storage")
+
+
+def downgrade() -> None:
+    # The copied files stay valid upload URLs; nothing to undo
+    pass
@@ -0,0 +1,41 @@
+"""vision cache color signature
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+Adds the garment's mean LAB color to ``vision_cache`` entries. Perceptual
+(dHash) hits are only accepted when the colors agree; entries written
+before this revision have no signature and only ever hit exactly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLOR_COLUMNS = ["color_l", "color_a", "color_b"]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("vision_cache"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("vision_cache")}
+    with op.batch_alter_table("vision_cache") as batch:
+        for name in COLOR_COLUMNS:
+            if name not in columns:
+                batch.add_column(sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("vision_cache") as batch:
+        for name in COLOR_COLUMNS:
+            batch.drop_column(name)
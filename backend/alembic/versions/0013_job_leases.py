@@ -0,0 +1,47 @@
+"""job owner and lease
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 01:00:00
+
+Records which worker process claimed a running job and until when its lease
+holds. The owner renews the lease while the job runs; only jobs whose lease
+has lapsed are queued again, so a second worker or a rolling restart no
+longer re-runs jobs that are still in progress elsewhere.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_jobs_status_lease"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("jobs"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("jobs")}
+    with op.batch_alter_table("jobs") as batch:
+        if "owner" not in columns:
+            batch.add_column(sa.Column("owner", sa.String(), nullable=True))
+        if "lease_expires_at" not in columns:
+            batch.add_column(sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+
+    if INDEX not in {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("jobs")}:
+        op.create_index(INDEX, "jobs", ["status", "lease_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="jobs")
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_column("lease_expires_at")
+        batch.drop_column("owner")
@@ -1,57 +1,168 @@
-import os
-from pydantic_settings import BaseSettings
-from functools import lru_cache
-from typing import Optional
-from pathlib import Path
-from dotenv import load_dotenv
-
-# Force load .env file from backend directory
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
-
-print(f"🔍 Loading .env from: {env_path}")
-print(f"📂 .env exists: {env_path.exists()}")
-
-class Settings(BaseSettings):
-    # API Keys
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
-    HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
-    OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "")
-    SERPAPI_KEY: str = os.getenv("SERPAPI_KEY", "")
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    STABILITY_API_KEY: str = os.getenv("STABILITY_API_KEY", "")
-    # JWT
-    SECRET_KEY_JWT: str = os.getenv("SECRET_KEY_JWT", "smartstyle-secret-key-change-in-production")
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
-    
-    # Database
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./wardrobe.db")
-    
-    # Server
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
-    
-    # Groq Models
-    GROQ_MODEL: str = "llama-3.3-70b-versatile"
-    GROQ_VISION_MODEL: str = "llama-3.2-11b-vision-preview"
-    
-    # Hugging Face Models
-    HF_CHATBOT_MODEL: str = "ibm-granite/granite-3.3-2b-instruct"
-    
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-
-settings = Settings()
-
-# Debug print
-print(f"✓ GROQ_API_KEY loaded: {bool(settings.GROQ_API_KEY)} ({settings.GROQ_API_KEY[:15] + '...' if settings.GROQ_API_KEY else 'NOT SET'})")
-print(f"✓ STABILITY_API_KEY loaded: {bool(settings.STABILITY_API_KEY)}")
-print(f"✓ SERP_API_KEY loaded: {bool(settings.SERPAPI_KEY)}")
-
-@lru_cache()
-def get_settings():
-    return Settings()
+import os
+from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Optional
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Force load .env file from backend directory
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path, override=True)
+
+print(f"🔍 Loading .env from: {env_path}")
+print(f"📂 .env exists: {env_path.exists()}")
+
+class Settings(BaseSettings):
+    # API Keys
+    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
+    OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "")
+    SERPAPI_KEY: str = os.getenv("SERPAPI_KEY", "")
+    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    STABILITY_API_KEY: str = os.getenv("STABILITY_API_KEY", "")
+    # JWT
+    SECRET_KEY_JWT: str = os.getenv("SECRET_KEY_JWT", "smartstyle-secret-key-change-in-production")
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    # Wardrobe and wear routes have no auth yet: every row belongs to this user
+    DEFAULT_USER_ID: int = 1
+    
+    # Database
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./wardrobe.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    
+    # SQLite tuning (applied on every new connection)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    
+    # Server
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    
+    # Groq Models
+    GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_VISION_MODEL: str = "llama-3.2-11b-vision-preview"
+    
+    # Max vision provider calls in flight for batch image analysis
+    VISION_CONCURRENCY: int = int(os.getenv("VISION_CONCURRENCY", "4"))
+    
+    # Background jobs: worker threads, pick-ups before an interrupted job is
+    # given up on, and how long finished jobs are kept
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+    # A running job's lease, renewed every third of it by the process running
+    # it; a job whose lease lapses is taken to be orphaned and queued again
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+    # Wear logging: taps are queued and written in one transaction per flush
+    # (requests return once their flush has committed). A flush takes every
+    # tap queued while the previous one was committing; FLUSH_MS > 0 also
+    # holds a batch open that long, or until it reaches MAX_BATCH wears
+    WEAR_LOG_FLUSH_MS: int = int(os.getenv("WEAR_LOG_FLUSH_MS", "0"))
+    WEAR_LOG_MAX_BATCH: int = int(os.getenv("WEAR_LOG_MAX_BATCH", "500"))
+    
+    # Uploaded photos: master size cap and encoding (webp or jpeg)
+    IMAGE_MAX_SIDE: int = int(os.getenv("IMAGE_MAX_SIDE", "1600"))
+    IMAGE_FORMAT: str = os.getenv("IMAGE_FORMAT", "webp")
+    IMAGE_QUALITY: int = int(os.getenv("IMAGE_QUALITY", "82"))
+    
+    # Images sent to vision providers: downscaled to the model's effective
+    # input size, re-encoded compactly, metadata stripped
+    GEMINI_UPLOAD_MAX_SIDE: int = int(os.getenv("GEMINI_UPLOAD_MAX_SIDE", "768"))
+    GEMINI_UPLOAD_FORMAT: str = os.getenv("GEMINI_UPLOAD_FORMAT", "webp")
+    GEMINI_UPLOAD_QUALITY: int = int(os.getenv("GEMINI_UPLOAD_QUALITY", "80"))
+    GROQ_UPLOAD_MAX_SIDE: int = int(os.getenv("GROQ_UPLOAD_MAX_SIDE", "1024"))
+    GROQ_UPLOAD_FORMAT: str = os.getenv("GROQ_UPLOAD_FORMAT", "jpeg")
+    GROQ_UPLOAD_QUALITY: int = int(os.getenv("GROQ_UPLOAD_QUALITY", "85"))
+    
+    # Outbound HTTP (shared keep-alive pool for all external APIs): pool
+    # size, idle connections kept, concurrent requests per host, and the
+    # default / connect timeouts in seconds
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+    HTTP_MAX_PER_HOST: int = int(os.getenv("HTTP_MAX_PER_HOST", "10"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    # SDXL generation takes tens of seconds
+    STABILITY_TIMEOUT: float = float(os.getenv("STABILITY_TIMEOUT", "90"))
+    
+    # Per-provider circuit breakers: rolling window of calls, minimum calls
+    # before judging, failure / slow-call rates that open the circuit, how
+    # long it stays open and how many probe calls close it again
+    CIRCUIT_WINDOW: int = int(os.getenv("CIRCUIT_WINDOW", "10"))
+    CIRCUIT_MIN_CALLS: int = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+    CIRCUIT_FAILURE_RATE: float = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+    CIRCUIT_SLOW_RATE: float = float(os.getenv("CIRCUIT_SLOW_RATE", "0.8"))
+    CIRCUIT_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+    CIRCUIT_HALF_OPEN_PROBES: int = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+    # Retries of transient failures: attempts per call, jittered backoff, and
+    # a budget of retries per window (a ratio of calls, with a floor)
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "0.25"))
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "2"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MIN: int = int(os.getenv("RETRY_BUDGET_MIN", "3"))
+    RETRY_BUDGET_SECONDS: float = float(os.getenv("RETRY_BUDGET_SECONDS", "10"))
+    # Gemini SDK calls otherwise wait indefinitely
+    GEMINI_TIMEOUT: float = float(os.getenv("GEMINI_TIMEOUT", "30"))
+    
+    # Vision result cache (keyed by image hash + prompt version)
+    VISION_CACHE_TTL_DAYS: int = int(os.getenv("VISION_CACHE_TTL_DAYS", "30"))
+    VISION_CACHE_MAX_ENTRIES: int = int(os.getenv("VISION_CACHE_MAX_ENTRIES", "5000"))
+    # Also reuse results for near-identical re-shoots (perceptual hash within N bits, max 3)
+    VISION_CACHE_PERCEPTUAL: bool = os.getenv("VISION_CACHE_PERCEPTUAL", "false").lower() == "true"
+    VISION_CACHE_PHASH_DISTANCE: int = int(os.getenv("VISION_CACHE_PHASH_DISTANCE", "3"))
+    # ...and only when the garment colors are this close (CIEDE2000)
+    VISION_CACHE_MAX_DELTA_E: float = float(os.getenv("VISION_CACHE_MAX_DELTA_E", "8"))
+    
+    # Text-model answer cache: in-memory LRU size, optional copy in the
+    # database (survives restarts), and TTL in seconds per call site
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    LLM_CACHE_PERSIST: bool = os.getenv("LLM_CACHE_PERSIST", "true").lower() == "true"
+    LLM_CACHE_PERSIST_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_PERSIST_MAX_ENTRIES", "5000"))
+    LLM_CACHE_TTL_OUTFIT_SUGGESTIONS: int = int(os.getenv("LLM_CACHE_TTL_OUTFIT_SUGGESTIONS", "3600"))
+    LLM_CACHE_TTL_PROMPT_OUTFIT: int = int(os.getenv("LLM_CACHE_TTL_PROMPT_OUTFIT", "21600"))
+    LLM_CACHE_TTL_BODY_SHAPE: int = int(os.getenv("LLM_CACHE_TTL_BODY_SHAPE", str(30 * 86400)))
+    LLM_CACHE_TTL_COMPARE_OUTFITS: int = int(os.getenv("LLM_CACHE_TTL_COMPARE_OUTFITS", str(7 * 86400)))
+    LLM_CACHE_TTL_INSIGHTS: int = int(os.getenv("LLM_CACHE_TTL_INSIGHTS", "86400"))
+    LLM_CACHE_TTL_OUTFIT_NARRATION: int = int(os.getenv("LLM_CACHE_TTL_OUTFIT_NARRATION", str(7 * 86400)))
+
+    # Local outfit engine: candidates kept per slot and partial outfits kept
+    # per beam-search step; narration asks the text model for names and
+    # "why this works" only (falls back to local text when off or failing)
+    OUTFIT_ENGINE_CANDIDATES_PER_SLOT: int = int(os.getenv("OUTFIT_ENGINE_CANDIDATES_PER_SLOT", "12"))
+    OUTFIT_ENGINE_BEAM_WIDTH: int = int(os.getenv("OUTFIT_ENGINE_BEAM_WIDTH", "32"))
+    OUTFIT_NARRATION: bool = os.getenv("OUTFIT_NARRATION", "true").lower() == "true"
+
+    # Recently worn items are left out in the query; when fewer than this
+    # many remain (or a core slot is empty) the least recently worn ones
+    # are added back, up to OUTFIT_RELAX_PER_SLOT per missing slot
+    OUTFIT_MIN_AVAILABLE_ITEMS: int = int(os.getenv("OUTFIT_MIN_AVAILABLE_ITEMS", "6"))
+    OUTFIT_RELAX_PER_SLOT: int = int(os.getenv("OUTFIT_RELAX_PER_SLOT", "3"))
+    
+    # Hugging Face Models
+    HF_CHATBOT_MODEL: str = "ibm-granite/granite-3.3-2b-instruct"
+    
+    
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        case_sensitive = False
+
+settings = Settings()
+
+# Debug print
+print(f"✓ GROQ_API_KEY loaded: {bool(settings.GROQ_API_KEY)} ({settings.GROQ_API_KEY[:15] + '...' if settings.GROQ_API_KEY else 'NOT SET'})")
+print(f"✓ STABILITY_API_KEY loaded: {bool(settings.STABILITY_API_KEY)}")
+print(f"✓ SERP_API_KEY loaded: {bool(settings.SERPAPI_KEY)}")
+
+@lru_cache()
+def get_settings():
+    return Settings()
@@ -1,18 +1,114 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'wardrobe.db')}"
-
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+import os
+
+from app.config import get_settings
+from app.services.color_service import delta_e
+
+settings = get_settings()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sync driver -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def resolve_url(url: str) -> str:
+    """Anchor relative SQLite paths ("sqlite:///./wardrobe.db") at the backend directory"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database and parsed.database != ":memory:" \
+            and not os.path.isabs(parsed.database):
+        parsed = parsed.set(database=os.path.normpath(os.path.join(BASE_DIR, parsed.database)))
+    return parsed.render_as_string(hide_password=False)
+
+def async_url(url: str) -> str:
+    """Rewrite a database URL to use an asyncio driver (aiosqlite, asyncpg)"""
+    scheme, sep, rest = url.partition("://")
+    dialect, _, driver = scheme.partition("+")
+    if driver in ("aiosqlite", "asyncpg"):
+        return url
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}{sep}{rest}"
+
+DATABASE_URL = resolve_url(settings.DATABASE_URL)
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
+def engine_options() -> dict:
+    """create_engine kwargs: thread check off for SQLite, pool tuning for server databases"""
+    if IS_SQLITE:
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": "WAL",  # readers no longer wait on the writer
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,  # wait instead of "database is locked"
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # negative = KiB
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+def sql_delta_e(L1, a1, b1, L2, a2, b2):
+    """delta_e(L1, a1, b1, L2, a2, b2) for SQL: CIEDE2000, NULL when either color is unknown"""
+    if None in (L1, a1, b1, L2, a2, b2):
+        return None
+    return delta_e((L1, a1, b1), (L2, a2, b2))
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+    # Per-item color distance for the similar_to filter
+    dbapi_connection.create_function("delta_e", 6, sql_delta_e, deterministic=True)
+
+engine = create_engine(DATABASE_URL, **engine_options())
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
+# Async engine for the routers; sync SessionLocal stays for scripts and threadpool work
+async_engine = create_async_engine(async_url(DATABASE_URL), **{
+    key: value for key, value in engine_options().items() if key != "connect_args"
+})
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+def describe_database() -> str:
+    """One-line summary of the effective engine configuration"""
+    url = engine.url.render_as_string(hide_password=True)
+    if not IS_SQLITE:
+        return (f"{url} (pool_size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}, "
+                f"pool_recycle={settings.DB_POOL_RECYCLE}s, pool_timeout={settings.DB_POOL_TIMEOUT}s)")
+    
+    # Read the pragmas back so the log shows what SQLite actually accepted
+    with engine.connect() as conn:
+        effective = {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size")
+        }
+    return f"{url} (" + ", ".join(f"{name}={value}" for name, value in effective.items()) + ")"
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
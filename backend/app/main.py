@@ -1,45 +1,109 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
-import os
-
-from app.database import engine, Base
-from app.routers import wardrobe
-from app.models import wardrobe as wardrobe_models
-
-# Create tables
-print("🗄️  Creating database...")
-Base.metadata.create_all(bind=engine)
-print("✅ Database ready")
-
-app = FastAPI(title="SmartStyle AI - Wardrobe Manager")
-
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include wardrobe router
-app.include_router(wardrobe.router)
-
-# Frontend path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-backend_dir = os.path.dirname(current_dir)
-project_root = os.path.dirname(backend_dir)
-frontend_path = os.path.join(project_root, "frontend")
-
-print(f"📂 Frontend: {frontend_path}")
-
-if os.path.exists(frontend_path):
-    app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
-    print("✅ Frontend ready")
-else:
-    print("⚠️  Frontend not found")
-
-@app.get("/api/health")
-def health():
-    return {"status": "healthy", "message": "SmartStyle AI Wardrobe"}
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.cors import CORSMiddleware
+import os
+
+from app.database import engine, Base, describe_database
+from app.routers import wardrobe, jobs, outfit, wear
+from app.models import wardrobe as wardrobe_models
+from app.services.wardrobe_search_service import wardrobe_search_service
+from app.services.job_service import job_service
+from app.services.http_client import http_client
+from app.services.circuit_breaker import breaker_status
+from app.services.llm_cache_service import llm_cache_service
+from app.services.wardrobe_selection_service import wardrobe_selection_service
+from app.services.wear_log_service import wear_log_writer
+
+# Create tables
+print("🗄️  Creating database...")
+Base.metadata.create_all(bind=engine)
+wardrobe_search_service.setup(engine)
+print(f"✅ Database ready: {describe_database()}")
+
+app = FastAPI(title="SmartStyle AI - Wardrobe Manager")
+
+# CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
+)
+
+# Include wardrobe router
+app.include_router(wardrobe.router)
+app.include_router(jobs.router)
+app.include_router(outfit.router)
+app.include_router(wear.router)
+
+# Background workers for slow AI calls; unfinished jobs are picked up again
+@app.on_event("startup")
+def start_job_workers():
+    job_service.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    job_service.stop()
+
+# Batched wear-log writes; queued wears are written before shutdown
+@app.on_event("startup")
+def start_wear_log_writer():
+    wear_log_writer.start()
+
+@app.on_event("shutdown")
+def stop_wear_log_writer():
+    wear_log_writer.stop()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    http_client.close()
+    await http_client.aclose()
+
+# Outbound HTTP pool: per-host requests, connection reuse and latency.
+# Health routes are registered before the frontend mount, which would
+# otherwise shadow them
+@app.get("/api/health/http")
+def http_health():
+    return http_client.metrics()
+
+# Circuit breaker state per AI / data provider; `degraded` lists the ones
+# currently failing fast to their fallback answers
+@app.get("/api/health/providers")
+def provider_health():
+    return breaker_status()
+
+# Text-model answer cache: hit ratio and provider time saved, per call site
+@app.get("/api/health/llm-cache")
+def llm_cache_health():
+    return llm_cache_service.metrics()
+
+# Wear-log writer: taps and rows written per flush (one commit each)
+@app.get("/api/health/wear-log")
+def wear_log_health():
+    return wear_log_writer.metrics()
+
+# Wardrobe pre-selection for prompts: items and (estimated) tokens sent vs the
+# full listings, per call site
+@app.get("/api/health/prompt-selection")
+def prompt_selection_health():
+    return wardrobe_selection_service.metrics()
+
+# Frontend path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+project_root = os.path.dirname(backend_dir)
+frontend_path = os.path.join(project_root, "frontend")
+
+print(f"📂 Frontend: {frontend_path}")
+
+if os.path.exists(frontend_path):
+    app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
+    print("✅ Frontend ready")
+else:
+    print("⚠️  Frontend not found")
+
+@app.get("/api/health")
+def health():
+    return {"status": "healthy", "message": "SmartStyle AI Wardrobe"}
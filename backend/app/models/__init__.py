@@ -1,3 +1,7 @@
-from app.models.wardrobe import WardrobeItem
-
-__all__ = ["WardrobeItem"]
+from app.models.wardrobe import WardrobeItem, WardrobeItemOccasion, WardrobeRevision
+from app.models.vision_cache import VisionCacheEntry
+from app.models.job import Job
+from app.models.llm_cache import LLMCacheEntry
+from app.models.analytics import WearLog
+
+__all__ = ["WardrobeItem", "WardrobeItemOccasion", "WardrobeRevision", "VisionCacheEntry", "Job", "LLMCacheEntry", "WearLog"]
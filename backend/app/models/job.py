@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class Job(Base):
+    """A slow operation (usually an AI provider call) run by the background workers"""
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex
+    kind = Column(String, nullable=False, index=True)  # handler name, e.g. "analyze-image"
+    status = Column(String, nullable=False, default="queued")  # queued | running | succeeded | failed
+    params = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+
+    progress = Column(Integer, nullable=False, default=0)  # 0-100
+    message = Column(String)
+    attempts = Column(Integer, nullable=False, default=0)  # times a worker has picked it up
+    owner = Column(String)  # worker process running it (host:pid:token)
+    lease_expires_at = Column(DateTime(timezone=True))  # renewed by the owner while running
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_jobs_status_created", "status", "created_at"),
+        Index("ix_jobs_status_lease", "status", "lease_expires_at"),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f"<Job(id='{self.id}', kind='{self.kind}', status='{self.status}')>"
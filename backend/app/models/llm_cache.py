@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class LLMCacheEntry(Base):
+    """A parsed text-model answer, keyed by model, prompt version and inputs"""
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)  # SHA-256 of site, model, prompt version, normalized inputs
+    site = Column(String, nullable=False, index=True)  # call site, e.g. "outfit-suggestions"
+    value = Column(JSON, nullable=False)
+    cost_ms = Column(Float, nullable=False, default=0)  # provider latency the entry saves per hit
+
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<LLMCacheEntry(site='{self.site}', key='{self.key[:12]}')>"
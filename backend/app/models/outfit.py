@@ -1,24 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from app.database import Base
-
-class Outfit(Base):
-    __tablename__ = "outfits"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    name = Column(String, nullable=False)
-    description = Column(Text)
-    occasion = Column(String)
-    season = Column(String)
-    image_path = Column(String)
-    items = Column(Text)  # JSON string of item IDs
-    wear_count = Column(Integer, default=0)
-    last_worn = Column(DateTime)
-    is_favorite = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    # Relationships
-    user = relationship("User", back_populates="outfits")
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+class Outfit(Base):
+    __tablename__ = "outfits"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+    description = Column(Text)
+    occasion = Column(String)
+    season = Column(String)
+    image_path = Column(String)
+    items = Column(Text)  # JSON string of item IDs
+    wear_count = Column(Integer, default=0)
+    last_worn = Column(DateTime)
+    is_favorite = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User", back_populates="outfits")
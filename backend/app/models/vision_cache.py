@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, Float
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class VisionCacheEntry(Base):
+    """Detected clothing attributes for an image, per vision prompt version"""
+    __tablename__ = "vision_cache"
+
+    image_hash = Column(String, primary_key=True)  # SHA-256 of the stored master
+    prompt_version = Column(String, primary_key=True)
+    result = Column(JSON, nullable=False)
+
+    # 64-bit dHash as hex, plus its four 16-bit bands for near-duplicate lookups
+    phash = Column(String)
+    phash_band0 = Column(Integer)
+    phash_band1 = Column(Integer)
+    phash_band2 = Column(Integer)
+    phash_band3 = Column(Integer)
+
+    # Mean LAB of the garment: dHash is grayscale, so same-shape pieces in other colors collide
+    color_l = Column(Float)
+    color_a = Column(Float)
+    color_b = Column(Float)
+
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        Index("ix_vision_cache_band0", "prompt_version", "phash_band0"),
+        Index("ix_vision_cache_band1", "prompt_version", "phash_band1"),
+        Index("ix_vision_cache_band2", "prompt_version", "phash_band2"),
+        Index("ix_vision_cache_band3", "prompt_version", "phash_band3"),
+    )
+
+    def __repr__(self):
+        return f"<VisionCacheEntry(image_hash='{self.image_hash[:12]}', prompt_version='{self.prompt_version}')>"
@@ -1,43 +1,168 @@
-# Step 1: Update WardrobeItem Model
-# File: app/models/wardrobe.py
-
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
-from sqlalchemy.sql import func
-from app.database import Base
-
-class WardrobeItem(Base):
-    __tablename__ = "wardrobe_items"
-
-    id = Column(Integer, primary_key=True, index=True)
-    
-    # Basic info
-    name = Column(String, nullable=False)
-    category = Column(String)
-    type = Column(String)  # subcategory
-    
-    # Appearance
-    color = Column(String)
-    pattern = Column(String)
-    material = Column(String)  # ✅ fabric stored as material
-    style = Column(String)  # ✅ NEW - was missing!
-    
-    # Details
-    brand = Column(String)
-    size = Column(String)
-    season = Column(String)
-    
-    # New fields for AI detection
-    gender = Column(String)  # ✅ NEW
-    occasions = Column(JSON)  # ✅ NEW - Array of occasions
-    occasion = Column(String)  # ✅ Keep for backward compatibility
-    
-    # Metadata
-    description = Column(Text)
-    image_url = Column(Text)
-    
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    
-    def __repr__(self):
-        return f"<WardrobeItem(id={self.id}, name='{self.name}', category='{self.category}')>"
\ No newline at end of file
+# Step 1: Update WardrobeItem Model
+# File: app/models/wardrobe.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Index, Float, false
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base, IS_SQLITE
+from app.services.color_service import MODIFIER_TOLERANCE, color_service
+
+
+def normalize_occasion(value: str) -> str:
+    """Lookup key for an occasion (trimmed, lowercase); the display value keeps its case"""
+    return (value or "").strip().lower()
+
+
+def normalize_occasions(values) -> list:
+    """Trimmed occasions as entered, de-duplicated by lookup key, in their original order"""
+    cleaned, keys = [], set()
+    for value in values or []:
+        display = str(value or "").strip()
+        key = normalize_occasion(display)
+        if key and key not in keys:
+            keys.add(key)
+            cleaned.append(display)
+    return cleaned
+
+
+def color_columns(color: str) -> dict:
+    """Raw color plus its normalized palette entry and LAB values, as column values"""
+    match = color_service.normalize(color or "")
+    L, a, b = match.lab if match else (None, None, None)
+    return {
+        "color": color,
+        "color_name": match.name if match else None,
+        "color_family": match.family if match else None,
+        "color_l": L,
+        "color_a": a,
+        "color_b": b,
+    }
+
+
+class WardrobeItemOccasion(Base):
+    """Item ↔ occasion association, one row per (item, occasion)"""
+    __tablename__ = "wardrobe_item_occasions"
+
+    item_id = Column(Integer, ForeignKey("wardrobe_items.id", ondelete="CASCADE"), primary_key=True)
+    occasion = Column(String, primary_key=True)
+
+    __table_args__ = (
+        # Occasion filters probe by occasion first, then join back on item_id
+        Index("ix_wardrobe_item_occasions_occasion_item", "occasion", "item_id"),
+    )
+
+
+class WardrobeRevision(Base):
+    """Per-user wardrobe revision, bumped in the same transaction as every item write"""
+    __tablename__ = "wardrobe_revisions"
+
+    user_id = Column(Integer, primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class WardrobeItem(Base):
+    __tablename__ = "wardrobe_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Basic info
+    name = Column(String, nullable=False)
+    category = Column(String, index=True)
+    type = Column(String)  # subcategory
+    
+    # Appearance
+    color = Column(String, index=True)  # as entered / detected
+    color_name = Column(String, index=True)  # canonical palette name
+    color_family = Column(String, index=True)  # palette family (red, blue, grey...)
+    color_l = Column(Float)  # CIELAB of the normalized color
+    color_a = Column(Float)
+    color_b = Column(Float)
+    pattern = Column(String, index=True)
+    material = Column(String, index=True)  # ✅ fabric stored as material
+    style = Column(String, index=True)  # ✅ NEW - was missing!
+    
+    # Details
+    brand = Column(String, index=True)
+    size = Column(String)
+    season = Column(String, index=True)
+    
+    # New fields for AI detection
+    gender = Column(String, index=True)  # ✅ NEW
+    occasions = Column(JSON)  # ✅ Display copy of occasion_links (no join needed to render)
+    occasion = Column(String)  # ✅ Legacy JSON blob, superseded by the columns above
+    
+    # Metadata
+    description = Column(Text)
+    image_url = Column(Text)
+    image_variants = Column(JSON)  # master size + thumbnail URLs from the ingest step
+    
+    # Wear history, kept in step with wear_logs
+    wear_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_worn = Column(DateTime(timezone=True), index=True)  # recently-worn filter runs on this
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Queryable occasions (filter with occasion_links.any(...))
+    occasion_links = relationship(
+        "WardrobeItemOccasion",
+        cascade="all, delete-orphan",
+    )
+
+    def set_occasions(self, occasions):
+        """Write occasions to both the display column and the association table"""
+        cleaned = normalize_occasions(occasions)
+        self.occasions = cleaned
+        self.occasion_links = [WardrobeItemOccasion(occasion=normalize_occasion(value)) for value in cleaned]
+
+    def set_color(self, color):
+        """Store the raw color plus its normalized palette entry and LAB values"""
+        for key, value in color_columns(color).items():
+            setattr(self, key, value)
+
+    def __repr__(self):
+        return f"<WardrobeItem(id={self.id}, name='{self.name}', category='{self.category}')>"
+
+
+# ========================================
+# COLOR FILTERS
+# ========================================
+
+# CIEDE2000 weighs a lightness gap by at most 1/S_L, and S_L stays under 1.75,
+# so |dL| <= 1.75 * delta_e bounds the exact check below
+MAX_LIGHTNESS_WEIGHT = 1.75
+
+
+def color_clause(color: str):
+    """
+    SQL condition for items of a free-text color: a bare family word ("red")
+    covers the family, a shade its palette name, a modified color ("light
+    blue") the shade at that lightness; unknown colors match the raw text.
+    """
+    match = color_service.normalize(color)
+    if not match:
+        return WardrobeItem.color.ilike(f"%{color}%")
+    if match.shift:
+        L = match.lab[0]
+        return (WardrobeItem.color_name == match.name) & WardrobeItem.color_l.between(
+            L - MODIFIER_TOLERANCE, L + MODIFIER_TOLERANCE
+        )
+    if match.is_family:
+        return WardrobeItem.color_family == match.family
+    return WardrobeItem.color_name == match.name
+
+
+def similar_color_clause(color: str, max_delta_e: float):
+    """SQL condition for items whose stored LAB color is within max_delta_e of a free-text color"""
+    match = color_service.normalize(color)
+    if not match:
+        return false()
+    if not IS_SQLITE:
+        # delta_e() is registered on SQLite connections only: compare palette shades
+        return WardrobeItem.color_name.in_(color_service.similar_names(match.name, max_delta_e))
+    L, a, b = match.lab
+    band = MAX_LIGHTNESS_WEIGHT * max_delta_e
+    return WardrobeItem.color_l.between(L - band, L + band) & (
+        func.delta_e(WardrobeItem.color_l, WardrobeItem.color_a, WardrobeItem.color_b, L, a, b) <= max_delta_e
+    )
\ No newline at end of file
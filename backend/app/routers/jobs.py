@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import json
+
+from app.services.job_service import job_service
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+# ========================================
+# JOB STATUS / RESULT
+# ========================================
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress and - once finished - result or error of a background job"""
+    job = await run_in_threadpool(job_service.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# ========================================
+# PROGRESS EVENTS (SSE)
+# ========================================
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-sent events for a job: a `progress` event per change and a final
+    `done` event carrying the result or error, after which the stream ends.
+    """
+    if not await run_in_threadpool(job_service.get, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        async for snapshot in job_service.events(job_id):
+            if snapshot is None:
+                yield ": keepalive\n\n"
+                continue
+            event = "done" if snapshot["status"] in ("succeeded", "failed") else "progress"
+            yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
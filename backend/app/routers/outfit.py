@@ -1,179 +1,281 @@
-# backend/app/routers/outfit.py
-# ✅ NO AUTHENTICATION - WORKS DIRECTLY
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import datetime
-import json
-
-from app.database import get_db
-from app.models.user import User
-from app.models.wardrobe import WardrobeItem, Category
-from app.services.outfit_service import outfit_service
-
-router = APIRouter(prefix="/api/outfit", tags=["Outfit Suggestions"])
-
-@router.get("/suggest")
-async def suggest_outfits(
-    event_type: str = Query(...),
-    event_date: str = Query(...),
-    event_time: str = Query(...),
-    formality: str = Query(default="casual"),
-    city: str = Query(default="Mumbai"),
-    country: str = Query(default="India"),
-    avoid_days: int = Query(default=7),
-    gender: str = Query(default="unisex"),
-    user_id: int = Query(default=1),  # Optional: can pass user_id or use default
-    db: Session = Depends(get_db)
-):
-    """
-    Generate gender-specific outfit suggestions WITHOUT authentication.
-    Works directly with or without auth - just pass user_id as query param.
-    """
-    try:
-        # Try to get user from database, if not found create default test user
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            # Create or use first user
-            user = db.query(User).first()
-            if not user:
-                raise HTTPException(status_code=404, detail="No user found. Please add wardrobe items first.")
-
-        # Get wardrobe items for this user
-        wardrobe_items = db.query(WardrobeItem).filter(
-            WardrobeItem.user_id == user.id,
-            ((WardrobeItem.gender == gender) | (WardrobeItem.gender == "unisex"))
-        ).all()
-
-        if not wardrobe_items:
-            return {
-                "success": False,
-                "message": f"❌ No wardrobe items found for {gender} gender. Please add items to your wardrobe first! 🛍️"
-            }
-
-        # Convert wardrobe items to dictionary format
-        wardrobe_data = []
-        for item in wardrobe_items:
-            # Get category name safely
-            if hasattr(item, "category") and item.category:
-                category_name = item.category.name
-            elif hasattr(item, "category_id") and item.category_id:
-                cat = db.query(Category).filter(Category.id == item.category_id).first()
-                category_name = cat.name if cat else "General"
-            else:
-                category_name = "General"
-
-            # Parse occasions safely
-            try:
-                occasions = json.loads(item.occasions) if hasattr(item, 'occasions') and item.occasions else []
-            except:
-                occasions = []
-
-            wardrobe_data.append({
-                "id": item.id,
-                "name": item.name,
-                "type": item.type,
-                "category": category_name,
-                "color": item.color,
-                "pattern": item.pattern,
-                "style": item.style,
-                "fabric": getattr(item, "fabric", "cotton"),
-                "season": item.season,
-                "gender": getattr(item, "gender", "unisex"),
-                "occasions": occasions,
-                "image_url": item.image_path,
-                "wear_count": item.wear_count,
-                "last_worn": item.last_worn.isoformat() if item.last_worn else None
-            })
-
-        # Mock weather data (you can integrate real weather API later)
-        weather = {
-            "temperature_celsius": 28,
-            "feels_like": 32,
-            "condition": "sunny",
-            "humidity_percent": 75,
-            "rain_probability": 20,
-            "uv_index": 7,
-            "season": "summer"
-        }
-
-        # User style preferences (you can fetch from database later)
-        preferences = {
-            "preferred_colors": ["navy blue", "black", "grey", "white"],
-            "disliked_colors": [],
-            "preferred_styles": ["casual", "smart_casual"],
-            "body_shape": "average",
-            "style_profile": "classic"
-        }
-
-        # Generate outfit suggestions using AI service
-        suggestions_text = outfit_service.generate_outfit_suggestions(
-            event_type=event_type,
-            event_date=event_date,
-            event_time=event_time,
-            formality=formality,
-            city=city,
-            country=country,
-            wardrobe_items=wardrobe_data,
-            weather=weather,
-            user_preferences=preferences,
-            avoid_days=avoid_days
-        )
-
-        return {
-            "success": True,
-            "suggestions": suggestions_text,
-            "wardrobe_count": len(wardrobe_data)
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return {
-            "success": False,
-            "message": f"❌ Error: {str(e)}"
-        }
-
-
-@router.get("/wardrobe-items")
-async def get_wardrobe_items(
-    gender: str = Query(default="unisex"),
-    user_id: int = Query(default=1),
-    db: Session = Depends(get_db)
-):
-    """Get all wardrobe items for the user (no auth required)"""
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            user = db.query(User).first()
-
-        if not user:
-            return {"success": False, "items": [], "message": "No user found"}
-
-        items = db.query(WardrobeItem).filter(
-            WardrobeItem.user_id == user.id,
-            ((WardrobeItem.gender == gender) | (WardrobeItem.gender == "unisex"))
-        ).all()
-
-        items_data = [
-            {
-                "id": item.id,
-                "name": item.name,
-                "type": item.type,
-                "color": item.color,
-                "image_url": item.image_path
-            }
-            for item in items
-        ]
-
-        return {
-            "success": True,
-            "items": items_data,
-            "count": len(items_data)
-        }
-
-    except Exception as e:
+# backend/app/routers/outfit.py
+# ✅ NO AUTHENTICATION - WORKS DIRECTLY
+
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.database import get_async_db
+from app.models.wardrobe import WardrobeItem
+from app.services.job_service import job_service
+from app.services.outfit_service import outfit_service
+from app.services.wardrobe_selection_service import slot_of
+
+router = APIRouter(prefix="/api/outfit", tags=["Outfit Suggestions"])
+settings = get_settings()
+
+# Engine field name -> column; only these are loaded for suggestions
+ENGINE_FIELDS = {
+    "id": WardrobeItem.id,
+    "name": WardrobeItem.name,
+    "type": WardrobeItem.type,
+    "category": WardrobeItem.category,
+    "color": WardrobeItem.color,
+    "pattern": WardrobeItem.pattern,
+    "style": WardrobeItem.style,
+    "fabric": WardrobeItem.material,
+    "season": WardrobeItem.season,
+    "gender": WardrobeItem.gender,
+    "occasions": WardrobeItem.occasions,
+    "image_url": WardrobeItem.image_url,
+    "wear_count": WardrobeItem.wear_count,
+    "last_worn": WardrobeItem.last_worn
+}
+
+def for_gender(gender: str):
+    """Items for the requested gender plus unisex ones"""
+    return (WardrobeItem.gender == gender) | (WardrobeItem.gender == "unisex")
+
+def wardrobe_query(gender: str):
+    return select(WardrobeItem).where(for_gender(gender))
+
+def engine_item(row) -> dict:
+    """Map a column-projected row to the dict the outfit engine scores"""
+    item = dict(zip(ENGINE_FIELDS, row))
+    item["category"] = item["category"] or "General"
+    item["gender"] = item["gender"] or "unisex"
+    item["occasions"] = item["occasions"] or []
+    item["wear_count"] = item["wear_count"] or 0
+    item["last_worn"] = item["last_worn"].isoformat() if item["last_worn"] else None
+    return item
+
+def missing_core_slots(items: List[dict]) -> List[str]:
+    """Core slots no complete outfit can be built without"""
+    slots = {slot_of(item) for item in items}
+    missing = [] if "shoes" in slots else ["shoes"]
+    if "one-piece" not in slots:
+        missing += [slot for slot in ("top", "bottom") if slot not in slots]
+    return missing
+
+async def available_items(db: AsyncSession, gender: str, avoid_days: int) -> Tuple[List[dict], Dict]:
+    """
+    Items the engine may pick from. Items worn within avoid_days are left
+    out in the query (indexed last_worn). Only when too few remain, or a core
+    slot is empty, are recently worn items read - least recently worn first,
+    and only until the missing slots and the minimum count are filled.
+    """
+    columns = select(*ENGINE_FIELDS.values()).where(for_gender(gender))
+    if avoid_days <= 0:
+        return [engine_item(row) for row in (await db.execute(columns)).all()], {"recently_worn": 0, "relaxed": 0}
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=avoid_days)
+    worn_recently = WardrobeItem.last_worn >= cutoff
+    items = [
+        engine_item(row) for row in (await db.execute(
+            columns.where(or_(WardrobeItem.last_worn.is_(None), WardrobeItem.last_worn < cutoff))
+        )).all()
+    ]
+
+    missing = missing_core_slots(items)
+    shortfall = settings.OUTFIT_MIN_AVAILABLE_ITEMS - len(items)
+    recent = await db.scalar(
+        select(func.count()).select_from(WardrobeItem).where(for_gender(gender), worn_recently)
+    )
+    if not missing and shortfall <= 0:
+        return items, {"recently_worn": recent, "relaxed": 0}
+
+    # Ranked relaxation: least recently worn first, then least worn overall;
+    # streamed so only the rows needed to fill the gaps are read
+    wanted = {slot: settings.OUTFIT_RELAX_PER_SLOT for slot in missing}
+    relaxed, spare = [], []
+    result = await db.stream(
+        columns.where(worn_recently).order_by(
+            WardrobeItem.last_worn.asc(), WardrobeItem.wear_count.asc(), WardrobeItem.id.asc()
+        ).execution_options(yield_per=100)
+    )
+    async for row in result:
+        item = engine_item(row)
+        slot = slot_of(item)
+        if wanted.get(slot):
+            wanted[slot] -= 1
+            relaxed.append(item)
+        elif len(spare) < shortfall:
+            spare.append(item)
+        if not any(wanted.values()) and len(relaxed) + len(spare) >= shortfall:
+            break
+    await result.close()
+    relaxed += spare[:max(0, shortfall - len(relaxed))]
+
+    if relaxed:
+        print(f"♻️ Only {len(items)} items not worn in {avoid_days} days - added back {len(relaxed)} least recently worn")
+    return items + relaxed, {"recently_worn": recent, "relaxed": len(relaxed)}
+
+# Mock weather data (you can integrate real weather API later)
+MOCK_WEATHER = {
+    "temperature_celsius": 28,
+    "feels_like": 32,
+    "condition": "sunny",
+    "humidity_percent": 75,
+    "rain_probability": 20,
+    "uv_index": 7,
+    "season": "summer"
+}
+
+# User style preferences (you can fetch from database later)
+DEFAULT_PREFERENCES = {
+    "preferred_colors": ["navy blue", "black", "grey", "white"],
+    "disliked_colors": [],
+    "preferred_styles": ["casual", "smart_casual"],
+    "body_shape": "average",
+    "style_profile": "classic"
+}
+
+class SuggestParams:
+    """Query parameters shared by /suggest and /suggest/jobs"""
+
+    def __init__(
+        self,
+        event_type: str = Query(...),
+        event_date: str = Query(...),
+        event_time: str = Query(...),
+        formality: str = Query(default="casual"),
+        city: str = Query(default="Mumbai"),
+        country: str = Query(default="India"),
+        avoid_days: int = Query(default=7),
+        gender: str = Query(default="unisex"),
+        narrate: Optional[bool] = Query(default=None, description="Ask the text model to describe the picks (default: OUTFIT_NARRATION)")
+    ):
+        self.event = {
+            "event_type": event_type,
+            "event_date": event_date,
+            "event_time": event_time,
+            "formality": formality,
+            "city": city,
+            "country": country
+        }
+        self.avoid_days = avoid_days
+        self.gender = gender
+        self.narrate = narrate
+
+def no_items_response(gender: str) -> dict:
+    return {
+        "success": False,
+        "message": f"❌ No wardrobe items found for {gender} gender. Please add items to your wardrobe first! 🛍️"
+    }
+
+def build_suggestions(event: dict, wardrobe_data: List[dict], availability: Dict, narrate: Optional[bool]) -> dict:
+    """Pick (and optionally narrate) outfits from already loaded items - blocking"""
+    options = {} if narrate is None else {"narrate": narrate}
+    result = outfit_service.generate_outfit_suggestions(
+        **event,
+        wardrobe_items=wardrobe_data,
+        weather=MOCK_WEATHER,
+        user_preferences=DEFAULT_PREFERENCES,
+        **options
+    )
+    return {
+        "success": True,
+        "suggestions": result["text"],
+        "outfits": result["outfits"],
+        "engine_ms": result["engine_ms"],
+        "narrated": result["narrated"],
+        "wardrobe_count": len(wardrobe_data),
+        "recently_worn": availability["recently_worn"],
+        "relaxed": availability["relaxed"]
+    }
+
+@router.get("/suggest")
+async def suggest_outfits(params: SuggestParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Gender-specific outfit suggestions WITHOUT authentication.
+    Outfits are picked locally; the text model only describes them.
+    """
+    try:
+        wardrobe_data, availability = await available_items(db, params.gender, params.avoid_days)
+
+        if not wardrobe_data:
+            return no_items_response(params.gender)
+
+        # Optional narration call runs in the threadpool so other requests keep being served
+        return await run_in_threadpool(build_suggestions, params.event, wardrobe_data, availability, params.narrate)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            "success": False,
+            "message": f"❌ Error: {str(e)}"
+        }
+
+@job_service.handler("outfit_suggest")
+def run_outfit_suggest_job(params: dict, progress) -> dict:
+    """Background variant of /suggest: the available items were read when the job was queued"""
+    progress(20, "Picking outfits")
+    return build_suggestions(params["event"], params["wardrobe_items"], params["availability"], params.get("narrate"))
+
+@router.post("/suggest/jobs", status_code=202)
+async def queue_outfit_suggestions(params: SuggestParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue outfit suggestions as a background job (the narration call can take
+    seconds). Returns the job id right away; poll /api/jobs/{id} or follow
+    /api/jobs/{id}/events.
+    """
+    wardrobe_data, availability = await available_items(db, params.gender, params.avoid_days)
+    await db.close()
+    if not wardrobe_data:
+        return no_items_response(params.gender)
+
+    try:
+        job_id = await run_in_threadpool(job_service.submit, "outfit_suggest", {
+            "event": params.event,
+            "wardrobe_items": wardrobe_data,
+            "availability": availability,
+            "narrate": params.narrate
+        })
+    except Exception as e:
+        print(f"❌ Could not queue outfit suggestions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return JSONResponse(status_code=202, content={
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/jobs/{job_id}",
+        "events_url": f"/api/jobs/{job_id}/events"
+    }, headers={"Location": f"/api/jobs/{job_id}"})
+
+
+@router.get("/wardrobe-items")
+async def get_wardrobe_items(
+    gender: str = Query(default="unisex"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all wardrobe items for the user (no auth required)"""
+    try:
+        items = (await db.scalars(wardrobe_query(gender))).all()
+
+        items_data = [
+            {
+                "id": item.id,
+                "name": item.name,
+                "type": item.type,
+                "color": item.color,
+                "image_url": item.image_url
+            }
+            for item in items
+        ]
+
+        return {
+            "success": True,
+            "items": items_data,
+            "count": len(items_data)
+        }
+
+    except Exception as e:
         return {"success": False, "items": [], "message": str(e)}
\ No newline at end of file
@@ -1,415 +1,889 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
-import json
-import base64
-from pathlib import Path
-
-from app.database import get_db
-from app.models.wardrobe import WardrobeItem
-from app.services.groq_service import groq_service
-
-router = APIRouter(prefix="/api/wardrobe", tags=["Wardrobe"])
-
-# Create uploads directory
-UPLOAD_DIR = Path(__file__).parent.parent.parent.parent / "frontend" / "uploads"
-UPLOAD_DIR.mkdir(exist_ok=True, parents=True)
-
-# ========================================
-# PYDANTIC MODELS
-# ========================================
-
-class AnalyzeImageResponse(BaseModel):
-    itemname: str
-    category: str
-    subcategory: str
-    fabric: str
-    color: str
-    pattern: str
-    style: str
-    season: str
-    gender: str
-    occasions: List[str]
-    temp_image_path: str
-
-class CreateItemRequest(BaseModel):
-    name: str
-    category: str
-    subcategory: Optional[str] = None
-    fabric: str
-    color: str
-    style: str
-    pattern: str
-    season: str
-    brand: Optional[str] = None
-    gender: Optional[str] = None
-    occasions: Optional[List[str]] = []
-    image_url: Optional[str] = ""  # ✅ NEW: Image path from analysis
-
-class UpdateItemRequest(BaseModel):
-    name: Optional[str] = None
-    category: Optional[str] = None
-    subcategory: Optional[str] = None
-    fabric: Optional[str] = None
-    color: Optional[str] = None
-    style: Optional[str] = None
-    pattern: Optional[str] = None
-    season: Optional[str] = None
-    brand: Optional[str] = None
-    gender: Optional[str] = None
-    occasions: Optional[List[str]] = None
-
-class WardrobeItemResponse(BaseModel):
-    id: int
-    name: str
-    category: str
-    subcategory: Optional[str]
-    fabric: str
-    color: str
-    style: str
-    pattern: str
-    season: str
-    brand: Optional[str]
-    gender: Optional[str]
-    occasions: Optional[List[str]]
-    image_url: Optional[str]
-
-    class Config:
-        from_attributes = True
-
-# ========================================
-# ANALYZE IMAGE - NO AUTH
-# ========================================
-
-@router.post("/analyze-image", response_model=AnalyzeImageResponse)
-async def analyze_image(file: UploadFile = File(...)):
-    """
-    Analyze clothing image using Gemini Vision.
-    Saves image and returns analysis.
-    """
-    try:
-        print("📸 Receiving image for analysis...")
-        
-        # Read image bytes
-        image_bytes = await file.read()
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-        
-        # Save image with timestamp
-        timestamp = datetime.now().timestamp()
-        image_filename = f"outfit_{int(timestamp)}.jpg"
-        image_path = UPLOAD_DIR / image_filename
-        
-        with open(image_path, 'wb') as f:
-            f.write(image_bytes)
-        
-        print(f"💾 Image saved: {image_filename}")
-        
-        # AI Detection using groq_service
-        print("🤖 Analyzing image with Gemini Vision...")
-        detected = groq_service.detect_clothing_from_image(image_base64)
-        
-        print(f"✅ Detection complete: {detected}")
-        
-        # ✅ Map response with IMAGE PATH
-        response = {
-            "itemname": detected.get("item_name", "Clothing Item"),
-            "category": detected.get("category", "Tops"),
-            "subcategory": detected.get("sub_category", ""),
-            "fabric": detected.get("fabric", "cotton"),
-            "color": detected.get("color", ""),
-            "pattern": detected.get("pattern", "solid"),
-            "style": detected.get("style", "casual"),
-            "season": detected.get("season", "all-season"),
-            "gender": detected.get("gender", "unisex"),
-            "occasions": detected.get("occasions", ["casual"]),
-            "temp_image_path": f"/uploads/{image_filename}"  # ✅ Image path!
-        }
-        
-        print(f"✅ Analysis response: {response}")
-        return response
-        
-    except Exception as e:
-        print(f"❌ Analysis error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
-
-# ========================================
-# CREATE ITEM - NO AUTH
-# ========================================
-
-@router.post("/items", response_model=dict, status_code=201)
-async def create_item(
-    request: CreateItemRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Create wardrobe item after user confirms/edits the form.
-    ✅ NOW SAVES IMAGE URL!
-    """
-    try:
-        print(f"📝 Creating item: {request.name}")
-        print(f"   Image: {request.image_url}")
-        print(f"   Gender: {request.gender}")
-        print(f"   Occasions: {request.occasions}")
-        
-        # Store extra data as JSON
-        extra_data = {
-            "gender": request.gender or "unisex",
-            "style": request.style or "",
-            "occasions": request.occasions or [],
-            "fabric": request.fabric or ""
-        }
-        
-        # ✅ SAVE IMAGE URL!
-        item = WardrobeItem(
-            name=request.name,
-            category=request.category or "",
-            type=request.subcategory or "",
-            color=request.color or "",
-            pattern=request.pattern or "",
-            brand=request.brand or "",
-            size="",
-            season=request.season or "",
-            occasion=json.dumps(extra_data),
-            description=f"{request.color} {request.pattern} {request.subcategory or request.category}",
-            image_url=request.image_url or "",  # ✅ SAVE IMAGE URL!
-            created_at=datetime.now()
-        )
-        
-        print(f"💾 Item object created: {item}")
-        
-        db.add(item)
-        db.commit()
-        db.refresh(item)
-        
-        print(f"✅ Item created with ID: {item.id}")
-        
-        return {
-            "message": "Item created successfully",
-            "item_id": item.id,
-            "item": {
-                "id": item.id,
-                "name": item.name,
-                "category": item.category,
-                "color": item.color,
-                "image_url": item.image_url  # ✅ Return image URL!
-            }
-        }
-        
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Create error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to create item: {str(e)}")
-
-# ========================================
-# GET ALL ITEMS - NO AUTH
-# ========================================
-
-@router.get("/items", response_model=List[dict])
-def get_all_items(
-    category: Optional[str] = None,
-    color: Optional[str] = None,
-    db: Session = Depends(get_db)
-):
-    """
-    Get all wardrobe items with optional filters.
-    ✅ NOW RETURNS IMAGE URL!
-    """
-    try:
-        query = db.query(WardrobeItem)
-        
-        if category:
-            query = query.filter(WardrobeItem.category == category)
-        if color:
-            query = query.filter(WardrobeItem.color.ilike(f"%{color}%"))
-        
-        items = query.all()
-        print(f"📦 Retrieved {len(items)} items")
-        
-        # Map database fields to response
-        response_items = []
-        for item in items:
-            # Parse JSON from occasion column
-            try:
-                occasion_data = json.loads(item.occasion) if item.occasion else {}
-            except:
-                occasion_data = {}
-            
-            response_items.append({
-                "id": item.id,
-                "name": item.name,
-                "category": item.category,
-                "subcategory": item.type if item.type else "",
-                "fabric": occasion_data.get("fabric", ""),
-                "color": item.color if item.color else "",
-                "style": occasion_data.get("style", ""),
-                "pattern": item.pattern if item.pattern else "",
-                "season": item.season if item.season else "",
-                "brand": item.brand if item.brand else "",
-                "gender": occasion_data.get("gender", ""),
-                "occasions": occasion_data.get("occasions", []),
-                "image_url": item.image_url if item.image_url else "",  # ✅ IMAGE URL!
-                "description": item.description if item.description else ""
-            })
-        
-        return response_items
-        
-    except Exception as e:
-        print(f"❌ Get items error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve items: {str(e)}")
-
-# ========================================
-# GET SINGLE ITEM - NO AUTH
-# ========================================
-
-@router.get("/items/{item_id}", response_model=dict)
-def get_item(
-    item_id: int,
-    db: Session = Depends(get_db)
-):
-    """
-    Get single item details.
-    ✅ NOW RETURNS IMAGE URL!
-    """
-    try:
-        item = db.query(WardrobeItem).filter(WardrobeItem.id == item_id).first()
-        
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        print(f"📄 Retrieved item: {item.name}")
-        print(f"📷 Image URL: {item.image_url}")
-        
-        # Parse JSON from occasion column
-        try:
-            occasion_data = json.loads(item.occasion) if item.occasion else {}
-        except:
-            occasion_data = {}
-        
-        return {
-            "id": item.id,
-            "name": item.name,
-            "category": item.category,
-            "subcategory": item.type if item.type else "",
-            "fabric": occasion_data.get("fabric", ""),
-            "color": item.color if item.color else "",
-            "style": occasion_data.get("style", ""),
-            "pattern": item.pattern if item.pattern else "",
-            "season": item.season if item.season else "",
-            "brand": item.brand if item.brand else "",
-            "gender": occasion_data.get("gender", ""),
-            "occasions": occasion_data.get("occasions", []),
-            "image_url": item.image_url if item.image_url else "",  # ✅ IMAGE URL!
-            "description": item.description if item.description else ""
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Get item error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# ========================================
-# UPDATE ITEM - NO AUTH
-# ========================================
-
-@router.put("/items/{item_id}", response_model=dict)
-def update_item(
-    item_id: int,
-    request: UpdateItemRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Update wardrobe item.
-    """
-    try:
-        item = db.query(WardrobeItem).filter(WardrobeItem.id == item_id).first()
-        
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        # Parse existing JSON data
-        try:
-            occasion_data = json.loads(item.occasion) if item.occasion else {}
-        except:
-            occasion_data = {}
-        
-        # Update fields if provided
-        if request.name is not None:
-            item.name = request.name
-        if request.category is not None:
-            item.category = request.category
-        if request.color is not None:
-            item.color = request.color
-        if request.pattern is not None:
-            item.pattern = request.pattern
-        if request.subcategory is not None:
-            item.type = request.subcategory
-        if request.season is not None:
-            item.season = request.season
-        if request.brand is not None:
-            item.brand = request.brand
-        
-        # Update JSON fields
-        if request.style is not None:
-            occasion_data["style"] = request.style
-        if request.fabric is not None:
-            occasion_data["fabric"] = request.fabric
-        if request.gender is not None:
-            occasion_data["gender"] = request.gender
-        if request.occasions is not None:
-            occasion_data["occasions"] = request.occasions
-        
-        # Save updated JSON back
-        item.occasion = json.dumps(occasion_data)
-        
-        db.commit()
-        db.refresh(item)
-        
-        print(f"✅ Updated item: {item.name}")
-        
-        return {"message": "Item updated successfully", "item_id": item.id}
-        
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Update error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
-
-# ========================================
-# DELETE ITEM - NO AUTH
-# ========================================
-
-@router.delete("/items/{item_id}", response_model=dict)
-def delete_item(
-    item_id: int,
-    db: Session = Depends(get_db)
-):
-    """
-    Delete wardrobe item.
-    """
-    try:
-        item = db.query(WardrobeItem).filter(WardrobeItem.id == item_id).first()
-        
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        db.delete(item)
-        db.commit()
-        
-        print(f"✅ Deleted item: {item.name}")
-        
-        return {"message": "Item deleted successfully"}
-        
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Delete error: {e}")
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, select, update, literal, union_all
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import json
+import hashlib
+import asyncio
+import base64
+
+from app.config import get_settings
+from app.database import get_async_db
+from app.models.wardrobe import (
+    WardrobeItem, WardrobeItemOccasion, WardrobeRevision, normalize_occasion, normalize_occasions, color_columns,
+    color_clause, similar_color_clause
+)
+from app.models.analytics import WearLog
+from app.services.groq_service import groq_service
+from app.services.wardrobe_search_service import wardrobe_search_service
+from app.services.color_service import color_service
+from app.services.bulk_import_service import bulk_import_service
+from app.services.image_service import IngestedImage, image_service
+from app.services.image_store import image_store
+from app.services.vision_cache_service import vision_cache_service
+from app.services.local_vision_service import local_vision_service
+from app.services.job_service import job_service
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/wardrobe", tags=["Wardrobe"])
+
+# Listing page size
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# (wardrobe revision, filter tuple) -> total count. Every write in any process
+# bumps the revision, so entries of older revisions are simply never read again
+_total_count_cache = {}
+TOTAL_COUNT_CACHE_SIZE = 256
+
+# ========================================
+# PYDANTIC MODELS
+# ========================================
+
+class AnalyzeImageResponse(BaseModel):
+    itemname: str
+    category: str
+    subcategory: str
+    fabric: str
+    color: str
+    pattern: str
+    style: str
+    season: str
+    gender: str
+    occasions: List[str]
+    temp_image_path: str
+    image_variants: Optional[dict] = None
+    cache_hit: bool = False
+    cache_match: Optional[str] = None  # "exact" or "perceptual"
+    detection_source: str = "provider"  # provider | cache | local | fallback
+    palette: Optional[List[dict]] = None
+    category_hints: Optional[List[dict]] = None
+
+class CreateItemRequest(BaseModel):
+    name: str
+    category: str
+    subcategory: Optional[str] = None
+    fabric: str
+    color: str
+    style: str
+    pattern: str
+    season: str
+    brand: Optional[str] = None
+    gender: Optional[str] = None
+    occasions: Optional[List[str]] = []
+    image_url: Optional[str] = ""  # ✅ NEW: Image path from analysis
+
+class UpdateItemRequest(BaseModel):
+    name: Optional[str] = None
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    fabric: Optional[str] = None
+    color: Optional[str] = None
+    style: Optional[str] = None
+    pattern: Optional[str] = None
+    season: Optional[str] = None
+    brand: Optional[str] = None
+    gender: Optional[str] = None
+    occasions: Optional[List[str]] = None
+
+class WardrobeItemResponse(BaseModel):
+    id: int
+    name: str
+    category: str
+    subcategory: Optional[str]
+    fabric: str
+    color: str
+    style: str
+    pattern: str
+    season: str
+    brand: Optional[str]
+    gender: Optional[str]
+    occasions: Optional[List[str]]
+    image_url: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+# ========================================
+# SERIALIZATION
+# ========================================
+
+# API field name -> column, in response order
+ITEM_FIELDS = {
+    "id": WardrobeItem.id,
+    "name": WardrobeItem.name,
+    "category": WardrobeItem.category,
+    "subcategory": WardrobeItem.type,
+    "fabric": WardrobeItem.material,
+    "color": WardrobeItem.color,
+    "style": WardrobeItem.style,
+    "pattern": WardrobeItem.pattern,
+    "season": WardrobeItem.season,
+    "brand": WardrobeItem.brand,
+    "gender": WardrobeItem.gender,
+    "occasions": WardrobeItem.occasions,
+    "image_url": WardrobeItem.image_url,
+    "thumbnails": WardrobeItem.image_variants,
+    "description": WardrobeItem.description
+}
+
+# Fields returned as stored; everything else defaults to ""
+RAW_FIELDS = {"id", "name", "category"}
+
+def _field_value(field: str, value):
+    if field in RAW_FIELDS:
+        return value
+    if field == "occasions":
+        return value or []
+    if field == "thumbnails":
+        # size name -> URL; empty for items saved before image ingestion
+        return (value or {}).get("thumbnails", {})
+    return value or ""
+
+def serialize_row(fields: List[str], row) -> dict:
+    """Map a column-projected row to the API response shape"""
+    return {field: _field_value(field, value) for field, value in zip(fields, row)}
+
+def serialize_item(item: WardrobeItem) -> dict:
+    """Map a WardrobeItem row to the API response shape"""
+    return {
+        field: _field_value(field, getattr(item, column.key))
+        for field, column in ITEM_FIELDS.items()
+    }
+
+# ========================================
+# REVISIONS & ETAGS
+# ========================================
+
+async def get_revision(db: AsyncSession, user_id: int = settings.DEFAULT_USER_ID) -> int:
+    """Current wardrobe revision (one primary-key lookup)"""
+    return await db.scalar(
+        select(WardrobeRevision.revision).where(WardrobeRevision.user_id == user_id)
+    ) or 0
+
+async def bump_revision(db: AsyncSession, user_id: int = settings.DEFAULT_USER_ID):
+    """Advance the wardrobe revision inside the caller's transaction"""
+    result = await db.execute(
+        update(WardrobeRevision)
+        .where(WardrobeRevision.user_id == user_id)
+        .values(revision=WardrobeRevision.revision + 1)
+    )
+    if result.rowcount == 0:
+        db.add(WardrobeRevision(user_id=user_id, revision=1))
+
+def make_etag(revision: int, *parts) -> str:
+    """Strong ETag for a response derived from the wardrobe revision"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:16]
+    return f'"{revision}-{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def set_etag(response: Response, etag: str):
+    # no-cache: browsers keep the body but revalidate with If-None-Match every time
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+# ========================================
+# ANALYZE IMAGE - NO AUTH
+# ========================================
+
+def analyze_upload(image_bytes: bytes, enrich: bool = True) -> dict:
+    """
+    Ingest an uploaded image (master + thumbnails) and run clothing detection on it.
+    With enrich=False only the local pre-detection runs - no provider call.
+    """
+    # Content-addressed: a re-uploaded photo maps to the files already stored
+    image = image_service.ingest(image_bytes)
+    
+    print(f"💾 Image saved: {image.url}")
+    return analyze_ingested(image, enrich)
+
+def analyze_ingested(image: IngestedImage, enrich: bool = True) -> dict:
+    """Clothing detection for an already stored image"""
+    # Retried uploads of the same photo skip the provider entirely
+    cached = vision_cache_service.get(image.key, image.phash, image.color) if enrich else None
+    local = None
+    if cached:
+        detected, source = cached.result, "cache"
+    elif not enrich:
+        local = local_vision_service.detect(image.image) if image.image else None
+        detected, source = (local, "local") if local else ({}, "fallback")
+    else:
+        # Detect on the upright, size-capped master rather than the raw upload;
+        # its encoded bytes go to the provider as-is
+        print("🤖 Analyzing image with Gemini Vision...")
+        detected, source = groq_service.detect_clothing_from_image(image.master_bytes), "provider"
+        if not detected.get("is_fallback"):
+            vision_cache_service.put(image.key, image.phash, detected, image.color)
+        else:
+            # Provider missing or failed: offer local guesses instead of placeholders
+            local = local_vision_service.detect(image.image) if image.image else None
+            detected, source = (local, "local") if local else (detected, "fallback")
+    
+    print(f"✅ Detection complete: {detected}")
+    
+    # ✅ Map response with IMAGE PATH
+    return {
+        "itemname": detected.get("item_name", "Clothing Item"),
+        "category": detected.get("category", "Tops"),
+        "subcategory": detected.get("sub_category", ""),
+        "fabric": detected.get("fabric", "cotton"),
+        "color": detected.get("color", ""),
+        "pattern": detected.get("pattern", "solid"),
+        "style": detected.get("style", "casual"),
+        "season": detected.get("season", "all-season"),
+        "gender": detected.get("gender", "unisex"),
+        "occasions": detected.get("occasions", ["casual"]),
+        "temp_image_path": image.url,  # ✅ Image path!
+        "image_variants": image.variants,
+        "cache_hit": cached is not None,
+        "cache_match": cached.match if cached else None,
+        "detection_source": source,
+        "palette": local["palette"] if local else None,
+        "category_hints": local["category_hints"] if local else None
+    }
+
+@router.post("/analyze-image", response_model=AnalyzeImageResponse)
+async def analyze_image(file: UploadFile = File(...), enrich: bool = Query(default=True)):
+    """
+    Analyze clothing image using Gemini Vision.
+    Saves image and returns analysis. enrich=false returns the local
+    color/pattern/category guesses right away without calling the provider.
+    """
+    try:
+        print("📸 Receiving image for analysis...")
+        
+        # Read image bytes
+        image_bytes = await file.read()
+        response = await run_in_threadpool(analyze_upload, image_bytes, enrich)
+        
+        print(f"✅ Analysis response: {response}")
+        return response
+        
+    except Exception as e:
+        print(f"❌ Analysis error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
+
+# ========================================
+# BATCH ANALYZE IMAGES - NO AUTH
+# ========================================
+
+@job_service.handler("analyze-image")
+def run_analyze_image_job(params: dict, progress) -> dict:
+    """Background variant of /analyze-image: the upload was stored when the job was queued"""
+    image = image_service.load(params["image_url"])
+    if not image:
+        raise ValueError(f"Stored image not found: {params['image_url']}")
+    
+    progress(20, "Detecting clothing")
+    return analyze_ingested(image, params.get("enrich", True))
+
+@router.post("/analyze-image/jobs", status_code=202)
+async def queue_image_analysis(file: UploadFile = File(...), enrich: bool = Query(default=True)):
+    """
+    Store the image and queue its analysis as a background job. Returns the
+    job id right away; poll /api/jobs/{id} or follow /api/jobs/{id}/events.
+    """
+    try:
+        image_bytes = await file.read()
+        image = await run_in_threadpool(image_service.ingest, image_bytes)
+        job_id = await run_in_threadpool(
+            job_service.submit, "analyze-image", {"image_url": image.url, "enrich": enrich}
+        )
+        
+        return JSONResponse(status_code=202, content={
+            "job_id": job_id,
+            "status": "queued",
+            "temp_image_path": image.url,
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events"
+        }, headers={"Location": f"/api/jobs/{job_id}"})
+        
+    except Exception as e:
+        print(f"❌ Could not queue analysis: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def format_stream_event(payload: dict, stream_format: str, event: str = "result") -> str:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps(payload) + "\n"
+
+@router.post("/analyze-images")
+async def analyze_images(
+    files: List[UploadFile] = File(...),
+    concurrency: int = Query(default=settings.VISION_CONCURRENCY, ge=1, le=16),
+    stream_format: str = Query(default="ndjson", pattern="^(ndjson|sse)$"),
+    enrich: bool = Query(default=True)
+):
+    """
+    Analyze many clothing photos in one request.
+    Detection runs with at most `concurrency` provider calls in flight, and
+    each result is streamed (NDJSON lines or SSE events) as soon as it is ready.
+    """
+    print(f"📸 Receiving {len(files)} images for batch analysis (concurrency {concurrency})")
+    
+    # Read everything up front: upload files are closed once the handler returns
+    uploads = [(index, file.filename, await file.read()) for index, file in enumerate(files)]
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def analyze_one(index: int, filename: str, image_bytes: bytes) -> dict:
+        async with semaphore:
+            try:
+                analysis = await run_in_threadpool(analyze_upload, image_bytes, enrich)
+                return {"index": index, "filename": filename, "status": "ok", "analysis": analysis}
+            except Exception as e:
+                print(f"❌ Analysis error ({filename}): {e}")
+                return {"index": index, "filename": filename, "status": "error", "error": str(e)}
+    
+    async def results():
+        tasks = [asyncio.create_task(analyze_one(*upload)) for upload in uploads]
+        ok = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                ok += result["status"] == "ok"
+                yield format_stream_event(result, stream_format)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        print(f"✅ Batch analysis complete: {ok}/{len(tasks)}")
+        yield format_stream_event({"total": len(tasks), "succeeded": ok}, stream_format, event="done")
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(results(), media_type=media_type)
+
+# ========================================
+# CREATE ITEM - NO AUTH
+# ========================================
+
+def item_values(request: CreateItemRequest) -> dict:
+    """Column values for a new item (occasions are written separately)"""
+    return {
+        "name": request.name,
+        "category": request.category or "",
+        "type": request.subcategory or "",
+        "pattern": request.pattern or "",
+        "material": request.fabric or "",
+        "style": request.style or "",
+        "gender": request.gender or "unisex",
+        "brand": request.brand or "",
+        "size": "",
+        "season": request.season or "",
+        "description": f"{request.color} {request.pattern} {request.subcategory or request.category}",
+        "image_url": request.image_url or "",  # ✅ SAVE IMAGE URL!
+        "image_variants": image_service.variants_for(request.image_url),
+        "created_at": datetime.now(),
+        **color_columns(request.color or "")
+    }
+
+@router.post("/items", response_model=dict, status_code=201)
+async def create_item(
+    request: CreateItemRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create wardrobe item after user confirms/edits the form.
+    ✅ NOW SAVES IMAGE URL!
+    """
+    try:
+        print(f"📝 Creating item: {request.name}")
+        print(f"   Image: {request.image_url}")
+        print(f"   Gender: {request.gender}")
+        print(f"   Occasions: {request.occasions}")
+        
+        # ✅ SAVE IMAGE URL!
+        item = WardrobeItem(**item_values(request))
+        item.set_occasions(request.occasions)
+        
+        print(f"💾 Item object created: {item}")
+        
+        db.add(item)
+        await bump_revision(db)
+        await db.commit()
+        await db.refresh(item)
+        
+        print(f"✅ Item created with ID: {item.id}")
+        
+        return {
+            "message": "Item created successfully",
+            "item_id": item.id,
+            "item": {
+                "id": item.id,
+                "name": item.name,
+                "category": item.category,
+                "color": item.color,
+                "image_url": item.image_url  # ✅ Return image URL!
+            }
+        }
+        
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ Create error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to create item: {str(e)}")
+
+# ========================================
+# BULK IMPORT - NO AUTH
+# ========================================
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request body itself.
+    The stock class listens for disconnects on receive(), which would
+    swallow the upload chunks, so this one leaves receive() alone.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+def parse_import_row(record: dict):
+    """Validate one import row -> (column values, occasion lookup keys)"""
+    request = CreateItemRequest(**record)
+    occasions = normalize_occasions(request.occasions)
+    return {**item_values(request), "occasions": occasions}, [normalize_occasion(value) for value in occasions]
+
+@router.post("/import")
+async def import_items(
+    request: Request,
+    format: Optional[str] = Query(default=None, pattern="^(csv|ndjson)$")
+):
+    """
+    Bulk import from a streamed CSV or NDJSON body (one item per row, same
+    fields as POST /items; CSV occasions separated by "|").
+    Rows are validated as they arrive and inserted in batched transactions;
+    the response streams one NDJSON result per row, then a summary line.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    print(f"📥 Bulk import started ({fmt})")
+    
+    return UploadStreamingResponse(
+        bulk_import_service.import_stream(
+            request.stream(), fmt, parse_import_row
+        ),
+        media_type="application/x-ndjson"
+    )
+
+# ========================================
+# GET ALL ITEMS - NO AUTH
+# ========================================
+
+class ItemFilters:
+    """Wardrobe filter query parameters, applied in SQL"""
+    
+    def __init__(
+        self,
+        category: Optional[str] = None,
+        color: Optional[str] = None,
+        style: Optional[str] = None,
+        fabric: Optional[str] = None,
+        gender: Optional[str] = None,
+        occasion: Optional[str] = None,
+        season: Optional[str] = None,
+        pattern: Optional[str] = None,
+        brand: Optional[str] = None,
+        similar_to: Optional[str] = None,
+        delta_e: float = Query(default=12.0, ge=0, le=100)
+    ):
+        self.delta_e = delta_e
+        self.values = {
+            "category": category,
+            "color": color,
+            "style": style,
+            "fabric": fabric,
+            "gender": gender,
+            "occasion": occasion,
+            "season": season,
+            "pattern": pattern,
+            "brand": brand,
+            "similar_to": similar_to
+        }
+    
+    def cache_key(self) -> tuple:
+        key = tuple(sorted((k, v) for k, v in self.values.items() if v))
+        return key + ((self.delta_e,) if self.values["similar_to"] else ())
+    
+    def apply(self, query, exclude: Optional[str] = None):
+        """Add the active filters to a query, optionally skipping one of them"""
+        active = {k: v for k, v in self.values.items() if v and k != exclude}
+        
+        if "category" in active:
+            query = query.filter(WardrobeItem.category == active["category"])
+        if "color" in active:
+            query = query.filter(color_clause(active["color"]))
+        if "similar_to" in active:
+            query = query.filter(similar_color_clause(active["similar_to"], self.delta_e))
+        if "style" in active:
+            query = query.filter(WardrobeItem.style == active["style"])
+        if "fabric" in active:
+            query = query.filter(WardrobeItem.material == active["fabric"])
+        if "gender" in active:
+            query = query.filter(
+                (WardrobeItem.gender == active["gender"]) | (WardrobeItem.gender == "unisex")
+            )
+        if "occasion" in active:
+            query = query.filter(WardrobeItem.occasion_links.any(
+                WardrobeItemOccasion.occasion == normalize_occasion(active["occasion"])
+            ))
+        if "season" in active:
+            query = query.filter(WardrobeItem.season == active["season"])
+        if "pattern" in active:
+            query = query.filter(WardrobeItem.pattern == active["pattern"])
+        if "brand" in active:
+            query = query.filter(WardrobeItem.brand == active["brand"])
+        return query
+
+def encode_cursor(item_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": item_id}).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated fields= projection (id is always included)"""
+    if not fields:
+        return list(ITEM_FIELDS)
+    
+    selected = ["id"]
+    for field in fields.split(","):
+        field = field.strip()
+        if not field or field in selected:
+            continue
+        if field not in ITEM_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+        selected.append(field)
+    return selected
+
+async def count_items(db: AsyncSession, filters: ItemFilters, revision: int) -> int:
+    """Total matching items, cached per wardrobe revision"""
+    key = (revision, filters.cache_key())
+    if key not in _total_count_cache:
+        count = await db.scalar(filters.apply(select(func.count(WardrobeItem.id))))
+        for stale in [k for k in _total_count_cache if k[0] != revision]:
+            del _total_count_cache[stale]
+        if len(_total_count_cache) >= TOTAL_COUNT_CACHE_SIZE:
+            _total_count_cache.clear()
+        _total_count_cache[key] = count
+    return _total_count_cache[key]
+
+@router.get("/items", response_model=List[dict])
+async def get_all_items(
+    request: Request,
+    response: Response,
+    filters: ItemFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get wardrobe items, newest first, one page at a time.
+    Filters run in SQL against indexed columns. color matches the normalized
+    palette color; similar_to matches colors within delta_e (CIEDE2000).
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page;
+    X-Total-Count is sent with the first page only.
+    Send the ETag back as If-None-Match to get 304 while the wardrobe is unchanged.
+    """
+    try:
+        revision = await get_revision(db)
+        etag = make_etag(revision, "items", sorted(request.query_params.multi_items()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        selected = parse_fields(fields)
+        
+        # Only the requested columns are selected - no ORM objects are built
+        query = filters.apply(select(*[ITEM_FIELDS[field] for field in selected]))
+        
+        # Keyset pagination on the primary key (ids grow with created_at)
+        if cursor:
+            query = query.filter(WardrobeItem.id < decode_cursor(cursor))
+        
+        rows = (await db.execute(query.order_by(WardrobeItem.id.desc()).limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        print(f"📦 Retrieved {len(rows)} items")
+        
+        if has_more:
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
+        if not cursor:
+            response.headers["X-Total-Count"] = str(await count_items(db, filters, revision))
+        set_etag(response, etag)
+        
+        return [serialize_row(selected, row) for row in rows]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Get items error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve items: {str(e)}")
+
+# ========================================
+# FACET COUNTS - NO AUTH
+# ========================================
+
+# Facet name -> grouped column (each has its own index). Colors group by
+# palette family - the value the color= filter matches for a bare family
+# word - so "navy blue", "Navy" and "dark navy" share one entry
+FACET_COLUMNS = {
+    "category": WardrobeItem.category,
+    "color": WardrobeItem.color_family,
+    "season": WardrobeItem.season,
+    "pattern": WardrobeItem.pattern,
+    "brand": WardrobeItem.brand
+}
+
+@router.get("/facets", response_model=dict)
+async def get_facets(
+    filters: ItemFilters = Depends(),
+    size: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Value counts for the filter sidebar, computed with grouped SQL.
+    Each facet honours every active filter except its own, so the sidebar
+    keeps showing the alternatives for a filter that is already applied.
+    """
+    try:
+        # One GROUP BY per facet, sent as a single UNION ALL statement
+        selects = [
+            filters.apply(
+                select(
+                    literal(name).label("facet"),
+                    column.label("value"),
+                    func.count().label("count")
+                ).where(column.isnot(None), column != ""),
+                exclude=name
+            ).group_by(column)
+            for name, column in FACET_COLUMNS.items()
+        ]
+        rows = (await db.execute(union_all(*selects))).all()
+        
+        facets = {name: [] for name in FACET_COLUMNS}
+        for row in rows:
+            facets[row.facet].append({"value": row.value, "count": row.count})
+        for name in facets:
+            facets[name] = sorted(facets[name], key=lambda f: (-f["count"], f["value"]))[:size]
+        
+        return {"total": await count_items(db, filters, await get_revision(db)), "facets": facets}
+        
+    except Exception as e:
+        print(f"❌ Facets error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to compute facets: {str(e)}")
+
+# ========================================
+# FULL-TEXT SEARCH - NO AUTH
+# ========================================
+
+@router.get("/search", response_model=List[dict])
+async def search_items(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Ranked search over name, description, brand, color, type and occasions.
+    Every term is prefix-matched ("burg silk" finds "Burgundy Silk Saree").
+    """
+    try:
+        selected = parse_fields(fields)
+        ids = await db.run_sync(wardrobe_search_service.search_ids, q, limit)
+        if not ids:
+            return []
+        
+        rows = (await db.execute(
+            select(*[ITEM_FIELDS[field] for field in selected]).where(WardrobeItem.id.in_(ids))
+        )).all()
+        
+        # Restore relevance order
+        by_id = {row.id: row for row in rows}
+        results = [serialize_row(selected, by_id[i]) for i in ids if i in by_id]
+        print(f"🔎 Search '{q}': {len(results)} items")
+        return results
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Search error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+# ========================================
+# GET SINGLE ITEM - NO AUTH
+# ========================================
+
+@router.get("/items/{item_id}", response_model=dict)
+async def get_item(
+    item_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get single item details.
+    ✅ NOW RETURNS IMAGE URL!
+    """
+    try:
+        # Existence first (primary-key probe): "If-None-Match: *" only
+        # matches an item that exists, a missing one is still a 404
+        if await db.scalar(select(WardrobeItem.id).where(WardrobeItem.id == item_id)) is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        
+        etag = make_etag(await get_revision(db), "item", item_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        item = await db.get(WardrobeItem, item_id)
+        
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        
+        print(f"📄 Retrieved item: {item.name}")
+        print(f"📷 Image URL: {item.image_url}")
+        
+        set_etag(response, etag)
+        return serialize_item(item)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Get item error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ========================================
+# UPDATE ITEM - NO AUTH
+# ========================================
+
+async def get_item_with_links(db: AsyncSession, item_id: int) -> Optional[WardrobeItem]:
+    """Load an item with its occasion links (async sessions cannot lazy-load them)"""
+    return await db.scalar(
+        select(WardrobeItem)
+        .options(selectinload(WardrobeItem.occasion_links))
+        .where(WardrobeItem.id == item_id)
+    )
+
+@router.put("/items/{item_id}", response_model=dict)
+async def update_item(
+    item_id: int,
+    request: UpdateItemRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update wardrobe item.
+    """
+    try:
+        item = await get_item_with_links(db, item_id)
+        
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        
+        # Update fields if provided
+        if request.name is not None:
+            item.name = request.name
+        if request.category is not None:
+            item.category = request.category
+        if request.color is not None:
+            item.set_color(request.color)
+        if request.pattern is not None:
+            item.pattern = request.pattern
+        if request.subcategory is not None:
+            item.type = request.subcategory
+        if request.season is not None:
+            item.season = request.season
+        if request.brand is not None:
+            item.brand = request.brand
+        
+        if request.style is not None:
+            item.style = request.style
+        if request.fabric is not None:
+            item.material = request.fabric
+        if request.gender is not None:
+            item.gender = request.gender
+        if request.occasions is not None:
+            item.set_occasions(request.occasions)
+        
+        await bump_revision(db)
+        await db.commit()
+        await db.refresh(item)
+        
+        print(f"✅ Updated item: {item.name}")
+        
+        return {"message": "Item updated successfully", "item_id": item.id}
+        
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ Update error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ========================================
+# DELETE ITEM - NO AUTH
+# ========================================
+
+@router.delete("/items/{item_id}", response_model=dict)
+async def delete_item(
+    item_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete wardrobe item.
+    """
+    try:
+        item = await get_item_with_links(db, item_id)
+        
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        
+        # SQLite runs without foreign_keys, so wear_logs' ON DELETE CASCADE never fires
+        await db.execute(delete(WearLog).where(WearLog.item_id == item_id))
+        await db.delete(item)
+        await bump_revision(db)
+        await db.commit()
+        
+        # Identical uploads share files - only remove them once nothing points there
+        if item.image_url:
+            still_used = await db.scalar(
+                select(func.count(WardrobeItem.id)).where(WardrobeItem.image_url == item.image_url)
+            )
+            if not still_used:
+                removed = image_store.delete(image_service.urls_of(item.image_url, item.image_variants))
+                print(f"🗑️  Removed {removed} image files")
+        
+        print(f"✅ Deleted item: {item.name}")
+        
+        return {"message": "Item deleted successfully"}
+        
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ Delete error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_settings
+from app.database import get_async_db
+from app.models.analytics import WearLog
+from app.models.wardrobe import WardrobeItem
+from app.services.wear_log_service import wear_log_writer
+
+router = APIRouter(prefix="/api/wear", tags=["Wear Log"])
+settings = get_settings()
+
+MAX_HISTORY = 500
+
+# ========================================
+# PYDANTIC MODELS
+# ========================================
+
+class WearRequest(BaseModel):
+    worn_date: Optional[datetime] = None  # defaults to now; naive times are UTC
+
+class OutfitWearRequest(WearRequest):
+    item_ids: List[int] = Field(min_length=1)
+    outfit_id: Optional[int] = None  # groups the rows of one outfit in the history
+
+# ========================================
+# HELPERS
+# ========================================
+
+async def check_items(db: AsyncSession, item_ids: List[int]):
+    """404 unless every id is a wardrobe item"""
+    found = set((await db.scalars(select(WardrobeItem.id).where(WardrobeItem.id.in_(item_ids)))).all())
+    missing = [item_id for item_id in item_ids if item_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Items not found: {missing}")
+
+def history_row(row) -> dict:
+    return {
+        "id": row.id,
+        "item_id": row.item_id,
+        "item_name": row.name,
+        "outfit_id": row.outfit_id,
+        "worn_date": row.worn_date.isoformat() if row.worn_date else None
+    }
+
+HISTORY_COLUMNS = (WearLog.id, WearLog.item_id, WardrobeItem.name, WearLog.outfit_id, WearLog.worn_date)
+
+# ========================================
+# LOG WEARS
+# ========================================
+
+@router.post("/items/{item_id}")
+async def log_item_wear(item_id: int, request: Optional[WearRequest] = None, db: AsyncSession = Depends(get_async_db)):
+    """Record that one item was worn"""
+    await check_items(db, [item_id])
+    await db.close()  # don't hold a connection while the batch fills
+    logged = await wear_log_writer.log_async(settings.DEFAULT_USER_ID, [item_id], request.worn_date if request else None)
+    return {"success": True, "logged": logged}
+
+@router.post("/outfit")
+async def log_outfit_wear(request: OutfitWearRequest, db: AsyncSession = Depends(get_async_db)):
+    """Record that a whole outfit was worn - one row per item, written together"""
+    item_ids = list(dict.fromkeys(request.item_ids))
+    await check_items(db, item_ids)
+    await db.close()
+    logged = await wear_log_writer.log_async(settings.DEFAULT_USER_ID, item_ids, request.worn_date, request.outfit_id)
+    return {"success": True, "logged": logged}
+
+# ========================================
+# HISTORY
+# ========================================
+
+@router.get("/history")
+async def wear_history(
+    days: int = Query(default=30, ge=1),
+    limit: int = Query(default=100, ge=1, le=MAX_HISTORY),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Wears in the last `days`, newest first (served by the (user_id, worn_date) index)"""
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    rows = (await db.execute(
+        select(*HISTORY_COLUMNS)
+        .join(WardrobeItem, WardrobeItem.id == WearLog.item_id)
+        .where(WearLog.user_id == settings.DEFAULT_USER_ID, WearLog.worn_date >= since)
+        .order_by(WearLog.worn_date.desc())
+        .limit(limit)
+    )).all()
+    return {"success": True, "wears": [history_row(row) for row in rows]}
+
+@router.get("/items/{item_id}")
+async def item_wear_history(
+    item_id: int,
+    limit: int = Query(default=50, ge=1, le=MAX_HISTORY),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """An item's wear count, last wear and most recent wears (served by the (item_id, worn_date) index)"""
+    item = (await db.execute(
+        select(WardrobeItem.id, WardrobeItem.name, WardrobeItem.wear_count, WardrobeItem.last_worn)
+        .where(WardrobeItem.id == item_id)
+    )).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    rows = (await db.execute(
+        select(*HISTORY_COLUMNS)
+        .join(WardrobeItem, WardrobeItem.id == WearLog.item_id)
+        .where(WearLog.item_id == item_id)
+        .order_by(WearLog.worn_date.desc())
+        .limit(limit)
+    )).all()
+    return {
+        "success": True,
+        "item_id": item.id,
+        "name": item.name,
+        "wear_count": item.wear_count,
+        "last_worn": item.last_worn.isoformat() if item.last_worn else None,
+        "wears": [history_row(row) for row in rows]
+    }
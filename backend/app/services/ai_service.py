@@ -1,199 +1,290 @@
-import json
-from app.services.groq_service import groq_service
-from app.services.weather_service import weather_service
-
-class AIService:
-    
-    def detect_clothing_attributes(self, image_base64: str) -> dict:
-        """Detect clothing attributes from image using Groq Vision"""
-        prompt = """Analyze this clothing item and provide the following information in JSON format:
-        {
-            "type": "shirt/pants/dress/etc",
-            "color": "primary color",
-            "pattern": "solid/striped/floral/etc",
-            "style": "casual/formal/sporty/etc",
-            "category": "tops/bottoms/dresses/outerwear/etc",
-            "season": "spring/summer/fall/winter/all-season",
-            "suggested_occasions": ["office", "casual", "party"]
-        }
-        Be specific and accurate."""
-        
-        result = groq_service.analyze_image(image_base64, prompt)
-        
-        try:
-            # Try to extract JSON from the response
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                json_str = result[json_start:json_end]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        # Fallback response
-        return {
-            "type": "clothing",
-            "color": "unknown",
-            "pattern": "solid",
-            "style": "casual",
-            "category": "general",
-            "season": "all-season",
-            "suggested_occasions": ["casual"]
-        }
-    
-    def generate_outfit_suggestions(self, occasion: str, weather_data: dict, user_preferences: dict, available_items: list) -> list:
-        """Generate outfit suggestions for occasion"""
-        
-        weather_desc = weather_data.get("description", "mild weather")
-        temp = weather_data.get("temperature", 20)
-        
-        prompt = f"""Generate 3 outfit suggestions for a {occasion} event.
-        
-        Weather: {weather_desc}, {temp}°C
-        User preferences: {json.dumps(user_preferences)}
-        Available wardrobe items: {json.dumps(available_items[:20])}
-        
-        Return JSON array with 3 outfits:
-        [
-            {{
-                "name": "Outfit 1 Name",
-                "items": ["item_id_1", "item_id_2"],
-                "reasoning": "Why this outfit works",
-                "weather_appropriate": true,
-                "style_score": 85
-            }}
-        ]"""
-        
-        result = groq_service.generate_text(prompt)
-        
-        try:
-            if "[" in result and "]" in result:
-                json_start = result.index("[")
-                json_end = result.rindex("]") + 1
-                json_str = result[json_start:json_end]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        return [{
-            "name": f"{occasion} Outfit",
-            "items": [item["id"] for item in available_items[:3]] if available_items else [],
-            "reasoning": f"A stylish outfit for {occasion}",
-            "weather_appropriate": True,
-            "style_score": 80
-        }]
-    
-    def generate_prompt_outfit(self, prompt: str, wardrobe_items: list) -> dict:
-        """Generate outfit from text/voice prompt"""
-        
-        items_desc = json.dumps([{
-            "id": item["id"],
-            "type": item["type"],
-            "color": item["color"],
-            "style": item["style"]
-        } for item in wardrobe_items[:30]])
-        
-        ai_prompt = f"""User request: "{prompt}"
-        
-        Available wardrobe: {items_desc}
-        
-        Create an outfit matching the request. Return JSON:
-        {{
-            "outfit_description": "Description of the outfit",
-            "matched_items": [list of item IDs from wardrobe],
-            "missing_items": [
-                {{"type": "item type", "description": "what's needed"}}
-            ],
-            "style_notes": "Additional styling tips"
-        }}"""
-        
-        result = groq_service.generate_text(ai_prompt)
-        
-        try:
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                json_str = result[json_start:json_end]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        return {
-            "outfit_description": "Custom outfit based on your request",
-            "matched_items": [item["id"] for item in wardrobe_items[:3]],
-            "missing_items": [],
-            "style_notes": "Great choice!"
-        }
-    
-    def analyze_body_shape(self, measurements: dict) -> dict:
-        """Analyze body shape and provide recommendations"""
-        
-        prompt = f"""Analyze body measurements and provide fashion recommendations.
-        
-        Measurements: {json.dumps(measurements)}
-        
-        Return JSON:
-        {{
-            "body_shape": "hourglass/pear/apple/rectangle/inverted_triangle",
-            "recommended_styles": ["style recommendations"],
-            "flattering_fits": ["fit recommendations"],
-            "avoid_styles": ["styles to avoid"],
-            "confidence_score": 85
-        }}"""
-        
-        result = groq_service.generate_text(prompt)
-        
-        try:
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                json_str = result[json_start:json_end]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        return {
-            "body_shape": "balanced",
-            "recommended_styles": ["fitted tops", "A-line dresses"],
-            "flattering_fits": ["tailored", "structured"],
-            "avoid_styles": [],
-            "confidence_score": 75
-        }
-    
-    def compare_outfits(self, outfit1_items: list, outfit2_items: list, occasion: str) -> dict:
-        """Compare two outfits"""
-        
-        prompt = f"""Compare these two outfits for {occasion}:
-        
-        Outfit 1: {json.dumps(outfit1_items)}
-        Outfit 2: {json.dumps(outfit2_items)}
-        
-        Return JSON:
-        {{
-            "winner": "outfit1" or "outfit2",
-            "outfit1_score": 85,
-            "outfit2_score": 78,
-            "comparison": "Detailed comparison",
-            "reasoning": "Why one is better"
-        }}"""
-        
-        result = groq_service.generate_text(prompt)
-        
-        try:
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                json_str = result[json_start:json_end]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        return {
-            "winner": "outfit1",
-            "outfit1_score": 85,
-            "outfit2_score": 78,
-            "comparison": "Both outfits work well",
-            "reasoning": "Outfit 1 has better color coordination"
-        }
-
-ai_service = AIService()
+import json
+from typing import Annotated, Any, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+from app.config import get_settings
+from app.services.groq_service import VISION_MODEL, groq_service
+from app.services.json_extractor import extract_json
+from app.services.llm_cache_service import CacheSite, llm_cache_service
+from app.services.wardrobe_selection_service import SelectionContext, wardrobe_selection_service
+from app.services.weather_service import weather_service
+
+settings = get_settings()
+
+# ========================================
+# RESPONSE SCHEMAS
+# ========================================
+
+Score = Optional[Union[int, float]]
+ItemId = Union[str, int]
+
+
+class ClothingAttributes(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    type: str
+    color: str
+    pattern: str = "solid"
+    style: str = "casual"
+    category: str = "general"
+    season: str = "all-season"
+    suggested_occasions: List[str] = []
+
+
+class OutfitSuggestion(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    items: List[ItemId] = []
+    reasoning: str = ""
+    weather_appropriate: bool = True
+    style_score: Score = None
+
+
+OutfitSuggestions = Annotated[List[OutfitSuggestion], Field(min_length=1)]
+
+
+class MissingItem(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    type: str
+    description: str = ""
+
+
+class PromptOutfit(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    outfit_description: str
+    matched_items: List[ItemId] = []
+    missing_items: List[MissingItem] = []
+    style_notes: str = ""
+
+
+class BodyShapeAnalysis(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    body_shape: str
+    recommended_styles: List[str] = []
+    flattering_fits: List[str] = []
+    avoid_styles: List[str] = []
+    confidence_score: Score = None
+
+
+class OutfitComparison(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    winner: str
+    outfit1_score: Score = None
+    outfit2_score: Score = None
+    comparison: str = ""
+    reasoning: str = ""
+
+
+OUTFIT_SUGGESTIONS_PROMPT = """Generate 3 outfit suggestions for a {occasion} event.
+
+Weather: {weather}, {temperature}°C
+User preferences: {preferences}
+Available wardrobe items (best fits per slot; fields as in each [slot] header):
+{items}
+
+Return JSON array with 3 outfits:
+[
+    {{
+        "name": "Outfit 1 Name",
+        "items": ["item_id_1", "item_id_2"],
+        "reasoning": "Why this outfit works",
+        "weather_appropriate": true,
+        "style_score": 85
+    }}
+]"""
+
+PROMPT_OUTFIT_PROMPT = """User request: "{request}"
+
+Available wardrobe (best fits per slot; fields as in each [slot] header):
+{items}
+
+Create an outfit matching the request. Return JSON:
+{{
+    "outfit_description": "Description of the outfit",
+    "matched_items": [list of item IDs from wardrobe],
+    "missing_items": [
+        {{"type": "item type", "description": "what's needed"}}
+    ],
+    "style_notes": "Additional styling tips"
+}}"""
+
+BODY_SHAPE_PROMPT = """Analyze body measurements and provide fashion recommendations.
+
+Measurements: {measurements}
+
+Return JSON:
+{{
+    "body_shape": "hourglass/pear/apple/rectangle/inverted_triangle",
+    "recommended_styles": ["style recommendations"],
+    "flattering_fits": ["fit recommendations"],
+    "avoid_styles": ["styles to avoid"],
+    "confidence_score": 85
+}}"""
+
+COMPARE_OUTFITS_PROMPT = """Compare these two outfits for {occasion}:
+
+Outfit 1: {outfit1}
+Outfit 2: {outfit2}
+
+Return JSON:
+{{
+    "winner": "outfit1" or "outfit2",
+    "outfit1_score": 85,
+    "outfit2_score": 78,
+    "comparison": "Detailed comparison",
+    "reasoning": "Why one is better"
+}}"""
+
+# Same model + template + normalized inputs => same answer, reused for the site's TTL
+OUTFIT_SUGGESTIONS_SITE = CacheSite("outfit-suggestions", OUTFIT_SUGGESTIONS_PROMPT, VISION_MODEL,
+                                    settings.LLM_CACHE_TTL_OUTFIT_SUGGESTIONS)
+PROMPT_OUTFIT_SITE = CacheSite("prompt-outfit", PROMPT_OUTFIT_PROMPT, VISION_MODEL,
+                               settings.LLM_CACHE_TTL_PROMPT_OUTFIT)
+BODY_SHAPE_SITE = CacheSite("body-shape", BODY_SHAPE_PROMPT, VISION_MODEL, settings.LLM_CACHE_TTL_BODY_SHAPE)
+COMPARE_OUTFITS_SITE = CacheSite("compare-outfits", COMPARE_OUTFITS_PROMPT, VISION_MODEL,
+                                 settings.LLM_CACHE_TTL_COMPARE_OUTFITS)
+
+
+def ask_json(prompt: str, schema: Any, expect: str = "{"):
+    """Model answer as JSON valid for `schema` (an array with expect="["); None if there is none"""
+    return groq_service.generate_json(prompt, schema, expect)
+
+
+class AIService:
+    
+    def detect_clothing_attributes(self, image_base64: str) -> dict:
+        """Detect clothing attributes from image using Groq Vision"""
+        prompt = """Analyze this clothing item and provide the following information in JSON format:
+        {
+            "type": "shirt/pants/dress/etc",
+            "color": "primary color",
+            "pattern": "solid/striped/floral/etc",
+            "style": "casual/formal/sporty/etc",
+            "category": "tops/bottoms/dresses/outerwear/etc",
+            "season": "spring/summer/fall/winter/all-season",
+            "suggested_occasions": ["office", "casual", "party"]
+        }
+        Be specific and accurate."""
+        
+        result = groq_service.analyze_image(image_base64, prompt)
+        
+        attributes = extract_json(result, ClothingAttributes, expect="{")
+        if attributes is not None:
+            return attributes
+        
+        # Fallback response
+        return {
+            "type": "clothing",
+            "color": "unknown",
+            "pattern": "solid",
+            "style": "casual",
+            "category": "general",
+            "season": "all-season",
+            "suggested_occasions": ["casual"]
+        }
+    
+    def generate_outfit_suggestions(self, occasion: str, weather_data: dict, user_preferences: dict, available_items: list) -> list:
+        """Generate outfit suggestions for occasion"""
+        
+        weather_desc = weather_data.get("description", "mild weather")
+        temp = weather_data.get("temperature", 20)
+        wardrobe_text, shortlist = wardrobe_selection_service.prepare(
+            "outfit-suggestions", available_items,
+            SelectionContext.for_event(occasion, weather=weather_data, preferences=user_preferences),
+            ["id", "name", "type", "color", "style", "season"], baseline=json.dumps(available_items[:20])
+        )
+        inputs = {
+            "occasion": occasion,
+            "weather": weather_desc,
+            "temperature": temp,
+            "preferences": user_preferences,
+            "items": shortlist
+        }
+        
+        suggestions = llm_cache_service.get_or_call(OUTFIT_SUGGESTIONS_SITE, inputs, lambda: ask_json(
+            OUTFIT_SUGGESTIONS_PROMPT.format(
+                occasion=occasion, weather=weather_desc, temperature=temp,
+                preferences=json.dumps(user_preferences), items=wardrobe_text
+            ), OutfitSuggestions, "["
+        ))
+        if suggestions is not None:
+            return suggestions
+        
+        return [{
+            "name": f"{occasion} Outfit",
+            "items": [item["id"] for item in shortlist[:3]],
+            "reasoning": f"A stylish outfit for {occasion}",
+            "weather_appropriate": True,
+            "style_score": 80
+        }]
+    
+    def generate_prompt_outfit(self, prompt: str, wardrobe_items: list) -> dict:
+        """Generate outfit from text/voice prompt"""
+        
+        items = [{
+            "id": item["id"],
+            "type": item["type"],
+            "color": item["color"],
+            "style": item["style"]
+        } for item in wardrobe_items]
+        
+        wardrobe_text, shortlist = wardrobe_selection_service.prepare(
+            "prompt-outfit", items, SelectionContext.for_request(prompt),
+            ["id", "type", "color", "style"], baseline=json.dumps(items[:30])
+        )
+        inputs = {"request": prompt, "items": shortlist}
+        outfit = llm_cache_service.get_or_call(PROMPT_OUTFIT_SITE, inputs, lambda: ask_json(
+            PROMPT_OUTFIT_PROMPT.format(request=prompt, items=wardrobe_text), PromptOutfit
+        ))
+        if outfit is not None:
+            return outfit
+        
+        return {
+            "outfit_description": "Custom outfit based on your request",
+            "matched_items": [item["id"] for item in shortlist[:3]],
+            "missing_items": [],
+            "style_notes": "Great choice!"
+        }
+    
+    def analyze_body_shape(self, measurements: dict) -> dict:
+        """Analyze body shape and provide recommendations"""
+        
+        analysis = llm_cache_service.get_or_call(BODY_SHAPE_SITE, measurements, lambda: ask_json(
+            BODY_SHAPE_PROMPT.format(measurements=json.dumps(measurements)), BodyShapeAnalysis
+        ))
+        if analysis is not None:
+            return analysis
+        
+        return {
+            "body_shape": "balanced",
+            "recommended_styles": ["fitted tops", "A-line dresses"],
+            "flattering_fits": ["tailored", "structured"],
+            "avoid_styles": [],
+            "confidence_score": 75
+        }
+    
+    def compare_outfits(self, outfit1_items: list, outfit2_items: list, occasion: str) -> dict:
+        """Compare two outfits"""
+        
+        inputs = {"occasion": occasion, "outfit1": outfit1_items, "outfit2": outfit2_items}
+        comparison = llm_cache_service.get_or_call(COMPARE_OUTFITS_SITE, inputs, lambda: ask_json(
+            COMPARE_OUTFITS_PROMPT.format(
+                occasion=occasion, outfit1=json.dumps(outfit1_items), outfit2=json.dumps(outfit2_items)
+            ), OutfitComparison
+        ))
+        if comparison is not None:
+            return comparison
+        
+        return {
+            "winner": "outfit1",
+            "outfit1_score": 85,
+            "outfit2_score": 78,
+            "comparison": "Both outfits work well",
+            "reasoning": "Outfit 1 has better color coordination"
+        }
+
+ai_service = AIService()
@@ -0,0 +1,210 @@
+import codecs
+import csv
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models.wardrobe import WardrobeItem, WardrobeItemOccasion, WardrobeRevision
+
+# Rows per INSERT transaction
+BATCH_SIZE = 500
+
+# CSV cells holding lists ("office|party" or "office;party")
+CSV_LIST_FIELDS = {"occasions"}
+
+
+class CsvRecordReader:
+    """Incremental CSV parser: feed text lines, get dict records back"""
+
+    def __init__(self):
+        self.header: Optional[List[str]] = None
+        self.pending = ""
+
+    def feed(self, line: str) -> Iterator[Dict]:
+        # A quoted cell may span lines; wait until the quotes balance
+        self.pending += line + "\n"
+        if self.pending.count('"') % 2:
+            return
+        record, self.pending = self.pending, ""
+
+        if not record.strip():
+            return
+        yield from self._emit(record)
+
+    def finish(self) -> Iterator[Dict]:
+        # Unbalanced quotes at end of input: parse whatever is left
+        record, self.pending = self.pending, ""
+        if record.strip():
+            yield from self._emit(record)
+
+    def _emit(self, record: str) -> Iterator[Dict]:
+        cells = next(csv.reader([record.rstrip("\r\n")]))
+
+        if self.header is None:
+            self.header = [cell.strip() for cell in cells]
+            return
+
+        row = {}
+        for key, value in zip(self.header, cells):
+            if key in CSV_LIST_FIELDS:
+                row[key] = [v for v in value.replace(";", "|").split("|") if v.strip()]
+            else:
+                row[key] = value
+        yield row
+
+
+class BulkImportService:
+    """Streams CSV/NDJSON wardrobe rows into the database in batched transactions"""
+
+    def __init__(self, session_factory=SessionLocal, user_id: int = 1):
+        self.session_factory = session_factory
+        self.user_id = user_id
+
+    async def iter_records(self, chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+        """Yield (row_number, record, error) without buffering the whole body"""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        csv_reader = CsvRecordReader() if fmt == "csv" else None
+        buffer = ""
+        row_number = 0
+
+        def parse_lines(lines: List[str]):
+            nonlocal row_number
+            for line in lines:
+                if csv_reader is not None:
+                    for record in csv_reader.feed(line):
+                        row_number += 1
+                        yield row_number, record, None
+                    continue
+
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield row_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield row_number, None, "Each line must be a JSON object"
+                    continue
+                yield row_number, record, None
+
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            if "\n" not in buffer:
+                continue
+            *lines, buffer = buffer.split("\n")
+            for result in parse_lines(lines):
+                yield result
+
+        buffer += decoder.decode(b"", final=True)
+        for result in parse_lines([buffer] if buffer else []):
+            yield result
+        if csv_reader is not None:
+            for record in csv_reader.finish():
+                row_number += 1
+                yield row_number, record, None
+
+    def insert_batch(self, rows: List[Tuple[Dict, List[str]]]) -> List[int]:
+        """Insert (values, occasions) rows with executemany in one transaction"""
+        db = self.session_factory()
+        try:
+            ids = db.execute(
+                insert(WardrobeItem).returning(WardrobeItem.id, sort_by_parameter_order=True),
+                [values for values, _ in rows]
+            ).scalars().all()
+
+            links = [
+                {"item_id": item_id, "occasion": occasion}
+                for item_id, (_, occasions) in zip(ids, rows)
+                for occasion in occasions
+            ]
+            if links:
+                db.execute(insert(WardrobeItemOccasion), links)
+
+            # Same transaction as the rows, so ETag holders see the change
+            bumped = db.execute(
+                update(WardrobeRevision)
+                .where(WardrobeRevision.user_id == self.user_id)
+                .values(revision=WardrobeRevision.revision + 1)
+            )
+            if bumped.rowcount == 0:
+                db.add(WardrobeRevision(user_id=self.user_id, revision=1))
+
+            db.commit()
+            return ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def import_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        fmt: str,
+        parse_row: Callable[[Dict], Tuple[Dict, List[str]]]
+    ) -> AsyncIterator[bytes]:
+        """
+        Validate and insert rows as they arrive, yielding one NDJSON result
+        line per row and a final summary line.
+        """
+        start = time.perf_counter()
+        batch: List[Tuple[int, Tuple[Dict, List[str]]]] = []
+        imported = failed = 0
+
+        def line(payload: Dict) -> bytes:
+            return (json.dumps(payload) + "\n").encode("utf-8")
+
+        async def flush():
+            nonlocal imported, failed
+            rows = [parsed for _, parsed in batch]
+            try:
+                ids = await run_in_threadpool(self.insert_batch, rows)
+                results = [{"row": n, "status": "ok", "item_id": i} for (n, _), i in zip(batch, ids)]
+                imported += len(ids)
+            except Exception as e:
+                print(f"❌ Import batch failed: {e}")
+                results = [{"row": n, "status": "error", "errors": [f"Batch insert failed: {e}"]} for n, _ in batch]
+                failed += len(batch)
+            batch.clear()
+            return b"".join(line(result) for result in results)
+
+        async for row_number, record, error in self.iter_records(chunks, fmt):
+            errors = [error] if error else []
+            if not errors:
+                try:
+                    batch.append((row_number, parse_row(record)))
+                except ValidationError as e:
+                    errors = [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+                except Exception as e:
+                    errors = [str(e)]
+
+            if errors:
+                failed += 1
+                yield line({"row": row_number, "status": "error", "errors": errors})
+
+            if len(batch) >= BATCH_SIZE:
+                yield await flush()
+
+        if batch:
+            yield await flush()
+
+        elapsed = time.perf_counter() - start
+        total = imported + failed
+        print(f"✅ Imported {imported}/{total} rows in {elapsed:.2f}s")
+        yield line({"summary": {
+            "rows": total,
+            "imported": imported,
+            "failed": failed,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(total / elapsed) if elapsed > 0 else total
+        }})
+
+
+bulk_import_service = BulkImportService()
@@ -0,0 +1,260 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# A call slower than this counts against the provider even when it succeeds
+PROVIDER_SLOW_CALL_SECONDS = {
+    "gemini": 15.0,
+    "groq": 20.0,
+    "stability": 60.0,
+    "serpapi": 8.0,
+    "huggingface": 20.0,
+    "openweather": 5.0,
+}
+
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+# Provider SDK errors worth retrying; not 504, which the SDK also raises when
+# our own deadline passes - that wait should not be repeated
+TRANSIENT_SDK_CODES = (429, 500, 502, 503)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open, next probe in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def transient(outcome: Any) -> bool:
+    """
+    Whether a failed response or exception is worth retrying. Read timeouts
+    are not: the full wait would be paid again, and a generation request the
+    provider did receive may be billed twice.
+    """
+    if isinstance(outcome, httpx.Response):
+        return outcome.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(outcome, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)):
+        return True
+    # google.api_core errors carry the HTTP status as `code`
+    return getattr(outcome, "code", None) in TRANSIENT_SDK_CODES
+
+
+def http_failed(response: httpx.Response) -> bool:
+    """Responses that count as a provider failure (client errors do not)"""
+    return response.status_code in TRANSIENT_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker. Closed: calls go through and their outcome lands in
+    a rolling window; too many failures or slow calls open it. Open: calls
+    fail fast with CircuitOpenError until `open_seconds` pass. Half-open: a
+    few probe calls decide whether it closes again or re-opens.
+
+    Transient failures are retried with jittered backoff, but retries may
+    only add `retry_ratio` extra load over the last RETRY_BUDGET_SECONDS.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_seconds: float,
+        window: int = settings.CIRCUIT_WINDOW,
+        min_calls: int = settings.CIRCUIT_MIN_CALLS,
+        failure_rate: float = settings.CIRCUIT_FAILURE_RATE,
+        slow_rate: float = settings.CIRCUIT_SLOW_RATE,
+        open_seconds: float = settings.CIRCUIT_OPEN_SECONDS,
+        half_open_probes: int = settings.CIRCUIT_HALF_OPEN_PROBES,
+        max_attempts: int = settings.RETRY_MAX_ATTEMPTS,
+        retry_ratio: float = settings.RETRY_BUDGET_RATIO,
+        retry_min: int = settings.RETRY_BUDGET_MIN,
+        retry_seconds: float = settings.RETRY_BUDGET_SECONDS,
+        base_delay: float = settings.RETRY_BASE_DELAY,
+        max_delay: float = settings.RETRY_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.max_attempts = max_attempts
+        self.retry_ratio = retry_ratio
+        self.retry_min = retry_min
+        self.retry_seconds = retry_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.outcomes = deque(maxlen=window)  # (failed, slow) per finished call
+        self.probes_in_flight = 0
+        self.probes_passed = 0
+        self.recent_calls = deque()  # timestamps, for the retry budget
+        self.recent_retries = deque()
+        self.totals = {"calls": 0, "failures": 0, "slow": 0, "short_circuited": 0, "retries": 0, "opened": 0}
+
+    # ========================================
+    # CALLS
+    # ========================================
+
+    def call(self, func: Callable, *args, failed: Optional[Callable[[Any], bool]] = None, **kwargs):
+        """
+        Run `func` through the breaker. `failed(result)` marks a returned
+        value as a failure (e.g. a 503 response); such a value is returned
+        as-is once retries are exhausted, exceptions are re-raised.
+        """
+        with self.lock:
+            self._trim(self.recent_calls).append(self.clock())
+
+        attempt = 1
+        while True:
+            probe = self._acquire()
+            start = self.clock()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._record(probe, True, self.clock() - start)
+                if not self._may_retry(e, attempt, probe):
+                    raise
+                outcome = e
+            else:
+                bad = failed is not None and failed(result)
+                self._record(probe, bad, self.clock() - start)
+                if not bad or not self._may_retry(result, attempt, probe):
+                    return result
+                outcome = result
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+            print(f"🔁 {self.name}: retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s ({type(outcome).__name__})")
+            self.sleep(delay)
+            attempt += 1
+
+    def _acquire(self) -> bool:
+        """Let a call through (True if it is a half-open probe) or fail fast"""
+        with self.lock:
+            if self.state == "open":
+                retry_in = self.opened_at + self.open_seconds - self.clock()
+                if retry_in > 0:
+                    self.totals["short_circuited"] += 1
+                    raise CircuitOpenError(self.name, retry_in)
+                self.state = "half_open"
+                self.probes_in_flight = 0
+                self.probes_passed = 0
+                print(f"🟡 {self.name}: circuit half-open, probing")
+
+            if self.state == "half_open":
+                if self.probes_in_flight + self.probes_passed >= self.half_open_probes:
+                    self.totals["short_circuited"] += 1
+                    raise CircuitOpenError(self.name, 0)
+                self.probes_in_flight += 1
+                return True
+            return False
+
+    def _record(self, probe: bool, failed: bool, elapsed: float):
+        slow = elapsed >= self.slow_call_seconds
+        with self.lock:
+            self.totals["calls"] += 1
+            self.totals["failures"] += failed
+            self.totals["slow"] += slow
+
+            if probe:
+                self.probes_in_flight -= 1
+                if failed or slow:
+                    self._open(f"probe {'failed' if failed else f'took {elapsed:.1f}s'}")
+                else:
+                    self.probes_passed += 1
+                    if self.probes_passed >= self.half_open_probes:
+                        self.state = "closed"
+                        self.outcomes.clear()
+                        print(f"🟢 {self.name}: circuit closed")
+                return
+
+            if self.state != "closed":
+                return  # a call that started before the circuit opened
+            self.outcomes.append((failed, slow))
+            if len(self.outcomes) < self.min_calls:
+                return
+            failures = sum(f for f, _ in self.outcomes) / len(self.outcomes)
+            slow_calls = sum(s for _, s in self.outcomes) / len(self.outcomes)
+            if failures >= self.failure_rate:
+                self._open(f"{failures:.0%} of the last {len(self.outcomes)} calls failed")
+            elif slow_calls >= self.slow_rate:
+                self._open(f"{slow_calls:.0%} of the last {len(self.outcomes)} calls slower than {self.slow_call_seconds:g}s")
+
+    def _open(self, reason: str):
+        self.state = "open"
+        self.opened_at = self.clock()
+        self.totals["opened"] += 1
+        print(f"🔴 {self.name}: circuit open for {self.open_seconds:g}s - {reason}")
+
+    # ========================================
+    # RETRY BUDGET
+    # ========================================
+
+    def _trim(self, timestamps: deque) -> deque:
+        cutoff = self.clock() - self.retry_seconds
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+        return timestamps
+
+    def _retry_allowance(self) -> int:
+        calls = len(self._trim(self.recent_calls))
+        return max(self.retry_min, int(calls * self.retry_ratio)) - len(self._trim(self.recent_retries))
+
+    def _may_retry(self, outcome: Any, attempt: int, probe: bool) -> bool:
+        if probe or attempt >= self.max_attempts or not transient(outcome):
+            return False
+        with self.lock:
+            if self.state != "closed" or self._retry_allowance() <= 0:
+                return False
+            self.recent_retries.append(self.clock())
+            self.totals["retries"] += 1
+            return True
+
+    # ========================================
+    # STATUS
+    # ========================================
+
+    def status(self) -> Dict:
+        with self.lock:
+            finished = len(self.outcomes)
+            status = {
+                "state": self.state,
+                "window_calls": finished,
+                "failure_rate": round(sum(f for f, _ in self.outcomes) / finished, 3) if finished else None,
+                "slow_rate": round(sum(s for _, s in self.outcomes) / finished, 3) if finished else None,
+                "slow_call_seconds": self.slow_call_seconds,
+                "retry_budget_left": max(0, self._retry_allowance()),
+                **self.totals
+            }
+            if self.state == "open":
+                status["next_probe_in"] = round(max(0.0, self.opened_at + self.open_seconds - self.clock()), 1)
+        return status
+
+
+breakers = {name: CircuitBreaker(name, seconds) for name, seconds in PROVIDER_SLOW_CALL_SECONDS.items()}
+
+
+def breaker_status() -> Dict:
+    providers = {name: breaker.status() for name, breaker in breakers.items()}
+    return {
+        "degraded": [name for name, status in providers.items() if status["state"] != "closed"],
+        "providers": providers
+    }
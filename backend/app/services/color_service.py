@@ -0,0 +1,312 @@
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Canonical palette: name -> (hex, family). Family roots ("red", "blue", ...)
+# are palette entries themselves so a bare family word always resolves.
+PALETTE: Dict[str, Tuple[str, str]] = {
+    # Neutrals
+    "black": ("#000000", "black"),
+    "charcoal": ("#36454f", "grey"),
+    "grey": ("#808080", "grey"),
+    "silver": ("#c0c0c0", "grey"),
+    "white": ("#ffffff", "white"),
+    "off white": ("#faf9f6", "white"),
+    "ivory": ("#fffff0", "white"),
+    "cream": ("#fffdd0", "white"),
+    "beige": ("#f5f5dc", "beige"),
+    "nude": ("#e3bc9a", "beige"),
+    "khaki": ("#c3b091", "beige"),
+    "tan": ("#d2b48c", "brown"),
+    "camel": ("#c19a6b", "brown"),
+    "brown": ("#8b4513", "brown"),
+    "chocolate": ("#7b3f00", "brown"),
+    "coffee": ("#6f4e37", "brown"),
+    # Reds
+    "red": ("#d0021b", "red"),
+    "crimson": ("#dc143c", "red"),
+    "scarlet": ("#ff2400", "red"),
+    "cherry": ("#990f02", "red"),
+    "maroon": ("#800000", "red"),
+    "burgundy": ("#800020", "red"),
+    "wine": ("#722f37", "red"),
+    "rust": ("#b7410e", "orange"),
+    # Pinks
+    "pink": ("#ffc0cb", "pink"),
+    "blush pink": ("#de5d83", "pink"),
+    "baby pink": ("#f4c2c2", "pink"),
+    "hot pink": ("#ff69b4", "pink"),
+    "fuchsia": ("#ff00ff", "pink"),
+    "magenta": ("#ca1f7b", "pink"),
+    "rose": ("#ff007f", "pink"),
+    "peach": ("#ffcba4", "orange"),
+    "coral": ("#ff7f50", "orange"),
+    # Oranges and yellows
+    "orange": ("#ff8c00", "orange"),
+    "saffron": ("#f4c430", "yellow"),
+    "yellow": ("#ffd700", "yellow"),
+    "lemon yellow": ("#fff44f", "yellow"),
+    "mustard yellow": ("#e1ad01", "yellow"),
+    "gold": ("#d4af37", "yellow"),
+    # Greens
+    "green": ("#228b22", "green"),
+    "lime green": ("#32cd32", "green"),
+    "mint green": ("#98ff98", "green"),
+    "sage green": ("#9caf88", "green"),
+    "olive": ("#808000", "green"),
+    "emerald green": ("#50c878", "green"),
+    "bottle green": ("#006a4e", "green"),
+    "teal": ("#008080", "green"),
+    # Blues
+    "blue": ("#1f4fd1", "blue"),
+    "sky blue": ("#87ceeb", "blue"),
+    "baby blue": ("#89cff0", "blue"),
+    "powder blue": ("#b0e0e6", "blue"),
+    "turquoise": ("#40e0d0", "blue"),
+    "aqua": ("#00ffff", "blue"),
+    "denim blue": ("#1560bd", "blue"),
+    "royal blue": ("#4169e1", "blue"),
+    "cobalt blue": ("#0047ab", "blue"),
+    "navy blue": ("#000080", "blue"),
+    # Purples
+    "purple": ("#800080", "purple"),
+    "lavender": ("#e6e6fa", "purple"),
+    "lilac": ("#c8a2c8", "purple"),
+    "mauve": ("#e0b0ff", "purple"),
+    "violet": ("#8f00ff", "purple"),
+    "plum": ("#8e4585", "purple"),
+}
+
+# Spellings and short forms -> palette name
+ALIASES = {
+    "gray": "grey",
+    "charcoal grey": "charcoal",
+    "charcoal gray": "charcoal",
+    "navy": "navy blue",
+    "offwhite": "off white",
+    "mustard": "mustard yellow",
+    "emerald": "emerald green",
+    "mint": "mint green",
+    "sage": "sage green",
+    "lime": "lime green",
+    "olive green": "olive",
+    "bottle": "bottle green",
+    "blush": "blush pink",
+    "denim": "denim blue",
+    "cobalt": "cobalt blue",
+    "royal": "royal blue",
+    "wine red": "wine",
+    "maroon red": "maroon",
+    "golden": "gold",
+    "violet purple": "violet",
+    "multicolor": None,
+    "multicolour": None,
+    "multi": None,
+}
+
+# Modifiers shift lightness but keep the canonical name
+MODIFIERS = {
+    "light": 12.0,
+    "pale": 15.0,
+    "pastel": 15.0,
+    "soft": 6.0,
+    "bright": 4.0,
+    "dark": -14.0,
+    "deep": -10.0,
+    "dusty": -4.0,
+    "muted": -4.0,
+}
+
+# Lightness band a modified query ("light blue") matches items within
+MODIFIER_TOLERANCE = 5.0
+
+WORD_RE = re.compile(r"[a-z]+")
+
+
+class ColorMatch:
+    """A free-text color resolved against the palette"""
+
+    def __init__(self, name: str, family: str, lab: Tuple[float, float, float], shift: float = 0.0):
+        self.name = name
+        self.family = family
+        self.lab = lab
+        self.shift = shift  # lightness added by modifiers ("light", "dark", ...)
+
+    @property
+    def is_family(self) -> bool:
+        """A bare family word ("blue", not "navy blue" or "light blue") - it covers every shade in the family"""
+        return self.name == self.family and not self.shift
+
+    def __repr__(self):
+        return f"<ColorMatch(name='{self.name}', family='{self.family}')>"
+
+
+def hex_to_lab(hex_color: str) -> Tuple[float, float, float]:
+    """sRGB hex -> CIELAB (D65)"""
+    hex_color = hex_color.lstrip("#")
+    return rgb_to_lab(*(int(hex_color[i:i + 2], 16) for i in (0, 2, 4)))
+
+
+def rgb_to_lab(red: int, green: int, blue: int) -> Tuple[float, float, float]:
+    """8-bit sRGB -> CIELAB (D65)"""
+    rgb = [c / 255.0 for c in (red, green, blue)]
+    r, g, b = [c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in rgb]
+
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / 1.00000
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def delta_e(lab1: Tuple[float, float, float], lab2: Tuple[float, float, float]) -> float:
+    """CIEDE2000 color difference"""
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+
+    C1 = math.hypot(a1, b1)
+    C2 = math.hypot(a2, b2)
+    C_bar7 = ((C1 + C2) / 2) ** 7
+    G = 0.5 * (1 - math.sqrt(C_bar7 / (C_bar7 + 25 ** 7)))
+
+    a1p, a2p = (1 + G) * a1, (1 + G) * a2
+    C1p, C2p = math.hypot(a1p, b1), math.hypot(a2p, b2)
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    if C1p * C2p == 0:
+        dhp = 0.0
+    elif abs(h2p - h1p) <= 180:
+        dhp = h2p - h1p
+    elif h2p - h1p > 180:
+        dhp = h2p - h1p - 360
+    else:
+        dhp = h2p - h1p + 360
+    dHp = 2 * math.sqrt(C1p * C2p) * math.sin(math.radians(dhp / 2))
+
+    Lp_bar = (L1 + L2) / 2
+    Cp_bar = (C1p + C2p) / 2
+    if C1p * C2p == 0:
+        hp_bar = h1p + h2p
+    elif abs(h1p - h2p) <= 180:
+        hp_bar = (h1p + h2p) / 2
+    elif h1p + h2p < 360:
+        hp_bar = (h1p + h2p + 360) / 2
+    else:
+        hp_bar = (h1p + h2p - 360) / 2
+
+    T = (1 - 0.17 * math.cos(math.radians(hp_bar - 30))
+         + 0.24 * math.cos(math.radians(2 * hp_bar))
+         + 0.32 * math.cos(math.radians(3 * hp_bar + 6))
+         - 0.20 * math.cos(math.radians(4 * hp_bar - 63)))
+    d_theta = 30 * math.exp(-(((hp_bar - 275) / 25) ** 2))
+    Cp_bar7 = Cp_bar ** 7
+    R_C = 2 * math.sqrt(Cp_bar7 / (Cp_bar7 + 25 ** 7))
+    S_L = 1 + (0.015 * (Lp_bar - 50) ** 2) / math.sqrt(20 + (Lp_bar - 50) ** 2)
+    S_C = 1 + 0.045 * Cp_bar
+    S_H = 1 + 0.015 * Cp_bar * T
+    R_T = -math.sin(math.radians(2 * d_theta)) * R_C
+
+    return math.sqrt(
+        (dLp / S_L) ** 2 + (dCp / S_C) ** 2 + (dHp / S_H) ** 2
+        + R_T * (dCp / S_C) * (dHp / S_H)
+    )
+
+
+class ColorService:
+    """Maps free-text colors onto a canonical palette with CIELAB coordinates"""
+
+    def __init__(self):
+        self.lab = {name: hex_to_lab(hex_color) for name, (hex_color, _) in PALETTE.items()}
+        self.families = {name: family for name, (_, family) in PALETTE.items()}
+
+        # Precomputed palette distance index: name -> [(delta_e, other), ...] ascending
+        self.neighbours: Dict[str, List[Tuple[float, str]]] = {
+            name: sorted(
+                (delta_e(lab, other_lab), other)
+                for other, other_lab in self.lab.items()
+            )
+            for name, lab in self.lab.items()
+        }
+
+        # Multi-word names first so "navy blue" wins over "blue"
+        self._phrases = sorted(
+            list(PALETTE) + [alias for alias, target in ALIASES.items() if target],
+            key=lambda phrase: -len(phrase.split())
+        )
+
+    def _canonical(self, phrase: str) -> Optional[str]:
+        if phrase in PALETTE:
+            return phrase
+        return ALIASES.get(phrase)
+
+    @lru_cache(maxsize=4096)
+    def normalize(self, text: str) -> Optional[ColorMatch]:
+        """Resolve a free-text color ("Dark Emerald-Green") to a palette entry"""
+        words = WORD_RE.findall((text or "").lower())
+        if not words:
+            return None
+
+        shift = sum(MODIFIERS.get(word, 0.0) for word in words)
+        words = [word for word in words if word not in MODIFIERS]
+        joined = " ".join(words)
+
+        name = self._canonical(joined)
+        if not name:
+            # Longest palette phrase appearing as whole words
+            padded = f" {joined} "
+            name = next(
+                (self._canonical(phrase) for phrase in self._phrases if f" {phrase} " in padded),
+                None
+            )
+        if not name:
+            return None
+
+        L, a, b = self.lab[name]
+        return ColorMatch(name, self.families[name], (max(0.0, min(100.0, L + shift)), a, b), shift)
+
+    def find_in_text(self, text: str) -> List[str]:
+        """Canonical names of every palette color mentioned in a longer text"""
+        padded = " " + " ".join(WORD_RE.findall((text or "").lower())) + " "
+        found = []
+        for phrase in self._phrases:
+            if f" {phrase} " in padded:
+                name = self._canonical(phrase)
+                if name and name not in found:
+                    found.append(name)
+                padded = padded.replace(f" {phrase} ", " | ")
+        return found
+
+    def similar_names(self, name: str, max_delta_e: float) -> List[str]:
+        """Palette names within max_delta_e of a palette name (itself included)"""
+        return [other for distance, other in self.neighbours.get(name, []) if distance <= max_delta_e]
+
+    def distance(self, first: str, second: str) -> Optional[float]:
+        """Delta E between two free-text colors, None if either is unknown"""
+        a, b = self.normalize(first), self.normalize(second)
+        if not a or not b:
+            return None
+        return delta_e(a.lab, b.lab)
+
+    def matches(self, first: str, second: str, max_delta_e: float = 10.0) -> bool:
+        """
+        True when two free-text colors are perceptually the same shade. A bare
+        family word on either side ("blue") matches every shade of its family.
+        """
+        a, b = self.normalize(first), self.normalize(second)
+        if not a or not b:
+            # Unknown names: fall back to the old substring rule
+            return bool(first and second) and first.lower() in second.lower()
+        if a.is_family or b.is_family:
+            return a.family == b.family
+        return delta_e(a.lab, b.lab) <= max_delta_e
+
+
+color_service = ColorService()
@@ -1,229 +1,333 @@
-#gemini-2.0-flash
-import base64
-import json
-import time
-from io import BytesIO
-from PIL import Image
-import google.generativeai as genai
-from app.config import get_settings
-
-settings = get_settings()
-
-
-class GroqService:
-    def __init__(self):
-        # Configure Google Gemini
-        api_key = settings.GEMINI_API_KEY
-        if not api_key or api_key == "YOUR_GEMINI_API_KEY_HERE":
-            print("\n" + "=" * 80)
-            print("⚠️  GEMINI_API_KEY NOT CONFIGURED!")
-            print("=" * 80)
-            print("Get free key: https://makersuite.google.com/app/apikey")
-            print("Add to backend/.env: GEMINI_API_KEY=your_key")
-            print("=" * 80 + "\n")
-            self.vision_model = None
-        else:
-            try:
-                genai.configure(api_key=api_key)
-                self.vision_model = genai.GenerativeModel("gemini-2.0-flash")
-                print(f"✅ Google Gemini Vision initialized")
-            except Exception as e:
-                print(f"❌ Gemini init failed: {e}")
-                self.vision_model = None
-
-        print(f"📸 Using: Google gemini-2.0-flash (Vision)")
-
-    def detect_clothing_from_image(self, image_base64: str) -> dict:
-        """Detect clothing using Google Gemini Vision"""
-
-        if not self.vision_model:
-            print("❌ Gemini not initialized")
-            return self._fallback()
-
-        prompt = """You are an expert fashion analyst. Analyze this clothing image in detail.
-
-Identify and return ONLY a valid JSON object with these exact fields:
-
-{
-    "item_name": "Descriptive name (e.g., 'Burgundy Silk Anarkali Dress', 'Navy Cotton Shirt')",
-    "category": "Main category - choose from: Tops, Bottoms, Dresses, Indian Traditional, Outerwear, Footwear, Accessories",
-    "sub_category": "Specific type (e.g., shirt, kurta, kurti, anarkali, jeans, maxi dress, saree, lehenga)",
-    "fabric": "Fabric material (e.g., cotton, silk, polyester, chiffon, georgette, denim)",
-    "color": "Specific color shade (e.g., burgundy, navy blue, emerald green, mustard yellow)",
-    "pattern": "Pattern type (e.g., solid, striped, floral, checkered, embroidered)",
-    "style": "Fashion style (e.g., casual, formal, traditional, ethnic, festive, party)",
-    "season": "Best season (e.g., spring, summer, fall, winter, all-season)",
-    "gender": "Target gender - 'male' for men's wear (shirts, pants, jeans, suits, kurtas, sherwanis), 'female' for dresses, kurtis, sarees, lehengas, blouses, skirts, etc.",
-    "occasions": ["List 2-3 occasions"]
-}
-
-Return ONLY the JSON object."""
-
-        try:
-            print(f"\n{'=' * 80}")
-            print(f"🤖 Analyzing with Google Gemini Vision")
-            print(f"{'=' * 80}")
-
-            start = time.time()
-
-            # Decode base64 to image
-            image_data = base64.b64decode(image_base64)
-            image = Image.open(BytesIO(image_data))
-
-            # Generate response
-            response = self.vision_model.generate_content([prompt, image])
-
-            elapsed = time.time() - start
-            result = response.text.strip()
-
-            print(f"⏱️  Response time: {elapsed:.2f}s")
-            print(f"📥 Raw response: {result[:300]}...")
-
-            # Extract JSON
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                json_str = result[json_start:json_end]
-                detected = json.loads(json_str)
-
-                required = [
-                    "item_name",
-                    "category",
-                    "sub_category",
-                    "fabric",
-                    "color",
-                    "pattern",
-                    "style",
-                    "season",
-                    "gender",
-                ]
-
-                if all(field in detected for field in required):
-                    print(f"✅ DETECTION SUCCESS!")
-                    print(f"   📝 {detected['item_name']}")
-                    print(f"   👤 Gender: {detected['gender']}")
-                    print(f"   📂 {detected['category']} > {detected['sub_category']}")
-                    print(f"   🎨 {detected['color']}")
-                    print(f"{'=' * 80}\n")
-                    return detected
-                else:
-                    missing = [f for f in required if f not in detected]
-                    print(f"⚠️  Missing fields: {missing}")
-
-                    if "gender" not in detected:
-                        detected["gender"] = "female"
-
-                    return detected if len(missing) <= 1 else self._fallback()
-
-            else:
-                print("⚠️  No JSON in response")
-                return self._fallback()
-
-        except Exception as e:
-            print(f"❌ ERROR: {e}")
-            import traceback
-
-            traceback.print_exc()
-            return self._fallback()
-
-    def _fallback(self) -> dict:
-        """Fallback when API fails"""
-        print("⚠️  Using fallback detection")
-        return {
-            "item_name": "Clothing Item - Please Edit",
-            "category": "Tops",
-            "sub_category": "Please specify type",
-            "fabric": "Please specify fabric",
-            "color": "Please specify color",
-            "pattern": "solid",
-            "style": "casual",
-            "season": "all-season",
-            "gender": "female",
-            "occasions": ["casual", "everyday"],
-        }
-
-    def analyze_barcode_receipt(self, text: str) -> dict:
-        """Analyze barcode/receipt text"""
-        if not self.vision_model:
-            return self._fallback()
-
-        prompt = f"""Extract clothing information from this text: {text}
-
-Return ONLY JSON:
-{{
-    "item_name": "full item name",
-    "category": "category",
-    "sub_category": "type",
-    "fabric": "fabric",
-    "color": "color",
-    "pattern": "pattern",
-    "style": "style",
-    "season": "season",
-    "brand": "brand if found"
-}}"""
-
-        try:
-            response = self.vision_model.generate_content(prompt)
-            result = response.text.strip()
-
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                return json.loads(result[json_start:json_end])
-
-            return self._fallback()
-        except Exception as e:
-            print(f"❌ Barcode error: {e}")
-            return self._fallback()
-
-    def generate_usage_notification(
-        self, item_name: str, days_unworn: int, usage_count: int
-    ) -> str:
-        """Generate usage notification"""
-        if not self.vision_model:
-            return f"You haven't worn '{item_name}' in {days_unworn} days."
-
-        try:
-            prompt = f"Generate a friendly 1-sentence notification: Item '{item_name}' has been unworn for {days_unworn} days (worn {usage_count} times total). Encourage wearing it or donating."
-
-            response = self.vision_model.generate_content(prompt)
-            return response.text.strip()
-        except:
-            return f"You haven't worn '{item_name}' in {days_unworn} days."
-
-    def suggest_outfit_match(self, item_data: dict, wardrobe_items: list) -> dict:
-        """Suggest outfit combinations"""
-        if not self.vision_model:
-            return {"suggestions": []}
-
-        try:
-            prompt = f"""Given this clothing item: {json.dumps(item_data)}
-
-And these available wardrobe items: {json.dumps(wardrobe_items[:10])}
-
-Suggest 3 outfit combinations. Return ONLY JSON:
-{{
-    "suggestions": [
-        {{
-            "name": "outfit name",
-            "items": ["item_id1", "item_id2"],
-            "occasion": "suitable occasion",
-            "reasoning": "why this combination works"
-        }}
-    ]
-}}"""
-
-            response = self.vision_model.generate_content(prompt)
-            result = response.text.strip()
-
-            if "{" in result and "}" in result:
-                json_start = result.index("{")
-                json_end = result.rindex("}") + 1
-                return json.loads(result[json_start:json_end])
-
-            return {"suggestions": []}
-        except:
-            return {"suggestions": []}
-
-
-groq_service = GroqService()
+#gemini-2.0-flash
+import base64
+import hashlib
+import json
+import time
+from typing import Any, List, Optional, Tuple, Union
+import google.generativeai as genai
+from pydantic import BaseModel, ConfigDict, field_validator
+from app.config import get_settings
+from app.services.circuit_breaker import CircuitOpenError, breakers
+from app.services.json_extractor import JSONStreamExtractor
+from app.services.wardrobe_selection_service import SelectionContext, wardrobe_selection_service
+from app.services.image_service import UPLOAD_PROFILES, image_service, sniff_mime_type
+
+settings = get_settings()
+
+VISION_MODEL = "gemini-2.0-flash"
+
+CLOTHING_PROMPT = """You are an expert fashion analyst. Analyze this clothing image in detail.
+
+Identify and return ONLY a valid JSON object with these exact fields:
+
+{
+    "item_name": "Descriptive name (e.g., 'Burgundy Silk Anarkali Dress', 'Navy Cotton Shirt')",
+    "category": "Main category - choose from: Tops, Bottoms, Dresses, Indian Traditional, Outerwear, Footwear, Accessories",
+    "sub_category": "Specific type (e.g., shirt, kurta, kurti, anarkali, jeans, maxi dress, saree, lehenga)",
+    "fabric": "Fabric material (e.g., cotton, silk, polyester, chiffon, georgette, denim)",
+    "color": "Specific color shade (e.g., burgundy, navy blue, emerald green, mustard yellow)",
+    "pattern": "Pattern type (e.g., solid, striped, floral, checkered, embroidered)",
+    "style": "Fashion style (e.g., casual, formal, traditional, ethnic, festive, party)",
+    "season": "Best season (e.g., spring, summer, fall, winter, all-season)",
+    "gender": "Target gender - 'male' for men's wear (shirts, pants, jeans, suits, kurtas, sherwanis), 'female' for dresses, kurtis, sarees, lehengas, blouses, skirts, etc.",
+    "occasions": ["List 2-3 occasions"]
+}
+
+Return ONLY the JSON object."""
+
+UPLOAD_PROFILE = UPLOAD_PROFILES["gemini"]
+
+gemini_breaker = breakers["gemini"]
+
+
+# ========================================
+# RESPONSE SCHEMAS
+# ========================================
+
+class ClothingDetection(BaseModel):
+    """What CLOTHING_PROMPT asks for; the descriptive fields may be left out"""
+    model_config = ConfigDict(extra="allow")
+
+    item_name: str
+    category: str
+    sub_category: str
+    color: str
+    fabric: str = ""
+    pattern: str = "solid"
+    style: str = "casual"
+    season: str = "all-season"
+    gender: str = "female"
+    occasions: List[str] = []
+
+    @field_validator("occasions", mode="before")
+    @classmethod
+    def split_occasions(cls, value):
+        return [part.strip() for part in value.split(",") if part.strip()] if isinstance(value, str) else value
+
+
+class ReceiptItem(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    item_name: str
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    fabric: Optional[str] = None
+    color: Optional[str] = None
+    pattern: Optional[str] = None
+    style: Optional[str] = None
+    season: Optional[str] = None
+    brand: Optional[str] = None
+
+
+class OutfitMatch(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    items: List[Union[str, int]] = []
+    occasion: str = ""
+    reasoning: str = ""
+
+
+class OutfitMatchSuggestions(BaseModel):
+    suggestions: List[OutfitMatch]
+
+# Cached detections are only reused for the same model, input size and prompt text
+CLOTHING_PROMPT_VERSION = hashlib.sha1(
+    f"{VISION_MODEL}\n{UPLOAD_PROFILE.version}\n{CLOTHING_PROMPT}".encode()
+).hexdigest()[:12]
+
+# Candidates per slot offered to go with one item (its own slot is left out)
+MATCH_SLOT_LIMITS = {"top": 3, "bottom": 3, "one-piece": 2, "shoes": 2, "outerwear": 2, "accessory": 2, "other": 0}
+
+
+class GroqService:
+    def __init__(self):
+        # Configure Google Gemini
+        api_key = settings.GEMINI_API_KEY
+        if not api_key or api_key == "YOUR_GEMINI_API_KEY_HERE":
+            print("\n" + "=" * 80)
+            print("⚠️  GEMINI_API_KEY NOT CONFIGURED!")
+            print("=" * 80)
+            print("Get free key: https://makersuite.google.com/app/apikey")
+            print("Add to backend/.env: GEMINI_API_KEY=your_key")
+            print("=" * 80 + "\n")
+            self.vision_model = None
+        else:
+            try:
+                genai.configure(api_key=api_key)
+                self.vision_model = genai.GenerativeModel(VISION_MODEL)
+                print(f"✅ Google Gemini Vision initialized")
+            except Exception as e:
+                print(f"❌ Gemini init failed: {e}")
+                self.vision_model = None
+
+        print(f"📸 Using: Google {VISION_MODEL} (Vision)")
+
+    def _generate(self, contents):
+        """generate_content behind the Gemini circuit breaker, with a bounded wait"""
+        return gemini_breaker.call(
+            self.vision_model.generate_content, contents,
+            request_options={"timeout": settings.GEMINI_TIMEOUT}
+        )
+
+    def _stream_json(self, contents, schema: Any, expect: str) -> Tuple[Optional[Any], str]:
+        """
+        Stream the answer until it holds a JSON value valid for `schema`; the
+        rest of the stream is not waited for. Returns (value or None, text read).
+        """
+        extractor = JSONStreamExtractor(schema, expect)
+        text = []
+        stream = self.vision_model.generate_content(
+            contents, stream=True, request_options={"timeout": settings.GEMINI_TIMEOUT}
+        )
+        for chunk in stream:
+            try:
+                part = chunk.text
+            except ValueError:
+                continue  # a chunk without text, e.g. only safety ratings
+            text.append(part)
+            extractor.feed(part)
+            if extractor.done:
+                break
+        return extractor.finish(), "".join(text)
+
+    def generate_json(self, contents, schema: Any = None, expect: str = "{") -> Optional[Any]:
+        """Model answer as validated JSON (object, or array with expect="["); None if unavailable or invalid"""
+        if not self.vision_model:
+            return None
+
+        try:
+            value, text = gemini_breaker.call(self._stream_json, contents, schema, expect)
+        except CircuitOpenError as e:
+            print(f"⚡ {e}")
+            return None
+        except Exception as e:
+            print(f"❌ JSON generation error: {e}")
+            return None
+
+        if value is None:
+            print(f"⚠️  No valid JSON in response: {text[:200]}")
+        return value
+
+    def detect_clothing_from_image(self, image: Union[bytes, bytearray, memoryview, str]) -> dict:
+        """
+        Detect clothing using Google Gemini Vision. `image` is the encoded
+        file and is sent as-is; a str is accepted as base64 for old callers.
+        """
+
+        if not self.vision_model:
+            print("❌ Gemini not initialized")
+            return self._fallback()
+
+        prompt = CLOTHING_PROMPT
+
+        try:
+            print(f"\n{'=' * 80}")
+            print(f"🤖 Analyzing with Google Gemini Vision")
+            print(f"{'=' * 80}")
+
+            start = time.time()
+
+            image = base64.b64decode(image) if isinstance(image, str) else bytes(image)
+
+            # Only as many pixels as the model looks at; inline blob of encoded
+            # bytes - a PIL image here would be re-encoded by the SDK as lossless WebP
+            prepared = image_service.prepare_upload(image, UPLOAD_PROFILE)
+            if prepared:
+                blob = {"mime_type": prepared.mime_type, "data": prepared.data}
+            else:
+                blob = {"mime_type": sniff_mime_type(image), "data": image}
+
+            # Stream the response; reading stops once the JSON object closes
+            detected, result = gemini_breaker.call(self._stream_json, [prompt, blob], ClothingDetection, "{")
+
+            elapsed = time.time() - start
+
+            print(f"⏱️  Response time: {elapsed:.2f}s")
+            print(f"📥 Raw response: {result[:300]}...")
+
+            if detected is None:
+                print("⚠️  No valid JSON in response")
+                return self._fallback()
+
+            print(f"✅ DETECTION SUCCESS!")
+            print(f"   📝 {detected['item_name']}")
+            print(f"   👤 Gender: {detected['gender']}")
+            print(f"   📂 {detected['category']} > {detected['sub_category']}")
+            print(f"   🎨 {detected['color']}")
+            print(f"{'=' * 80}\n")
+            return detected
+
+        except CircuitOpenError as e:
+            print(f"⚡ {e}")
+            return self._fallback()
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            import traceback
+
+            traceback.print_exc()
+            return self._fallback()
+
+    def _fallback(self) -> dict:
+        """Fallback when API fails"""
+        print("⚠️  Using fallback detection")
+        return {
+            "item_name": "Clothing Item - Please Edit",
+            "category": "Tops",
+            "sub_category": "Please specify type",
+            "fabric": "Please specify fabric",
+            "color": "Please specify color",
+            "pattern": "solid",
+            "style": "casual",
+            "season": "all-season",
+            "gender": "female",
+            "occasions": ["casual", "everyday"],
+            "is_fallback": True,  # placeholder values - never cached
+        }
+
+    def generate_text(self, prompt: str) -> str:
+        """Plain text completion; an empty string when Gemini is unavailable"""
+        if not self.vision_model:
+            return ""
+
+        try:
+            return self._generate(prompt).text.strip()
+        except CircuitOpenError as e:
+            print(f"⚡ {e}")
+            return ""
+        except Exception as e:
+            print(f"❌ Text generation error: {e}")
+            return ""
+
+    def analyze_barcode_receipt(self, text: str) -> dict:
+        """Analyze barcode/receipt text"""
+        if not self.vision_model:
+            return self._fallback()
+
+        prompt = f"""Extract clothing information from this text: {text}
+
+Return ONLY JSON:
+{{
+    "item_name": "full item name",
+    "category": "category",
+    "sub_category": "type",
+    "fabric": "fabric",
+    "color": "color",
+    "pattern": "pattern",
+    "style": "style",
+    "season": "season",
+    "brand": "brand if found"
+}}"""
+
+        item = self.generate_json(prompt, ReceiptItem)
+        return item if item is not None else self._fallback()
+
+    def generate_usage_notification(
+        self, item_name: str, days_unworn: int, usage_count: int
+    ) -> str:
+        """Generate usage notification"""
+        if not self.vision_model:
+            return f"You haven't worn '{item_name}' in {days_unworn} days."
+
+        try:
+            prompt = f"Generate a friendly 1-sentence notification: Item '{item_name}' has been unworn for {days_unworn} days (worn {usage_count} times total). Encourage wearing it or donating."
+
+            response = self._generate(prompt)
+            return response.text.strip()
+        except:
+            return f"You haven't worn '{item_name}' in {days_unworn} days."
+
+    def suggest_outfit_match(self, item_data: dict, wardrobe_items: list) -> dict:
+        """Suggest outfit combinations"""
+        if not self.vision_model:
+            return {"suggestions": []}
+
+        others = [item for item in wardrobe_items if item.get("id") is None or item.get("id") != item_data.get("id")]
+        wardrobe_text, _ = wardrobe_selection_service.prepare(
+            "outfit-match", others, SelectionContext.for_item(item_data),
+            ["id", "name", "type", "color", "style", "season"], baseline=json.dumps(wardrobe_items[:10]),
+            limits=MATCH_SLOT_LIMITS
+        )
+
+        prompt = f"""Given this clothing item: {json.dumps(item_data)}
+
+And these wardrobe items that could go with it (fields as in each [slot] header):
+{wardrobe_text}
+
+Suggest 3 outfit combinations. Return ONLY JSON:
+{{
+    "suggestions": [
+        {{
+            "name": "outfit name",
+            "items": ["item_id1", "item_id2"],
+            "occasion": "suitable occasion",
+            "reasoning": "why this combination works"
+        }}
+    ]
+}}"""
+
+        matches = self.generate_json(prompt, OutfitMatchSuggestions)
+        return matches if matches is not None else {"suggestions": []}
+
+
+groq_service = GroqService()
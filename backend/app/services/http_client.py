@@ -0,0 +1,238 @@
+import asyncio
+import importlib.util
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional, Union
+
+import httpx
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# HTTP/2 needs the optional `h2` package; without it everything stays on HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Latency percentiles are computed over this many recent requests per host
+LATENCY_WINDOW = 512
+
+Timeout = Union[None, float, httpx.Timeout]
+
+
+class HostStats:
+    """Counters for one upstream host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.in_flight = 0
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict:
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        finished = self.new_connections + self.reused_connections
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / finished, 3) if finished else None,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1], 1) if latencies else None
+            }
+        }
+
+
+class HttpClient:
+    """
+    One pooled, keep-alive HTTP client for every external service (weather,
+    shopping search, Hugging Face, Stability, GROQ). Sync callers share an
+    httpx.Client, async callers an httpx.AsyncClient; both cap concurrent
+    requests per host and record connection reuse and latency per host.
+    """
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        self.per_host = settings.HTTP_MAX_PER_HOST
+        self.stats: Dict[str, HostStats] = {}
+        self.lock = threading.Lock()
+
+        self._client: Optional[httpx.Client] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        # AsyncClient and its semaphores belong to the loop that created them
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _client_options(self) -> Dict:
+        return {
+            "limits": self.limits,
+            "timeout": self.timeout(settings.HTTP_TIMEOUT),
+            "http2": HTTP2_AVAILABLE,
+            "follow_redirects": True
+        }
+
+    @staticmethod
+    def timeout(value: Timeout) -> httpx.Timeout:
+        """A bare number bounds reads/writes; connecting always fails fast"""
+        if isinstance(value, httpx.Timeout):
+            return value
+        value = settings.HTTP_TIMEOUT if value is None else value
+        return httpx.Timeout(value, connect=min(value, settings.HTTP_CONNECT_TIMEOUT))
+
+    # ========================================
+    # SYNC
+    # ========================================
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self.lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_options())
+        return self._client
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        with self.lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with slot:
+            yield
+
+    def request(self, method: str, url: str, timeout: Timeout = None, **kwargs) -> httpx.Response:
+        host = httpx.URL(url).host
+        opened = []
+
+        def trace(event: str, info: Dict):
+            if event == "connection.connect_tcp.started":
+                opened.append(True)
+
+        with self._host_slot(host):
+            start = self._started(host)
+            try:
+                response = self.client.request(method, url, timeout=self.timeout(timeout),
+                                                extensions={"trace": trace}, **kwargs)
+            except Exception:
+                self._finished(host, start, None, failed=True)
+                raise
+        self._finished(host, start, bool(opened), failed=response.status_code >= 500)
+        return response
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    # ========================================
+    # ASYNC
+    # ========================================
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_client = httpx.AsyncClient(**self._client_options())
+            self._async_host_slots = {}
+        return self._async_client
+
+    @asynccontextmanager
+    async def _async_host_slot(self, host: str):
+        slot = self._async_host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with slot:
+            yield
+
+    async def arequest(self, method: str, url: str, timeout: Timeout = None, **kwargs) -> httpx.Response:
+        client = self.async_client
+        host = httpx.URL(url).host
+        opened = []
+
+        async def trace(event: str, info: Dict):
+            if event == "connection.connect_tcp.started":
+                opened.append(True)
+
+        async with self._async_host_slot(host):
+            start = self._started(host)
+            try:
+                response = await client.request(method, url, timeout=self.timeout(timeout),
+                                                extensions={"trace": trace}, **kwargs)
+            except Exception:
+                self._finished(host, start, None, failed=True)
+                raise
+        self._finished(host, start, bool(opened), failed=response.status_code >= 500)
+        return response
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("POST", url, **kwargs)
+
+    # ========================================
+    # METRICS / LIFECYCLE
+    # ========================================
+
+    def _started(self, host: str) -> float:
+        with self.lock:
+            stats = self.stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.in_flight += 1
+        return time.perf_counter()
+
+    def _finished(self, host: str, start: float, new_connection: Optional[bool], failed: bool):
+        """`new_connection` is None when the request never got a usable connection"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            stats = self.stats[host]
+            stats.in_flight -= 1
+            stats.latencies_ms.append(elapsed_ms)
+            if failed:
+                stats.errors += 1
+            if new_connection:
+                stats.new_connections += 1
+            elif new_connection is not None:
+                stats.reused_connections += 1
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            hosts = {host: stats.to_dict() for host, stats in self.stats.items()}
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "max_per_host": self.per_host,
+            "hosts": hosts
+        }
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+
+
+http_client = HttpClient()
@@ -0,0 +1,296 @@
+import base64
+import io
+import mmap
+import os
+from typing import Dict, Optional, Tuple, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.config import get_settings
+from app.services.color_service import rgb_to_lab
+from app.services.image_store import ImageStore, image_store
+
+settings = get_settings()
+
+# Thumbnail name -> longest side in pixels (grid cards, detail view, zoom)
+THUMBNAIL_SIZES = {"sm": 160, "md": 320, "lg": 640}
+
+FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+
+MIME_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+# Leading bytes -> MIME type, for handing encoded files to providers untouched
+MAGIC_MIME_TYPES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+
+def sniff_mime_type(data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> str:
+    """MIME type of encoded image bytes from their signature (no decoding)"""
+    head = bytes(data[:12])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return next((mime for magic, mime in MAGIC_MIME_TYPES if head.startswith(magic)), "image/jpeg")
+
+
+def base64_file(path: Union[str, os.PathLike]) -> Tuple[str, bytes]:
+    """
+    (MIME type, base64 bytes) of an image file, encoded straight from a
+    read-only mmap - the file is never read into a bytes copy first.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return "image/jpeg", b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return sniff_mime_type(mapped), base64.b64encode(mapped)
+
+
+def difference_hash(image: Image.Image) -> int:
+    """64-bit dHash: near-identical photos differ in only a few bits"""
+    small = image.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+# Pixels further than this (max channel difference) from the border color count as the garment
+FOREGROUND_THRESHOLD = 32
+SIGNATURE_SIDE = 24
+
+
+def color_signature(image: Image.Image) -> Tuple[float, float, float]:
+    """
+    Mean CIELAB color of the foreground - the pixels that differ from the
+    border (background) color; the whole image when too few do. dHash is
+    grayscale, so this is what tells a red tee from a navy one.
+    """
+    small = image.convert("RGB").resize((SIGNATURE_SIDE, SIGNATURE_SIDE), Image.BILINEAR)
+    pixels = list(small.getdata())
+    last = SIGNATURE_SIDE - 1
+    border = [pixels[row * SIGNATURE_SIDE + col] for row in range(SIGNATURE_SIDE) for col in range(SIGNATURE_SIDE)
+              if row in (0, last) or col in (0, last)]
+    background = [sorted(channel)[len(channel) // 2] for channel in zip(*border)]
+
+    foreground = [p for p in pixels if max(abs(c - bg) for c, bg in zip(p, background)) > FOREGROUND_THRESHOLD]
+    if len(foreground) < len(pixels) // 20:
+        foreground = pixels
+
+    counts: Dict[Tuple[int, int, int], int] = {}
+    for pixel in foreground:
+        counts[pixel] = counts.get(pixel, 0) + 1
+    total = [0.0, 0.0, 0.0]
+    for pixel, count in counts.items():
+        for i, value in enumerate(rgb_to_lab(*pixel)):
+            total[i] += value * count
+    return tuple(round(value / len(foreground), 2) for value in total)
+
+
+class UploadProfile:
+    """How images are prepared for one vision provider"""
+
+    def __init__(self, name: str, max_side: int, image_format: str, quality: int):
+        self.name = name
+        self.max_side = max_side
+        self.pil_format = FORMATS.get(image_format.lower(), FORMATS["jpeg"])[0]
+        self.quality = quality
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.pil_format]
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the provider would be shown a different image"""
+        return f"{self.name}:{self.max_side}:{self.pil_format}:{self.quality}"
+
+
+# Gemini bills and sees images in 768px tiles; Llama 4 Scout on GROQ takes
+# up to ~1 MP before its own downsampling
+UPLOAD_PROFILES = {
+    "gemini": UploadProfile("gemini", settings.GEMINI_UPLOAD_MAX_SIDE,
+                            settings.GEMINI_UPLOAD_FORMAT, settings.GEMINI_UPLOAD_QUALITY),
+    "groq": UploadProfile("groq", settings.GROQ_UPLOAD_MAX_SIDE,
+                          settings.GROQ_UPLOAD_FORMAT, settings.GROQ_UPLOAD_QUALITY),
+}
+
+
+class PreparedUpload:
+    """An image re-encoded for a provider"""
+
+    def __init__(self, data: bytes, mime_type: str, size: Tuple[int, int]):
+        self.data = data
+        self.mime_type = mime_type
+        self.size = size
+
+
+class IngestedImage:
+    """A normalized upload: master bytes plus the URLs of every stored variant"""
+
+    def __init__(self, master_bytes: bytes, variants: Optional[Dict], key: str, phash: Optional[int] = None,
+                 image: Optional[Image.Image] = None):
+        self.master_bytes = master_bytes
+        self.variants = variants
+        self.key = key  # SHA-256 of the stored master
+        self.phash = phash
+        self.image = image  # decoded, upright master - None when Pillow could not read the upload
+        self.color = color_signature(image) if image is not None else None  # foreground mean LAB
+
+    @property
+    def url(self) -> str:
+        return self.variants["master"]
+
+
+class ImageService:
+    """Normalizes uploaded photos: EXIF orientation, size-capped master, thumbnails"""
+
+    def __init__(self, store: ImageStore = image_store):
+        self.store = store
+        self.pil_format, self.extension = FORMATS.get(settings.IMAGE_FORMAT.lower(), FORMATS["webp"])
+
+    def _encode(self, image: Image.Image, pil_format: Optional[str] = None, quality: Optional[int] = None) -> bytes:
+        """Encode without EXIF/ICC - masters and provider uploads carry no metadata"""
+        pil_format = pil_format or self.pil_format
+        buffer = io.BytesIO()
+        options = {"quality": quality or settings.IMAGE_QUALITY}
+        if pil_format == "JPEG":
+            options.update(optimize=True, progressive=True)
+        else:
+            options.update(method=4)
+        image.save(buffer, pil_format, **options)
+        return buffer.getvalue()
+
+    def _open(self, source: Union[bytes, str, os.PathLike], max_side: int = settings.IMAGE_MAX_SIDE) -> Image.Image:
+        image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+        # JPEG can decode straight at a reduced scale - much cheaper for phone photos.
+        # Ask for the output's real size: draft keeps *both* sides at or above it
+        scale = max_side / max(image.size)
+        if scale < 1:
+            image.draft("RGB", (int(image.width * scale), int(image.height * scale)))
+        # In place: a transposed copy of a full-size decode is tens of MB
+        ImageOps.exif_transpose(image, in_place=True)
+
+        if image.mode in ("RGBA", "LA", "P"):
+            # Flatten transparency onto white (JPEG/WebP masters carry no alpha)
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image if image.mode == "RGB" else image.convert("RGB")
+
+    def ingest(self, image_bytes: bytes) -> IngestedImage:
+        """
+        Store an upload as a content-addressed master plus _sm/_md/_lg thumbnails.
+        Bytes Pillow cannot decode are stored unchanged with no variants.
+        """
+        try:
+            image = self._open(image_bytes)
+        except (UnidentifiedImageError, OSError) as e:
+            print(f"⚠️  Could not decode upload ({e}) - storing original bytes")
+            key, url = self.store.put(image_bytes, "jpg")
+            return IngestedImage(image_bytes, {"master": url, "thumbnails": {}}, key)
+
+        image.thumbnail((settings.IMAGE_MAX_SIDE, settings.IMAGE_MAX_SIDE), Image.LANCZOS)
+        master_bytes = self._encode(image)
+        key, master_url = self.store.put(master_bytes, self.extension)
+
+        thumbnails = {}
+        stored = len(master_bytes)
+        for size_name, side in THUMBNAIL_SIZES.items():
+            suffix = f"_{size_name}"
+            if self.store.has_derived(key, suffix, self.extension):
+                # Same master seen before - its thumbnails are already there
+                thumbnails[size_name] = self.store.derived_url(key, suffix, self.extension)
+                continue
+            thumb = image.copy()
+            thumb.thumbnail((side, side), Image.LANCZOS)
+            data = self._encode(thumb)
+            thumbnails[size_name] = self.store.put_derived(key, suffix, data, self.extension)
+            stored += len(data)
+
+        print(f"🖼️  Ingested {image.width}x{image.height} image: "
+              f"{len(image_bytes) // 1024} KB upload -> {stored // 1024} KB stored")
+
+        return IngestedImage(master_bytes, {
+            "master": master_url,
+            "width": image.width,
+            "height": image.height,
+            "thumbnails": thumbnails
+        }, key, difference_hash(image), image)
+
+    def load(self, image_url: Optional[str]) -> Optional[IngestedImage]:
+        """Rebuild the IngestedImage of a master stored by an earlier ingest"""
+        master = self.store.path_for_url(image_url)
+        if not master or not master.is_file():
+            return None
+
+        master_bytes = master.read_bytes()
+        variants = self.variants_for(image_url)
+        try:
+            image = self._open(master_bytes)
+        except (UnidentifiedImageError, OSError):
+            return IngestedImage(master_bytes, variants, master.stem)
+        return IngestedImage(master_bytes, variants, master.stem, difference_hash(image), image)
+
+    def prepare_upload(self, source: Union[bytes, str, os.PathLike], profile: UploadProfile) -> Optional[PreparedUpload]:
+        """
+        Downscale and re-encode an image (bytes or a file path) for a vision
+        provider. EXIF and ICC data are dropped. Returns None when the source
+        is already at least as compact - send it unchanged then.
+        """
+        try:
+            image = self._open(source, profile.max_side)
+        except (UnidentifiedImageError, OSError) as e:
+            print(f"⚠️  Could not prepare image for {profile.name} ({e}) - sending it unchanged")
+            return None
+
+        image.thumbnail((profile.max_side, profile.max_side), Image.LANCZOS)
+        data = self._encode(image, profile.pil_format, profile.quality)
+
+        source_bytes = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        if len(data) >= source_bytes:
+            return None
+
+        print(f"📉 {profile.name} upload: {source_bytes // 1024} KB -> "
+              f"{image.width}x{image.height} {len(data) // 1024} KB")
+        return PreparedUpload(data, profile.mime_type, image.size)
+
+    def variants_for(self, image_url: Optional[str]) -> Optional[Dict]:
+        """Variants stored for a master URL from an earlier ingest, if any"""
+        master = self.store.path_for_url(image_url)
+        if not master or not master.is_file():
+            return None
+
+        key, extension = master.stem, master.suffix.lstrip(".")
+        thumbnails = {
+            size_name: self.store.derived_url(key, f"_{size_name}", extension)
+            for size_name in THUMBNAIL_SIZES
+            if self.store.has_derived(key, f"_{size_name}", extension)
+        }
+
+        variants = {"master": image_url, "thumbnails": thumbnails}
+        if thumbnails:
+            try:
+                with Image.open(master) as image:
+                    variants.update(width=image.width, height=image.height)
+            except (UnidentifiedImageError, OSError):
+                pass
+        return variants
+
+    @staticmethod
+    def urls_of(image_url: Optional[str], variants: Optional[Dict]) -> list:
+        """Every stored file URL an item points at"""
+        urls = [image_url] if image_url else []
+        if variants:
+            urls.append(variants.get("master"))
+            urls.extend((variants.get("thumbnails") or {}).values())
+        return [url for url in dict.fromkeys(urls) if url]
+
+
+image_service = ImageService()
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+# Served by the frontend static mount at /uploads
+UPLOAD_DIR = Path(__file__).parent.parent.parent.parent / "frontend" / "uploads"
+UPLOAD_URL = "/uploads"
+
+
+class ImageStore:
+    """
+    Content-addressed image store: each blob lives at <ab>/<cd>/<sha256>.<ext>
+    under the uploads directory, so identical uploads are stored once and
+    names never collide. Derived files (thumbnails) sit next to their source
+    as <sha256>_<suffix>.<ext>.
+    """
+
+    def __init__(self, root: Path = UPLOAD_DIR, url_prefix: str = UPLOAD_URL):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.root.mkdir(exist_ok=True, parents=True)
+
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def relative_path(key: str, extension: str, suffix: str = "") -> str:
+        return f"{key[:2]}/{key[2:4]}/{key}{suffix}.{extension}"
+
+    def url_for(self, relative: str) -> str:
+        return f"{self.url_prefix}/{relative}"
+
+    def path_for_url(self, url: Optional[str]) -> Optional[Path]:
+        """Local path of a store URL, None for anything outside the uploads directory"""
+        if not url or not url.startswith(f"{self.url_prefix}/"):
+            return None
+        path = (self.root / url[len(self.url_prefix) + 1:]).resolve()
+        return path if path.is_relative_to(self.root.resolve()) else None
+
+    def _write(self, relative: str, data: bytes) -> bool:
+        """Atomically write a blob; False when it was already stored"""
+        path = self.root / relative
+        if path.exists():
+            # Refresh the mtime so GC's grace period restarts for re-uploads
+            os.utime(path)
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return True
+
+    def put(self, data: bytes, extension: str) -> Tuple[str, str]:
+        """Store bytes under their SHA-256; returns (key, url)"""
+        key = self.key_for(data)
+        relative = self.relative_path(key, extension)
+        if not self._write(relative, data):
+            print(f"♻️  Duplicate upload, reusing {relative}")
+        return key, self.url_for(relative)
+
+    def has_derived(self, key: str, suffix: str, extension: str) -> bool:
+        return (self.root / self.relative_path(key, extension, suffix)).exists()
+
+    def put_derived(self, key: str, suffix: str, data: bytes, extension: str) -> str:
+        """Store a file derived from blob `key` (e.g. a thumbnail); returns its URL"""
+        relative = self.relative_path(key, extension, suffix)
+        self._write(relative, data)
+        return self.url_for(relative)
+
+    def derived_url(self, key: str, suffix: str, extension: str) -> str:
+        return self.url_for(self.relative_path(key, extension, suffix))
+
+    def delete(self, urls: Iterable[str]) -> int:
+        removed = 0
+        for url in urls:
+            path = self.path_for_url(url)
+            if path and path.is_file():
+                path.unlink()
+                removed += 1
+        return removed
+
+    def iter_blobs(self) -> Iterator[Path]:
+        """Every file in the sharded layout (legacy flat uploads are left alone)"""
+        yield from (path for path in self.root.glob("??/??/*") if path.is_file() and not path.name.startswith(".tmp-"))
+
+    def gc(self, referenced: Set[str], min_age_seconds: float = 24 * 3600, dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Remove blobs whose URL is not in `referenced`. Files younger than
+        min_age_seconds are kept: they may belong to an upload that has been
+        analyzed but not saved as an item yet. Returns (files, bytes) reclaimed.
+        """
+        cutoff = time.time() - min_age_seconds
+        files = reclaimed = 0
+        for path in self.iter_blobs():
+            url = self.url_for(path.relative_to(self.root).as_posix())
+            stat = path.stat()
+            if url in referenced or stat.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                path.unlink()
+            files += 1
+            reclaimed += stat.st_size
+        return files, reclaimed
+
+
+image_store = ImageStore()
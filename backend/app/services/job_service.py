@@ -0,0 +1,321 @@
+import asyncio
+import os
+import queue
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import delete, select, update
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.job import Job
+
+settings = get_settings()
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+# A handler gets the job's params and a progress(percent, message) callback
+# and returns a JSON-serializable result
+JobHandler = Callable[[Dict, Callable[[int, str], None]], Dict]
+
+
+class JobService:
+    """
+    In-process job queue: jobs are rows in the `jobs` table, run by a pool of
+    worker threads. A running job is leased to the process that claimed it,
+    which keeps renewing the lease; jobs whose lease lapses (their process
+    died) are queued again by any live process, and jobs left queued are
+    picked up on start. Progress is pushed to SSE listeners as it happens.
+    """
+
+    def __init__(self, session_factory=SessionLocal, workers: int = settings.JOB_WORKERS):
+        self.session_factory = session_factory
+        self.worker_count = workers
+        self.handlers: Dict[str, JobHandler] = {}
+        self.queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.threads = []
+        # Lease owner for jobs claimed by this process
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.running: Set[str] = set()
+        self.stopping = threading.Event()
+        self.heartbeat: Optional[threading.Thread] = None
+        self.listeners: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self.lock = threading.Lock()
+
+    def handler(self, kind: str):
+        """Decorator registering the function that runs jobs of `kind`"""
+        def register(func: JobHandler) -> JobHandler:
+            self.handlers[kind] = func
+            return func
+        return register
+
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+
+    def start(self):
+        if self.threads:
+            return
+        requeued = self.requeue_unfinished()
+        self.prune()
+        for index in range(self.worker_count):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        self.heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self.heartbeat.start()
+        print(f"✅ Job workers started: {self.worker_count} (re-queued {requeued})")
+
+    def stop(self, timeout: float = 5.0):
+        """Let running jobs finish (up to `timeout`); queued ones stay in the table"""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        # Keep renewing leases until the workers are done; unfinished jobs lapse
+        self.stopping.set()
+        if self.heartbeat:
+            self.heartbeat.join(timeout)
+        self.threads = []
+        self.heartbeat = None
+        self.stopping = threading.Event()
+        self.queue = queue.Queue()
+
+    def requeue_unfinished(self, include_queued: bool = True) -> int:
+        """
+        Queue again running jobs whose lease has lapsed, and (on start) the
+        jobs waiting in the table. Jobs another process is still renewing
+        the lease on are left alone.
+        """
+        lapsed = (Job.status == "running") & (
+            Job.lease_expires_at.is_(None) | (Job.lease_expires_at < datetime.utcnow())
+        )
+        db = self.session_factory()
+        try:
+            orphaned = db.scalars(select(Job.id).where(lapsed)).all()
+            gave_up = 0
+            if orphaned:
+                # Their process died mid-way; give up on jobs that keep dying
+                gave_up = db.execute(
+                    update(Job)
+                    .where(Job.id.in_(orphaned), lapsed, Job.attempts >= settings.JOB_MAX_ATTEMPTS)
+                    .values(status="failed", error="Interrupted too many times", finished_at=datetime.utcnow())
+                ).rowcount
+                db.execute(
+                    update(Job)
+                    .where(Job.id.in_(orphaned), lapsed)
+                    .values(status="queued", owner=None, lease_expires_at=None)
+                )
+                db.commit()
+
+            if include_queued:
+                ids = db.scalars(select(Job.id).where(Job.status == "queued").order_by(Job.created_at)).all()
+            else:
+                ids = db.scalars(select(Job.id).where(Job.id.in_(orphaned), Job.status == "queued")).all()
+            if gave_up:
+                print(f"⚠️  {gave_up} interrupted jobs failed after {settings.JOB_MAX_ATTEMPTS} attempts")
+        finally:
+            db.close()
+
+        for job_id in ids:
+            self.queue.put(job_id)
+        return len(ids)
+
+    def renew_leases(self) -> int:
+        """Extend the lease on every job this process is running"""
+        with self.lock:
+            running = list(self.running)
+        if not running:
+            return 0
+        db = self.session_factory()
+        try:
+            renewed = db.execute(
+                update(Job)
+                .where(Job.id.in_(running), Job.owner == self.owner, Job.status == "running")
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+            ).rowcount
+            db.commit()
+            return renewed
+        finally:
+            db.close()
+
+    def _heartbeat(self):
+        """Renew our leases and pick up jobs orphaned by other processes"""
+        while not self.stopping.wait(settings.JOB_LEASE_SECONDS / 3):
+            try:
+                self.renew_leases()
+                requeued = self.requeue_unfinished(include_queued=False)
+                if requeued:
+                    print(f"🔁 Re-queued {requeued} jobs whose worker stopped responding")
+            except Exception:
+                traceback.print_exc()
+
+    def prune(self) -> int:
+        db = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=settings.JOB_RETENTION_DAYS)
+            removed = db.execute(
+                delete(Job).where(Job.status.in_(TERMINAL_STATUSES), Job.finished_at < cutoff)
+            ).rowcount
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+    # ========================================
+    # SUBMIT / READ
+    # ========================================
+
+    def submit(self, kind: str, params: Dict) -> str:
+        if kind not in self.handlers:
+            raise ValueError(f"No job handler registered for '{kind}'")
+
+        job_id = uuid.uuid4().hex
+        db = self.session_factory()
+        try:
+            db.add(Job(id=job_id, kind=kind, status="queued", params=params, progress=0, attempts=0))
+            db.commit()
+        finally:
+            db.close()
+
+        self.queue.put(job_id)
+        print(f"📥 Job queued: {kind} {job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = db.get(Job, job_id)
+            return job.to_dict() if job else None
+        finally:
+            db.close()
+
+    # ========================================
+    # WORKERS
+    # ========================================
+
+    def _update(self, job_id: str, **values) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = db.get(Job, job_id)
+            if not job:
+                return None
+            for key, value in values.items():
+                setattr(job, key, value)
+            db.commit()
+            snapshot = job.to_dict()
+        finally:
+            db.close()
+        self._publish(job_id, snapshot)
+        return snapshot
+
+    def _claim(self, job_id: str) -> Optional[Job]:
+        """Atomically move a queued job to running; None if someone else has it"""
+        db = self.session_factory()
+        try:
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", started_at=datetime.utcnow(), attempts=Job.attempts + 1,
+                        message="Started", owner=self.owner,
+                        lease_expires_at=datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return None
+            job = db.get(Job, job_id)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _work(self):
+        while True:
+            job_id = self.queue.get()
+            if job_id is None:
+                return
+            try:
+                self._run(job_id)
+            except Exception:
+                # Bookkeeping failed (e.g. database locked) - the row stays
+                # queued/running and is picked up again once its lease lapses
+                traceback.print_exc()
+            finally:
+                with self.lock:
+                    self.running.discard(job_id)
+
+    def _run(self, job_id: str):
+        job = self._claim(job_id)
+        if not job:
+            return
+        with self.lock:
+            self.running.add(job_id)
+        self._publish(job_id, job.to_dict())
+
+        handler = self.handlers.get(job.kind)
+        if not handler:
+            self._update(job_id, status="failed", error=f"No handler for '{job.kind}'",
+                         finished_at=datetime.utcnow())
+            return
+
+        def progress(percent: int, message: str = ""):
+            self._update(job_id, progress=max(0, min(100, int(percent))), message=message)
+
+        print(f"⚙️  Job running: {job.kind} {job_id} (attempt {job.attempts})")
+        try:
+            result = handler(job.params, progress)
+        except Exception as e:
+            traceback.print_exc()
+            self._update(job_id, status="failed", error=str(e), message="Failed",
+                         finished_at=datetime.utcnow())
+            print(f"❌ Job failed: {job.kind} {job_id}: {e}")
+            return
+
+        self._update(job_id, status="succeeded", result=result, progress=100, message="Done",
+                     finished_at=datetime.utcnow())
+        print(f"✅ Job done: {job.kind} {job_id}")
+
+    # ========================================
+    # PROGRESS EVENTS
+    # ========================================
+
+    def _publish(self, job_id: str, snapshot: Dict):
+        with self.lock:
+            listeners = list(self.listeners.get(job_id, ()))
+        for loop, events in listeners:
+            loop.call_soon_threadsafe(events.put_nowait, snapshot)
+
+    async def events(self, job_id: str, keepalive: float = 15.0) -> AsyncIterator[Optional[Dict]]:
+        """
+        Job snapshots as they change, ending with the finished job. Yields None
+        after `keepalive` seconds without news so callers can ping the client.
+        """
+        loop = asyncio.get_running_loop()
+        listener = (loop, asyncio.Queue())
+        with self.lock:
+            self.listeners.setdefault(job_id, set()).add(listener)
+        try:
+            # Subscribe first, then read: no update can slip in between
+            snapshot = await loop.run_in_executor(None, self.get, job_id)
+            if snapshot is None:
+                return
+            yield snapshot
+            while snapshot["status"] not in TERMINAL_STATUSES:
+                try:
+                    snapshot = await asyncio.wait_for(listener[1].get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield snapshot
+        finally:
+            with self.lock:
+                self.listeners.get(job_id, set()).discard(listener)
+                if not self.listeners.get(job_id):
+                    self.listeners.pop(job_id, None)
+
+
+job_service = JobService()
@@ -0,0 +1,134 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Inside a candidate only quotes, backslashes and brackets matter
+STRUCTURAL = re.compile(r'["\\{}\[\]]')
+IN_STRING = re.compile(r'["\\]')
+TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def adapter_for(schema: Any) -> TypeAdapter:
+    """Building a TypeAdapter costs far more than a validation, so each schema gets one"""
+    return TypeAdapter(schema)
+
+
+class JSONStreamExtractor:
+    """
+    Pulls the first JSON object/array out of model output that may wrap it in
+    prose, code fences or trailing text - fed all at once or chunk by chunk as
+    tokens stream in, finishing as soon as the value's closing bracket arrives.
+
+    Candidates are balanced-bracket spans (brackets inside JSON strings don't
+    count). One that does not parse, or does not validate against `schema`,
+    is skipped and scanning resumes just after its opening bracket, so braces
+    in prose ahead of the real answer are harmless.
+    """
+
+    def __init__(self, schema: Any = None, expect: Optional[str] = None):
+        """`schema`: pydantic model or type (e.g. List[Model]); `expect`: "{" or "[" to only look for one kind"""
+        self.adapter = adapter_for(schema) if schema is not None else None
+        self.openers = re.compile(re.escape(expect) if expect else r"[{\[]")
+        self.text = ""
+        self.pos = 0  # next index to scan
+        self.start = None  # opening bracket of the current candidate
+        self.stack = []
+        self.in_string = False
+        self.value = None
+        self.done = False
+        self.rejected = 0  # candidates that did not parse or validate
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        """Add streamed text; returns the value once a valid one has closed (check `done` for falsy values)"""
+        if not self.done:
+            self.text += chunk
+            self._scan()
+        return self.value
+
+    def finish(self) -> Optional[Any]:
+        """End of stream: give up on any unclosed candidate and retry from the brackets inside it"""
+        while not self.done and self.start is not None:
+            self._reject()
+            self._scan()
+        return self.value
+
+    def _scan(self):
+        text, i = self.text, self.pos
+        while not self.done:
+            if self.start is None:
+                match = self.openers.search(text, i)
+                if not match:
+                    i = len(text)
+                    break
+                self.start, i = match.start(), match.end()
+                self.stack = [CLOSERS[match.group()]]
+                self.in_string = False
+                continue
+
+            match = (IN_STRING if self.in_string else STRUCTURAL).search(text, i)
+            if not match:
+                i = len(text)
+                break
+            ch, i = match.group(), match.end()
+
+            if ch == "\\":
+                if i >= len(text):
+                    i -= 1  # the escaped character has not arrived yet
+                    break
+                i += 1
+            elif ch == '"':
+                self.in_string = not self.in_string
+            elif ch in CLOSERS:
+                self.stack.append(CLOSERS[ch])
+            elif ch != self.stack.pop():
+                i = self._reject()
+            elif not self.stack:
+                value = self._accept(text[self.start:i])
+                if value is _MISSING:
+                    i = self._reject()
+                else:
+                    self.value, self.done = value, True
+        self.pos = i
+
+    def _reject(self) -> int:
+        self.rejected += 1
+        self.pos = self.start + 1
+        self.start = None
+        self.stack = []
+        self.in_string = False
+        return self.pos
+
+    def _accept(self, candidate: str) -> Any:
+        try:
+            value = json.loads(candidate, strict=False)
+        except ValueError:
+            # Models often leave a trailing comma before a closing bracket
+            repaired = TRAILING_COMMA.sub(r"\1", candidate)
+            if repaired == candidate:
+                return _MISSING
+            try:
+                value = json.loads(repaired, strict=False)
+            except ValueError:
+                return _MISSING
+
+        if self.adapter is None:
+            return value
+        try:
+            return self.adapter.dump_python(self.adapter.validate_python(value), mode="json")
+        except ValidationError:
+            return _MISSING
+
+
+def extract_json(text: str, schema: Any = None, expect: Optional[str] = None) -> Optional[Any]:
+    """The first JSON value in `text` that validates against `schema`, or None"""
+    extractor = JSONStreamExtractor(schema, expect)
+    extractor.feed(text)
+    return extractor.finish()
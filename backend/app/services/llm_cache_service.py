@@ -0,0 +1,275 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, func, select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.llm_cache import LLMCacheEntry
+
+settings = get_settings()
+
+# Run TTL/LRU eviction of the persistent copy once every this many writes
+PRUNE_EVERY = 50
+
+
+class CacheSite:
+    """One prompt that is safe to answer from cache, with its own TTL"""
+
+    def __init__(self, name: str, template: str, model: str, ttl_seconds: int):
+        self.name = name
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        # Cached answers are only reused for the same model and template text
+        self.version = hashlib.sha1(f"{model}\n{template}".encode()).hexdigest()[:12]
+
+
+def normalize(value: Any) -> Any:
+    """Inputs that render the same prompt meaning hash the same"""
+    if isinstance(value, dict):
+        return {str(key): normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, float):
+        return round(value, 2)
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    return str(value)
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "cost_ms")
+
+    def __init__(self, value: Any, expires_at: float, cost_ms: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.cost_ms = cost_ms
+
+
+class Flight:
+    """A provider call in progress that identical requests wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.cost_ms = 0.0
+        self.error: Optional[BaseException] = None
+
+
+class SiteStats:
+    def __init__(self):
+        self.hits = 0
+        self.persistent_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.saved_ms = 0.0
+        self.provider_ms = 0.0
+
+    def to_dict(self) -> Dict:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else None,
+            "saved_latency_ms": round(self.saved_ms),
+            "avg_provider_ms": round(self.provider_ms / self.misses) if self.misses else None
+        }
+
+
+class LLMCacheService:
+    """
+    Cache for parsed answers of deterministic text prompts: an in-memory LRU
+    in front of an optional `llm_cache` table. Concurrent identical requests
+    share one provider call (singleflight). Only answers the call site could
+    parse are stored - a None result is returned but never cached.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+                 persist: bool = settings.LLM_CACHE_PERSIST):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self.persist = persist
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.flights: Dict[str, Flight] = {}
+        self.stats: Dict[str, SiteStats] = {}
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    @staticmethod
+    def key(site: CacheSite, inputs: Dict) -> str:
+        material = {"site": site.name, "model": site.model, "version": site.version, "inputs": normalize(inputs)}
+        return hashlib.sha256(json.dumps(material, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def get_or_call(self, site: CacheSite, inputs: Dict, call: Callable[[], Any]) -> Any:
+        """The cached answer for `inputs`, or `call()`'s - computed once however many ask at the same time"""
+        key = self.key(site, inputs)
+
+        with self.lock:
+            stats = self.stats.setdefault(site.name, SiteStats())
+            entry = self._memory_get(key)
+            if entry:
+                stats.hits += 1
+                stats.saved_ms += entry.cost_ms
+                return copy.deepcopy(entry.value)
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            flight.done.wait()
+            with self.lock:
+                stats.coalesced += 1
+                stats.saved_ms += flight.cost_ms
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            entry = self._persistent_get(key) if self.persist else None
+            if entry:
+                with self.lock:
+                    stats.hits += 1
+                    stats.persistent_hits += 1
+                    stats.saved_ms += entry.cost_ms
+                    self._memory_put(key, entry)
+                flight.value, flight.cost_ms = entry.value, entry.cost_ms
+                return copy.deepcopy(entry.value)
+
+            start = time.perf_counter()
+            value = call()
+            cost_ms = (time.perf_counter() - start) * 1000
+
+            with self.lock:
+                stats.misses += 1
+                stats.provider_ms += cost_ms
+                if value is None:
+                    stats.uncacheable += 1
+                else:
+                    # Callers may modify what they get back; the cache keeps its own copy
+                    self._memory_put(key, CacheEntry(copy.deepcopy(value), time.time() + site.ttl_seconds, cost_ms))
+            if value is not None and self.persist:
+                self._persistent_put(key, site, value, cost_ms)
+            flight.value, flight.cost_ms = copy.deepcopy(value), cost_ms
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+            flight.done.set()
+
+    # ========================================
+    # IN-MEMORY LRU
+    # ========================================
+
+    def _memory_get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key: str, entry: CacheEntry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # ========================================
+    # PERSISTENT COPY
+    # ========================================
+
+    def _persistent_get(self, key: str) -> Optional[CacheEntry]:
+        """Never raises - a broken cache table only costs a provider call"""
+        db = self.session_factory()
+        try:
+            row = db.get(LLMCacheEntry, key)
+            now = datetime.utcnow()
+            if not row or row.expires_at <= now:
+                return None
+            row.hits += 1
+            row.last_used_at = now
+            entry = CacheEntry(row.value, time.time() + (row.expires_at - now).total_seconds(), row.cost_ms)
+            db.commit()
+            return entry
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  LLM cache read failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _persistent_put(self, key: str, site: CacheSite, value: Any, cost_ms: float):
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.merge(LLMCacheEntry(
+                key=key, site=site.name, value=value, cost_ms=cost_ms, hits=0,
+                created_at=now, expires_at=now + timedelta(seconds=site.ttl_seconds), last_used_at=now
+            ))
+            db.commit()
+
+            self.writes += 1
+            if self.writes % PRUNE_EVERY == 1:
+                self.prune(db)
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  LLM cache write failed: {e}")
+        finally:
+            db.close()
+
+    def prune(self, db) -> int:
+        """Drop expired rows, then the least recently used ones above the size cap"""
+        removed = db.execute(
+            delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= datetime.utcnow())
+        ).rowcount
+
+        overflow = db.scalar(select(func.count()).select_from(LLMCacheEntry)) - settings.LLM_CACHE_PERSIST_MAX_ENTRIES
+        if overflow > 0:
+            oldest = select(LLMCacheEntry.key).order_by(LLMCacheEntry.last_used_at).limit(overflow)
+            removed += db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(oldest))).rowcount
+
+        db.commit()
+        if removed:
+            print(f"🧹 LLM cache: evicted {removed} entries")
+        return removed
+
+    # ========================================
+    # METRICS
+    # ========================================
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            sites = {name: stats.to_dict() for name, stats in self.stats.items()}
+            entries = len(self.entries)
+        lookups = sum(site["lookups"] for site in sites.values())
+        served = sum(site["hits"] + site["coalesced"] for site in sites.values())
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "persist": self.persist,
+            "hit_ratio": round(served / lookups, 3) if lookups else None,
+            "saved_latency_ms": sum(site["saved_latency_ms"] for site in sites.values()),
+            "sites": sites
+        }
+
+
+llm_cache_service = LLMCacheService()
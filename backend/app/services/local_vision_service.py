@@ -0,0 +1,297 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.services.color_service import PALETTE, color_service, delta_e
+
+# Longest side the photo is reduced to before any statistics are taken
+ANALYSIS_SIDE = 160
+
+# Dominant-color clustering
+CLUSTERS = 4
+KMEANS_ITERATIONS = 12
+MIN_COLOR_SHARE = 0.08
+
+# A pixel further than this (CIELAB distance) from the border color is foreground
+BACKGROUND_DISTANCE = 18.0
+# Borders busier than this are a scene, not a backdrop - fall back to a centre crop
+MAX_BORDER_SPREAD = 22.0
+
+# Pixels fed to k-means (a strided sample of the foreground)
+MAX_CLUSTER_POINTS = 4096
+
+# Pattern heuristics (on lightness scaled to 0-1)
+EDGE_THRESHOLD = 0.08       # gradient magnitude counted as an edge
+SOLID_EDGE_DENSITY = 0.04
+MIN_CONTRAST = 0.03         # lightness std below this is a plain fabric
+PERIODIC_POWER = 0.35       # share of the spectrum in its strongest few frequencies
+PEAK_BINS = 8
+
+# (min, max) height/width of the garment's bounding box -> category hints
+ASPECT_HINTS: List[Tuple[float, float, Dict[str, float]]] = [
+    (2.0, 99.0, {"Bottoms": 0.55, "Dresses": 0.35, "Indian Traditional": 0.10}),
+    (1.35, 2.0, {"Dresses": 0.45, "Bottoms": 0.25, "Indian Traditional": 0.15, "Tops": 0.15}),
+    (0.8, 1.35, {"Tops": 0.60, "Outerwear": 0.25, "Dresses": 0.15}),
+    (0.0, 0.8, {"Footwear": 0.40, "Accessories": 0.35, "Tops": 0.25}),
+]
+
+CATEGORY_NOUNS = {
+    "Tops": "Top",
+    "Bottoms": "Bottoms",
+    "Dresses": "Dress",
+    "Indian Traditional": "Ethnic Wear",
+    "Outerwear": "Jacket",
+    "Footwear": "Footwear",
+    "Accessories": "Accessory",
+}
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Vectorized sRGB (0-255, shape (..., 3)) -> CIELAB (D65)"""
+    c = rgb.astype(np.float32) / 255.0
+    c = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+    xyz = c @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ], dtype=np.float32)
+    xyz /= np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def kmeans(points: np.ndarray, k: int, iterations: int = KMEANS_ITERATIONS) -> Tuple[np.ndarray, np.ndarray]:
+    """Lloyd's k-means with k-means++ seeding; returns (centres, labels)"""
+    rng = np.random.default_rng(0)  # deterministic: same photo, same answer
+    k = min(k, len(points))
+
+    centres = [points[rng.integers(len(points))]]
+    for _ in range(1, k):
+        d2 = ((points[:, None, :] - np.array(centres)[None]) ** 2).sum(-1).min(1)
+        if d2.sum() == 0:
+            break
+        centres.append(points[rng.choice(len(points), p=d2 / d2.sum())])
+    centres = np.array(centres)
+
+    for _ in range(iterations):
+        labels = ((points[:, None, :] - centres[None]) ** 2).sum(-1).argmin(1)
+        moved = np.array([
+            points[labels == i].mean(0) if np.any(labels == i) else centres[i]
+            for i in range(len(centres))
+        ])
+        if np.allclose(moved, centres, atol=0.5):
+            break
+        centres = moved
+
+    labels = ((points[:, None, :] - centres[None]) ** 2).sum(-1).argmin(1)
+    return centres, labels
+
+
+def erode(mask: np.ndarray) -> np.ndarray:
+    """Drop the one-pixel rim of a mask (anti-aliased outline pixels are not fabric)"""
+    inner = mask.copy()
+    inner[1:] &= mask[:-1]
+    inner[:-1] &= mask[1:]
+    inner[:, 1:] &= mask[:, :-1]
+    inner[:, :-1] &= mask[:, 1:]
+    return inner
+
+
+def fill_holes(mask: np.ndarray) -> np.ndarray:
+    """
+    Add background-colored pixels enclosed by the garment: white stripes or
+    prints on a white backdrop belong to it too. A pixel is filled when the
+    mask surrounds it along its row and its column, or along one of them
+    while the other is empty altogether (a stripe spanning the full width).
+    """
+    rows = np.logical_and(np.logical_or.accumulate(mask, axis=1),
+                          np.logical_or.accumulate(mask[:, ::-1], axis=1)[:, ::-1])
+    cols = np.logical_and(np.logical_or.accumulate(mask, axis=0),
+                          np.logical_or.accumulate(mask[::-1], axis=0)[::-1])
+    empty_rows = ~mask.any(axis=1, keepdims=True)
+    empty_cols = ~mask.any(axis=0, keepdims=True)
+    return mask | (rows & (cols | empty_cols)) | (cols & (rows | empty_rows))
+
+
+def periodicity(patch: np.ndarray) -> Tuple[float, float, float]:
+    """
+    How much of a patch's texture energy sits in a few spatial frequencies,
+    and how that peak energy splits between the vertical axis (horizontal
+    stripes), the horizontal axis (vertical stripes) and off-axis (checks).
+    """
+    height, width = patch.shape
+    window = np.outer(np.hanning(height), np.hanning(width))
+    power = np.abs(np.fft.fft2((patch - patch.mean()) * window)) ** 2
+    # Ignore DC and the slowest waves - those are lighting, not pattern
+    power[:2, :2] = power[:2, -1:] = power[-1:, :2] = power[-1:, -1:] = 0
+    total = power.sum()
+    if total <= 1e-12:
+        return 0.0, 0.0, 0.0
+
+    peaks = np.argsort(power, axis=None)[-PEAK_BINS:]
+    rows, cols = np.unravel_index(peaks, power.shape)
+    peak_power = power[rows, cols]
+    on_column_axis = peak_power[cols == 0].sum()   # varies along y only
+    on_row_axis = peak_power[rows == 0].sum()      # varies along x only
+    strength = float(peak_power.sum() / total)
+    return strength, float(on_column_axis / peak_power.sum()), float(on_row_axis / peak_power.sum())
+
+
+class LocalVisionService:
+    """
+    CPU-only attribute pre-detection: dominant colors, a pattern guess and
+    category hints from the garment's silhouette. Runs in a few milliseconds,
+    so the upload form can be filled before (or without) the vision provider.
+    """
+
+    def __init__(self):
+        self.palette_names = list(PALETTE)
+
+    def _foreground_mask(self, lab: np.ndarray) -> np.ndarray:
+        """Pixels that differ from the backdrop, estimated from the image border"""
+        border = np.concatenate([lab[0], lab[-1], lab[:, 0], lab[:, -1]])
+        backdrop = np.median(border, axis=0)
+        spread = np.median(np.linalg.norm(border - backdrop, axis=1))
+
+        height, width = lab.shape[:2]
+        if spread > MAX_BORDER_SPREAD:
+            # Busy scene: trust the centre of the frame instead
+            ys, xs = np.ogrid[:height, :width]
+            return ((ys - height / 2) / (height / 2)) ** 2 + ((xs - width / 2) / (width / 2)) ** 2 <= 0.35
+
+        mask = fill_holes(np.linalg.norm(lab - backdrop, axis=-1) > BACKGROUND_DISTANCE)
+        # Nothing stands out (a close-up of the fabric): the whole frame is the garment
+        return mask if mask.mean() > 0.05 else np.ones((height, width), dtype=bool)
+
+    def _name_color(self, lab: Tuple[float, float, float]) -> str:
+        return min(self.palette_names, key=lambda name: delta_e(lab, color_service.lab[name]))
+
+    def _palette(self, rgb: np.ndarray, lab: np.ndarray) -> List[Dict]:
+        """Dominant colors of the foreground, largest share first"""
+        step = max(1, len(lab) // MAX_CLUSTER_POINTS)
+        rgb, lab = rgb[::step], lab[::step]
+        centres, labels = kmeans(lab, CLUSTERS)
+        shares = np.bincount(labels, minlength=len(centres)) / len(labels)
+
+        colors: Dict[str, Dict] = {}
+        for i in np.argsort(-shares):
+            if shares[i] < MIN_COLOR_SHARE:
+                continue
+            name = self._name_color(tuple(float(v) for v in centres[i]))
+            if name in colors:
+                # Two shades of the same palette color (e.g. fabric in light and shadow)
+                colors[name]["share"] += float(shares[i])
+                continue
+            mean_rgb = rgb[labels == i].mean(0).round().astype(int)
+            colors[name] = {
+                "name": name,
+                "family": color_service.families[name],
+                "hex": "#{:02x}{:02x}{:02x}".format(*mean_rgb),
+                "share": float(shares[i])
+            }
+
+        palette = sorted(colors.values(), key=lambda color: -color["share"])
+        for color in palette:
+            color["share"] = round(color["share"], 2)
+        return palette
+
+    def _pattern(self, gray: np.ndarray, mask: np.ndarray, palette: List[Dict]) -> Tuple[str, Dict]:
+        """Solid / striped / checkered / printed from edge and frequency statistics"""
+        fabric = erode(mask)
+        if fabric.sum() < 16:
+            fabric = mask
+        ys, xs = np.nonzero(fabric)
+        top, bottom, left, right = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        patch = gray[top:bottom, left:right].copy()
+        inside = fabric[top:bottom, left:right]
+        # Paint the backdrop with the garment's mean so its outline is not read as pattern
+        patch[~inside] = patch[inside].mean()
+
+        gx = np.abs(np.diff(patch, axis=1))[:-1]
+        gy = np.abs(np.diff(patch, axis=0))[:, :-1]
+        inner = inside[:-1, :-1] & inside[1:, :-1] & inside[:-1, 1:]
+        edges = np.hypot(gx, gy)[inner] if inner.any() else np.zeros(1)
+        edge_density = float((edges > EDGE_THRESHOLD).mean())
+        contrast = float(patch[inside].std())
+
+        strength, horizontal, vertical = periodicity(patch) if min(patch.shape) >= 8 else (0.0, 0.0, 0.0)
+        stats = {
+            "edge_density": round(edge_density, 3),
+            "contrast": round(contrast, 3),
+            "periodicity": round(strength, 3)
+        }
+
+        colorful = sum(color["share"] >= 0.2 for color in palette) >= 2
+        if (edge_density < SOLID_EDGE_DENSITY or contrast < MIN_CONTRAST) and not colorful:
+            return "solid", stats
+        if strength > PERIODIC_POWER and contrast >= MIN_CONTRAST:
+            if horizontal > 0.7 or vertical > 0.7:
+                return "striped", stats
+            return "checkered", stats
+        if edge_density < SOLID_EDGE_DENSITY * 2 and colorful:
+            return "color-block", stats
+        return "printed", stats
+
+    def _category_hints(self, mask: np.ndarray) -> List[Dict]:
+        ys, xs = np.nonzero(mask)
+        aspect = (ys.max() - ys.min() + 1) / (xs.max() - xs.min() + 1)
+        for low, high, hints in ASPECT_HINTS:
+            if low <= aspect < high:
+                return [
+                    {"category": category, "score": score, "aspect_ratio": round(float(aspect), 2)}
+                    for category, score in sorted(hints.items(), key=lambda hint: -hint[1])
+                ]
+        return []
+
+    def detect(self, image: Image.Image) -> Optional[Dict]:
+        """Provider-shaped attributes for an upright RGB photo, None if it is unusable"""
+        start = time.perf_counter()
+        try:
+            small = image.convert("RGB")
+            small.thumbnail((ANALYSIS_SIDE, ANALYSIS_SIDE), Image.BILINEAR)
+            rgb = np.asarray(small, dtype=np.float32)
+            if min(rgb.shape[:2]) < 8:
+                return None
+
+            lab = rgb_to_lab(rgb)
+            mask = self._foreground_mask(lab)
+            palette = self._palette(rgb[mask], lab[mask])
+            pattern, pattern_stats = self._pattern(lab[..., 0] / 100.0, mask, palette)
+            hints = self._category_hints(mask)
+        except Exception as e:
+            print(f"⚠️  Local detection failed: {e}")
+            return None
+
+        color = palette[0]["name"] if palette else ""
+        category = hints[0]["category"] if hints else "Tops"
+        name_parts = [color.title(), pattern.title() if pattern != "solid" else "", CATEGORY_NOUNS[category]]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"🔎 Local detection: {color or '?'} {pattern} {category} ({elapsed_ms:.1f} ms)")
+
+        return {
+            "item_name": " ".join(part for part in name_parts if part),
+            "category": category,
+            "sub_category": "",
+            "fabric": "",
+            "color": color,
+            "pattern": pattern,
+            "style": "casual",
+            "season": "all-season",
+            "gender": "unisex",
+            "occasions": ["casual"],
+            "palette": palette,
+            "category_hints": hints,
+            "pattern_stats": pattern_stats,
+            "elapsed_ms": round(elapsed_ms, 1)
+        }
+
+
+local_vision_service = LocalVisionService()
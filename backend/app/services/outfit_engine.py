@@ -0,0 +1,327 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.color_service import color_service
+from app.services.wardrobe_selection_service import (
+    LIGHT_FABRICS, SEASONS, WARM_FABRICS, SelectionContext, formality_of, seasons_of, wardrobe_selection_service,
+    words
+)
+
+settings = get_settings()
+
+# ========================================
+# COMPOSITION RULES
+# ========================================
+
+# (slot, optional) in the order the beam fills them
+TEMPLATES = [
+    [("top", False), ("bottom", False), ("shoes", False), ("outerwear", True), ("accessory", True)],
+    [("one-piece", False), ("shoes", False), ("outerwear", True), ("accessory", True)],
+]
+
+# Slots that make an outfit different from another; accessories don't count
+CORE_SLOTS = {"top", "bottom", "one-piece", "shoes", "outerwear"}
+
+# Share of the outfit score from item relevance vs pairwise compatibility
+RELEVANCE_WEIGHT = 0.5
+# Pairwise compatibility mix
+COLOR_WEIGHT, FORMALITY_WEIGHT, SEASON_WEIGHT = 0.5, 0.3, 0.2
+
+# Outfit-level adjustments
+MISSING_PENALTY = 0.25  # per required slot the wardrobe cannot fill
+LAYER_PENALTY = 0.15  # no layer in cold or wet weather, or a layer in the heat
+
+# Largest relevance score WardrobeSelectionService.score can give; maps it to 0..1
+MAX_RELEVANCE = 9.0
+
+# Items at or under this chroma (or very dark / light) go with any color
+NEUTRAL_CHROMA = 15.0
+
+# A piece "matches the dress code" when its style is within this many levels of the event
+DRESS_CODE_TOLERANCE = 0.5
+
+
+def hue_gap(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Smallest angle between hues, in degrees (0..180)"""
+    gap = np.abs(first - second) % 360
+    return np.minimum(gap, 360 - gap)
+
+
+def piece_label(item: Dict) -> str:
+    """"navy shirt" for explanations; the category, then the name, when the type is empty"""
+    kind = item.get("type") or (item.get("category") if item.get("category") != "General" else None)
+    if not kind:
+        return item.get("name") or "piece"
+    return " ".join(part for part in (item.get("color"), kind) if part)
+
+
+class OutfitEngine:
+    """
+    Builds complete outfits locally: top + bottom + shoes, or a one-piece +
+    shoes, each optionally layered with outerwear and an accessory.
+
+    The few most relevant items per slot (ranked by WardrobeSelectionService)
+    form the candidate pool. Pairwise color harmony, dress-code agreement and
+    season overlap are computed once as NumPy matrices over the pool, and a
+    beam search fills the slots keeping the best partial outfits at each step.
+    Results are deterministic for the same wardrobe and context.
+    """
+
+    def __init__(self, candidates_per_slot: int = settings.OUTFIT_ENGINE_CANDIDATES_PER_SLOT,
+                 beam_width: int = settings.OUTFIT_ENGINE_BEAM_WIDTH):
+        self.candidates_per_slot = candidates_per_slot
+        self.beam_width = beam_width
+
+    # ========================================
+    # FEATURES
+    # ========================================
+
+    def _features(self, pool: List[Dict]) -> Dict[str, np.ndarray]:
+        n = len(pool)
+        level = np.full(n, np.nan)
+        seasons = np.ones((n, len(SEASONS)), dtype=bool)
+        lab = np.full((n, 3), np.nan)
+        patterned = np.zeros(n, dtype=bool)
+        for i, item in enumerate(pool):
+            found = formality_of(item.get("style"))
+            if found is not None:
+                level[i] = found
+            named = seasons_of(item.get("season"))
+            if named:
+                seasons[i] = [season in named for season in SEASONS]
+            match = color_service.normalize(item.get("color") or "")
+            if match:
+                lab[i] = match.lab
+            patterned[i] = (item.get("pattern") or "solid").lower() not in ("solid", "plain", "")
+        return {"level": level, "seasons": seasons, "lab": lab, "patterned": patterned}
+
+    def _compatibility(self, features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """(pairwise score matrix, its component matrices), all in 0..1"""
+        level = features["level"]
+        formality = 1 - np.abs(level[:, None] - level[None, :]) / 3
+        formality = np.where(np.isnan(formality), 0.6, np.clip(formality, 0, 1))
+
+        overlap = (features["seasons"][:, None, :] & features["seasons"][None, :, :]).any(axis=2)
+        season = np.where(overlap, 1.0, 0.2)
+
+        L, a, b = features["lab"].T
+        known = ~np.isnan(L)
+        chroma = np.hypot(a, b)
+        hue = np.degrees(np.arctan2(b, a))
+        neutral = known & ((chroma <= NEUTRAL_CHROMA) | (L < 20) | (L > 92))
+        gap = hue_gap(hue[:, None], hue[None, :])
+        color = np.select(
+            [gap < 25, gap < 60, gap > 150, gap > 100],
+            [0.85, 0.75, 0.9, 0.7],  # tonal, analogous, complementary, split-complementary
+            default=0.45
+        )
+        color = np.where(neutral[:, None] | neutral[None, :], 1.0, color)
+        color = np.where(known[:, None] & known[None, :], color, 0.6)
+        color = np.where(features["patterned"][:, None] & features["patterned"][None, :], color * 0.6, color)
+
+        pair = COLOR_WEIGHT * color + FORMALITY_WEIGHT * formality + SEASON_WEIGHT * season
+        np.fill_diagonal(pair, 0)
+        return pair, {"color": color, "formality": formality, "season": season}
+
+    # ========================================
+    # SEARCH
+    # ========================================
+
+    def _beam(self, template, pool: Dict, context: SelectionContext) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(member matrix with -1 for empty slots, adjusted scores, required slots nobody fills) of the final beam"""
+        slots, relevance, pair = pool["slots"], pool["relevance"], pool["pair"]
+        skip_layer, take_layer = self._layer_penalties(context)
+        n = len(relevance)
+        # Row/column n is the "empty slot" sentinel that adds nothing
+        pair_ext = np.zeros((n + 1, n + 1))
+        pair_ext[:n, :n] = pair
+
+        members = np.empty((1, 0), dtype=int)
+        rel_sum = np.zeros(1)
+        pair_sum = np.zeros(1)
+        count = np.zeros(1)
+        adjust = np.zeros(1)  # weather-layer penalties so far
+        missing = []
+
+        for slot, optional in template:
+            candidates = slots.get(slot)
+            if candidates is None or not len(candidates):
+                if not optional:
+                    missing.append(slot)
+                continue
+
+            lookup = np.where(members < 0, n, members)
+            added_pairs = pair_ext[lookup][:, :, candidates].sum(axis=1)  # (beams, candidates)
+            new_rel = (rel_sum[:, None] + relevance[candidates][None, :]).ravel()
+            new_pair = (pair_sum[:, None] + added_pairs).ravel()
+            new_count = np.repeat(count + 1, len(candidates))
+            new_adjust = np.repeat(adjust - (take_layer if slot == "outerwear" else 0), len(candidates))
+            new_members = np.hstack([np.repeat(members, len(candidates), axis=0),
+                                     np.tile(candidates, len(members))[:, None]])
+
+            if optional:
+                new_rel = np.concatenate([rel_sum, new_rel])
+                new_pair = np.concatenate([pair_sum, new_pair])
+                new_count = np.concatenate([count, new_count])
+                new_adjust = np.concatenate([adjust - (skip_layer if slot == "outerwear" else 0), new_adjust])
+                new_members = np.vstack([np.hstack([members, np.full((len(members), 1), -1)]), new_members])
+
+            scores = self._score(new_rel, new_pair, new_count) + new_adjust
+            keep = np.argsort(-scores, kind="stable")[:self.beam_width]
+            members, rel_sum, pair_sum = new_members[keep], new_rel[keep], new_pair[keep]
+            count, adjust = new_count[keep], new_adjust[keep]
+
+        return members, self._score(rel_sum, pair_sum, count) + adjust - MISSING_PENALTY * len(missing), missing
+
+    @staticmethod
+    def _score(rel_sum: np.ndarray, pair_sum: np.ndarray, count: np.ndarray) -> np.ndarray:
+        pairs = count * (count - 1) / 2
+        relevance = np.divide(rel_sum, count, out=np.zeros_like(rel_sum), where=count > 0)
+        compatibility = np.divide(pair_sum, pairs, out=np.ones_like(pair_sum), where=pairs > 0)
+        return RELEVANCE_WEIGHT * relevance + (1 - RELEVANCE_WEIGHT) * compatibility
+
+    # ========================================
+    # PUBLIC API
+    # ========================================
+
+    def _pool(self, items: List[Dict], context: SelectionContext) -> Optional[Dict]:
+        """Candidate items per slot with their relevance and pairwise compatibility; None if nothing fits"""
+        limits = {slot: self.candidates_per_slot for slot in CORE_SLOTS | {"accessory"}}
+        selection = wardrobe_selection_service.select(items, context, limits)
+        pool = [item for slot_items in selection.values() for item in slot_items]
+        if not pool:
+            return None
+
+        slots: Dict[str, np.ndarray] = {}
+        pool_slots: List[str] = []
+        for slot, slot_items in selection.items():
+            slots[slot] = np.arange(len(pool_slots), len(pool_slots) + len(slot_items))
+            pool_slots += [slot] * len(slot_items)
+
+        relevance = np.array([wardrobe_selection_service.score(item, context) for item in pool]) / MAX_RELEVANCE
+        pair, components = self._compatibility(self._features(pool))
+        return {"items": pool, "item_slots": pool_slots, "slots": slots, "relevance": relevance,
+                "pair": pair, "components": components}
+
+    @staticmethod
+    def _layer_penalties(context: SelectionContext) -> Tuple[float, float]:
+        """(penalty for leaving out outerwear, penalty for wearing it) in this weather"""
+        layer_needed = context.rainy or (context.temperature is not None and context.temperature <= 16)
+        too_hot = context.temperature is not None and context.temperature >= 26 and not context.rainy
+        return (LAYER_PENALTY if layer_needed else 0.0), (LAYER_PENALTY if too_hot else 0.0)
+
+    def suggest(self, items: List[Dict], context: SelectionContext, top_n: int = 3) -> List[Dict]:
+        """
+        The `top_n` best distinct outfits, best first. Each has its items (with
+        their slot), required slots the wardrobe could not fill, the score and
+        its breakdown - enough to render or narrate without another lookup.
+        """
+        pool = self._pool(items, context)
+        if pool is None:
+            return []
+
+        candidates = []
+        for template in TEMPLATES:
+            members, scores, missing = self._beam(template, pool, context)
+            if any(slot != "shoes" for slot in missing):
+                continue  # the wardrobe has no garment for this composition; shoes may be listed as missing
+            for row, score in zip(members, scores):
+                chosen = [int(index) for index in row if index >= 0]
+                if len(chosen) >= 2:
+                    candidates.append((float(score), chosen, missing))
+
+        candidates.sort(key=lambda candidate: -candidate[0])
+        picked = self._diverse(candidates, pool["item_slots"], top_n)
+        return [self._describe(score, chosen, missing, pool) for score, chosen, missing in picked]
+
+    def _diverse(self, candidates, pool_slots: List[str], top_n: int):
+        """Best outfits that each change at least two core pieces; topped up with the next best if too few"""
+        picked, cores = [], []
+        for candidate in candidates:
+            core = {i for i in candidate[1] if pool_slots[i] in CORE_SLOTS}
+            if all(len(core - other) >= min(2, len(core)) for other in cores):
+                picked.append(candidate)
+                cores.append(core)
+            if len(picked) == top_n:
+                return picked
+        for candidate in candidates:
+            if len(picked) == top_n:
+                break
+            if candidate not in picked:
+                picked.append(candidate)
+        return picked
+
+    def _describe(self, score: float, chosen: List[int], missing: List[str], pool: Dict) -> Dict:
+        index = np.array(chosen)
+        upper = np.triu_indices(len(index), k=1)
+        items, components = pool["items"], pool["components"]
+
+        def pair_mean(matrix):
+            return round(float(matrix[np.ix_(index, index)][upper].mean()), 3) if len(index) > 1 else None
+
+        return {
+            "items": [{
+                "id": items[i].get("id"),
+                "name": items[i].get("name"),
+                "type": items[i].get("type"),
+                "color": items[i].get("color"),
+                "style": items[i].get("style"),
+                "fabric": items[i].get("fabric"),
+                "slot": pool["item_slots"][i],
+            } for i in chosen],
+            "missing": missing,
+            "score": round(score, 3),
+            "breakdown": {
+                "relevance": round(float(pool["relevance"][index].mean()), 3),
+                "color": pair_mean(components["color"]),
+                "formality": pair_mean(components["formality"]),
+                "season": pair_mean(components["season"]),
+            }
+        }
+
+    def explain(self, outfit: Dict, context: SelectionContext, event_type: str = "") -> str:
+        """A plain "why this works" from the score breakdown, used when no model narrates"""
+        items = outfit["items"]
+        breakdown = outfit["breakdown"]
+        names = [item["name"] for item in items if item["slot"] != "accessory"]
+        sentences = []
+
+        neutrals = []
+        for item in items:
+            match = color_service.normalize(item.get("color") or "")
+            if match and (math.hypot(match.lab[1], match.lab[2]) <= NEUTRAL_CHROMA
+                          or match.lab[0] < 20 or match.lab[0] > 92):
+                neutrals.append(item)
+        if (breakdown["color"] or 0) >= 0.85 and neutrals and len(neutrals) < len(items):
+            accent = next(item for item in items if item not in neutrals)
+            sentences.append(f"A neutral base ({piece_label(neutrals[0])}) lets the "
+                             f"{piece_label(accent)} stand out.")
+        elif (breakdown["color"] or 0) >= 0.85:
+            sentences.append(f"The colors of the {' and '.join(names[:2])} sit well together.")
+
+        # Each piece against the event's dress code, not just against each other
+        levels = [formality_of(item.get("style")) for item in items if item["slot"] != "accessory"]
+        if context.formality is not None and levels and all(
+            level is not None and abs(level - context.formality) <= DRESS_CODE_TOLERANCE for level in levels
+        ):
+            event = event_type.replace("_", " ") or "the occasion"
+            sentences.append(f"Every piece matches the dress code for {event}.")
+
+        if context.temperature is not None:
+            fabrics = " ".join(words([item.get("fabric") for item in items]))
+            if context.temperature >= 26 and any(fabric in fabrics for fabric in LIGHT_FABRICS):
+                sentences.append(f"Breathable fabrics keep it comfortable at {context.temperature:g}°C.")
+            elif context.temperature <= 16 and any(fabric in fabrics for fabric in WARM_FABRICS):
+                sentences.append(f"Warm fabrics suit {context.temperature:g}°C.")
+        if any(item["slot"] == "outerwear" for item in items) and context.rainy:
+            sentences.append("The outer layer covers you if it rains.")
+
+        if not sentences:
+            sentences.append(f"A balanced combination built around the {names[0] if names else 'key piece'}.")
+        return " ".join(sentences)
+
+
+outfit_engine = OutfitEngine()
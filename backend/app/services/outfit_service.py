@@ -1,237 +1,178 @@
-import os
-import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import google.generativeai as genai
-from app.config import get_settings
-
-settings = get_settings()
-
-class OutfitSuggestionService:
-    def __init__(self):
-        # Configure Gemini (more reliable than Groq for this use case)
-        api_key = settings.GEMINI_API_KEY
-        if api_key and api_key != "YOUR_GEMINI_API_KEY_HERE":
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            print("✅ Gemini AI initialized for outfit suggestions")
-        else:
-            self.model = None
-            print("⚠️ Gemini API not configured")
-    
-    def generate_outfit_suggestions(
-        self,
-        event_type: str,
-        event_date: str,
-        event_time: str,
-        formality: str,
-        city: str,
-        country: str,
-        wardrobe_items: List[Dict],
-        weather: Dict,
-        user_preferences: Dict,
-        avoid_days: int = 7
-    ) -> str:
-        """
-        Generate beautiful outfit suggestions with NO JSON output
-        Returns formatted text for UI display
-        """
-        
-        if not self.model:
-            return self._fallback_response()
-        
-        # Filter out recently worn items
-        available_items = self._filter_recent_items(wardrobe_items, avoid_days)
-        
-        if len(available_items) < 3:
-            return "❌ You need at least 3 items in your wardrobe to get outfit suggestions. Please add more items first! 🛍️"
-        
-        # Build the prompt
-        prompt = self._build_beautiful_prompt(
-            event_type, event_date, event_time, formality,
-            city, country, available_items, weather, user_preferences, avoid_days
-        )
-        
-        try:
-            print(f"\n{'='*80}")
-            print(f"🎨 Generating outfit suggestions with Gemini AI")
-            print(f"{'='*80}")
-            
-            response = self.model.generate_content(prompt)
-            result = response.text.strip()
-            
-            print(f"✅ Generated outfit suggestions successfully")
-            print(f"{'='*80}\n")
-            
-            return result
-            
-        except Exception as e:
-            print(f"❌ Error generating suggestions: {e}")
-            return self._fallback_response()
-    
-    def _filter_recent_items(self, items: List[Dict], avoid_days: int) -> List[Dict]:
-        """Filter out items worn within avoid_days"""
-        cutoff_date = datetime.now() - timedelta(days=avoid_days)
-        
-        filtered = []
-        for item in items:
-            if not item.get('last_worn'):
-                filtered.append(item)
-            else:
-                try:
-                    last_worn = datetime.fromisoformat(item['last_worn'].replace('Z', '+00:00'))
-                    if last_worn < cutoff_date:
-                        filtered.append(item)
-                except:
-                    filtered.append(item)
-        
-        return filtered if filtered else items  # Return all if nothing available
-    
-    def _build_beautiful_prompt(
-        self, event_type, event_date, event_time, formality,
-        city, country, items, weather, preferences, avoid_days
-    ) -> str:
-        """Build prompt for beautiful UI-friendly output"""
-        
-        # Format wardrobe items
-        wardrobe_text = "\n".join([
-            f"- {item['name']} (ID: {item['id']}, Type: {item['type']}, Color: {item['color']}, "
-            f"Pattern: {item['pattern']}, Style: {item['style']}, Fabric: {item.get('fabric', 'unknown')}, "
-            f"Season: {item['season']}, Gender: {item['gender']}, Worn: {item['wear_count']} times)"
-            for item in items[:50]  # Limit to prevent token overflow
-        ])
-        
-        prompt = f"""You are a world-class fashion stylist AI. Create THREE stunning outfit suggestions for a user's upcoming event.
-
-## EVENT DETAILS
-📅 Event Type: {event_type.upper()}
-🗓️ Date: {event_date}
-⏰ Time: {event_time}
-🎩 Formality: {formality}
-📍 Location: {city}, {country}
-
-## WEATHER CONDITIONS
-🌡️ Temperature: {weather.get('temperature_celsius', 25)}°C (feels like {weather.get('feels_like', 28)}°C)
-☁️ Condition: {weather.get('condition', 'partly cloudy')}
-💧 Humidity: {weather.get('humidity_percent', 70)}%
-🌧️ Rain Chance: {weather.get('rain_probability', 20)}%
-🌅 Season: {weather.get('season', 'summer')}
-☀️ UV Index: {weather.get('uv_index', 5)}
-
-## USER'S WARDROBE (Available Items)
-{wardrobe_text}
-
-## USER STYLE PREFERENCES
-- Preferred Colors: {', '.join(preferences.get('preferred_colors', ['any color']))}
-- Disliked Colors: {', '.join(preferences.get('disliked_colors', ['none']))}
-- Style Profile: {preferences.get('style_profile', 'casual')}
-- Body Shape: {preferences.get('body_shape', 'average')}
-- Preferred Styles: {', '.join(preferences.get('preferred_styles', ['casual']))}
-
-## IMPORTANT RULES
-- Do NOT use items worn in the last {avoid_days} days
-- Create COMPLETE outfits (top + bottom + optional accessories/shoes)
-- Match items by color, style, and occasion
-- Consider weather appropriateness
-- Use ONLY items from the wardrobe above
-- If essential items are missing, clearly state them
-
-## OUTPUT FORMAT (CRITICAL - NO JSON!)
-
-Write your response EXACTLY like this beautiful fashion app UI:
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✨ YOUR EVENT: {event_type.upper()} ✨
-
-{event_date} at {event_time} • {city}, {country}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🌤️ WEATHER & TRENDS
-
-[Write 1-2 sentences about the weather and any relevant seasonal/fashion trends]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-💫 OUTFIT #1: [Creative Outfit Name]
-
-🎨 Visual Style: [Describe the overall look in 1 sentence]
-
-👕 OUTFIT ITEMS:
-✅ [Item Name from wardrobe] (ID: X)
-✅ [Item Name from wardrobe] (ID: Y)
-❌ MISSING: [Description of missing item, if any]
-
-💭 Why This Works:
-[2-3 sentences explaining why this outfit is perfect for the event, weather, and style]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-💫 OUTFIT #2: [Creative Outfit Name]
-
-🎨 Visual Style: [Describe the overall look in 1 sentence]
-
-👕 OUTFIT ITEMS:
-✅ [Item Name from wardrobe] (ID: X)
-✅ [Item Name from wardrobe] (ID: Y)
-❌ MISSING: [Description of missing item, if any]
-
-💭 Why This Works:
-[2-3 sentences explaining why this outfit is perfect]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-💫 OUTFIT #3: [Creative Outfit Name]
-
-🎨 Visual Style: [Describe the overall look in 1 sentence]
-
-👕 OUTFIT ITEMS:
-✅ [Item Name from wardrobe] (ID: X)
-✅ [Item Name from wardrobe] (ID: Y)
-❌ MISSING: [Description of missing item, if any]
-
-💭 Why This Works:
-[2-3 sentences explaining why this outfit is perfect]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-💡 STYLING TIPS FOR YOU
-
-• [Tip 1 based on body shape and weather]
-• [Tip 2 based on preferred colors]
-• [Tip 3 based on event type]
-• [Tip 4 based on season/weather]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-REMEMBER:
-- Keep tone warm, friendly, and stylish
-- Use emojis to make it visually appealing
-- Be specific about which wardrobe items to use (include ID numbers)
-- Clearly mark missing items with ❌
-- Make it feel like a premium fashion app experience
-- NO JSON, NO technical formatting
-- Each outfit should feel distinct and special"""
-
-        return prompt
-    
-    def _fallback_response(self) -> str:
-        """Fallback if AI is unavailable"""
-        return """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-⚠️ AI OUTFIT SUGGESTIONS TEMPORARILY UNAVAILABLE
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-We're having trouble connecting to our AI stylist right now. 
-Please try again in a few moments!
-
-In the meantime, try browsing your wardrobe and mixing:
-• A neutral top with colorful bottoms
-• Monochrome looks for elegance
-• Layering pieces for versatility
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-
-outfit_service = OutfitSuggestionService()
+import time
+from typing import Annotated, List, Dict, Optional
+from pydantic import BaseModel, Field
+from app.config import get_settings
+from app.services.ai_service import ask_json
+from app.services.groq_service import VISION_MODEL
+from app.services.llm_cache_service import CacheSite, llm_cache_service
+from app.services.outfit_engine import outfit_engine
+from app.services.wardrobe_selection_service import SelectionContext
+
+settings = get_settings()
+
+DIVIDER = "━" * 47
+
+# Dress-code scale names, index = level
+FORMALITY_NAMES = ["Athletic", "Casual", "Smart Casual", "Business Casual", "Formal", "Black Tie"]
+
+
+class OutfitNarration(BaseModel):
+    name: str
+    why: str
+
+
+class Narration(BaseModel):
+    outfits: Annotated[List[OutfitNarration], Field(min_length=1)]
+    tips: List[str] = []
+
+
+# The outfits are already picked; the model only names them and says why they work
+NARRATION_PROMPT = """You are a world-class fashion stylist. These outfits were picked from the user's wardrobe for a {event} event ({formality}); weather {temperature}°C, {condition}.
+
+{outfits}
+
+For each outfit, in the same order, write a creative name and 2-3 warm, specific sentences on why it works for the event and the weather. Then give 3 short styling tips for the day.
+Return ONLY JSON:
+{{
+    "outfits": [{{"name": "Outfit name", "why": "Why this works"}}],
+    "tips": ["styling tip"]
+}}"""
+
+NARRATION_SITE = CacheSite("outfit-narration", NARRATION_PROMPT, VISION_MODEL, settings.LLM_CACHE_TTL_OUTFIT_NARRATION)
+
+
+class OutfitSuggestionService:
+    """
+    Outfit suggestions for an event: the local OutfitEngine picks the outfits
+    in milliseconds, and the text model (when enabled) only writes their names
+    and "why this works" - with a local explanation when it is not available.
+    """
+
+    def generate_outfit_suggestions(
+        self,
+        event_type: str,
+        event_date: str,
+        event_time: str,
+        formality: str,
+        city: str,
+        country: str,
+        wardrobe_items: List[Dict],
+        weather: Dict,
+        user_preferences: Dict,
+        narrate: bool = settings.OUTFIT_NARRATION
+    ) -> Dict:
+        """
+        Pick and describe outfits.
+        Returns {"text": formatted text for UI display, "outfits": picked outfits,
+        "engine_ms": time spent picking, "narrated": whether the model wrote the text}
+        """
+
+        # Recently worn items are already left out (or ranked back in) by the caller's query
+        if len(wardrobe_items) < 3:
+            return self._message("❌ You need at least 3 items in your wardrobe to get outfit suggestions. Please add more items first! 🛍️")
+
+        context = SelectionContext.for_event(event_type, formality, weather, user_preferences)
+        start = time.perf_counter()
+        outfits = outfit_engine.suggest(wardrobe_items, context, top_n=3)
+        engine_ms = (time.perf_counter() - start) * 1000
+        print(f"🧩 Outfit engine: {len(outfits)} outfits from {len(wardrobe_items)} items in {engine_ms:.1f} ms")
+
+        if not outfits:
+            return self._message("❌ We couldn't put together a complete outfit. Add tops and bottoms, or a dress, plus shoes to your wardrobe! 🛍️")
+
+        narration = self._narrate(outfits, event_type, formality, weather) if narrate else None
+        named = narration["outfits"] if narration else []
+        for index, outfit in enumerate(outfits):
+            if index < len(named):
+                outfit["name"], outfit["why"] = named[index]["name"], named[index]["why"]
+            else:
+                outfit["name"] = self._local_name(outfit, context)
+                outfit["why"] = outfit_engine.explain(outfit, context, event_type)
+        tips = (narration or {}).get("tips") or self._local_tips(context)
+
+        return {
+            "text": self._render(event_type, event_date, event_time, city, country, weather, outfits, tips),
+            "outfits": outfits,
+            "engine_ms": round(engine_ms, 2),
+            "narrated": bool(named)
+        }
+
+    # ========================================
+    # NARRATION
+    # ========================================
+
+    def _narrate(self, outfits: List[Dict], event_type: str, formality: str, weather: Dict) -> Optional[Dict]:
+        """Names, "why this works" and tips from the text model; cached per outfit set; None if unavailable"""
+        listing = [[f"{item['name']} ({item['type']}, {item['color']})" for item in outfit["items"]]
+                   for outfit in outfits]
+        inputs = {
+            "event": event_type,
+            "formality": formality,
+            "temperature": weather.get("temperature_celsius", weather.get("temperature")),
+            "condition": weather.get("condition", weather.get("description", "")),
+            "outfits": listing
+        }
+        prompt = NARRATION_PROMPT.format(
+            event=event_type.replace("_", " "), formality=formality.replace("_", " "),
+            temperature=inputs["temperature"], condition=inputs["condition"],
+            outfits="\n".join(f"Outfit {n}: " + " + ".join(pieces) for n, pieces in enumerate(listing, 1))
+        )
+        return llm_cache_service.get_or_call(NARRATION_SITE, inputs, lambda: ask_json(prompt, Narration))
+
+    def _local_name(self, outfit: Dict, context: SelectionContext) -> str:
+        level = FORMALITY_NAMES[int(context.formality)] if context.formality is not None else "Everyday"
+        lead = next((item for item in outfit["items"] if item["slot"] in ("one-piece", "top")), outfit["items"][0])
+        return f"{level} {(lead.get('color') or '').title()} Look".replace("  ", " ")
+
+    def _local_tips(self, context: SelectionContext) -> List[str]:
+        tips = []
+        if context.rainy:
+            tips.append("Pick shoes that can handle wet pavements and keep a layer handy.")
+        if context.temperature is not None and context.temperature >= 26:
+            tips.append("Stick to breathable fabrics and lighter colors in the heat.")
+        elif context.temperature is not None and context.temperature <= 16:
+            tips.append("Layer up - you can take the outer layer off indoors.")
+        if context.formality is not None and context.formality >= 4:
+            tips.append("Keep accessories minimal and polished for a formal dress code.")
+        elif context.formality is not None and context.formality <= 1:
+            tips.append("Comfort first - relaxed fits suit a casual plan.")
+        else:
+            tips.append("One statement accessory lifts a smart look.")
+        return tips
+
+    # ========================================
+    # RENDERING
+    # ========================================
+
+    def _render(self, event_type, event_date, event_time, city, country, weather, outfits, tips) -> str:
+        """The premium-app text layout the suggestions page displays"""
+        temperature = weather.get("temperature_celsius", weather.get("temperature"))
+        condition = weather.get("condition", weather.get("description", ""))
+        lines = [
+            DIVIDER, "",
+            f"✨ YOUR EVENT: {event_type.replace('_', ' ').upper()} ✨", "",
+            f"{event_date} at {event_time} • {city}, {country}", "",
+            DIVIDER, "",
+            "🌤️ WEATHER", "",
+            f"{temperature}°C, {condition}" + (f" • Rain chance {weather['rain_probability']}%"
+                                               if weather.get("rain_probability") is not None else ""),
+            "",
+        ]
+        for number, outfit in enumerate(outfits, 1):
+            colors = ", ".join(dict.fromkeys(item["color"] for item in outfit["items"] if item.get("color")))
+            lines += [DIVIDER, "", f"💫 OUTFIT #{number}: {outfit['name']}", ""]
+            if colors:
+                lines += [f"🎨 Palette: {colors}", ""]
+            lines.append("👕 OUTFIT ITEMS:")
+            lines += [f"✅ {item['name']} (ID: {item['id']})" for item in outfit["items"]]
+            lines += [f"❌ MISSING: {slot}" for slot in outfit["missing"]]
+            lines += ["", "💭 Why This Works:", outfit["why"], ""]
+        lines += [DIVIDER, "", "💡 STYLING TIPS FOR YOU", ""]
+        lines += [f"• {tip}" for tip in tips]
+        lines += ["", DIVIDER]
+        return "\n".join(lines)
+
+    def _message(self, text: str) -> Dict:
+        return {"text": text, "outfits": [], "engine_ms": 0.0, "narrated": False}
+
+outfit_service = OutfitSuggestionService()
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, or_, select, tuple_
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.vision_cache import VisionCacheEntry
+from app.services.color_service import delta_e
+from app.services.groq_service import CLOTHING_PROMPT_VERSION
+
+settings = get_settings()
+
+# A 64-bit hash split into 4 bands: two hashes within 3 bits share at least one band
+PHASH_BANDS = 4
+MAX_PHASH_DISTANCE = PHASH_BANDS - 1
+
+# Flat, low-detail photos all hash to nearly 0 (or all ones) and would match
+# each other - they only ever get exact hits
+MIN_PHASH_BITS = 8
+
+# Run TTL/LRU eviction once every this many writes
+PRUNE_EVERY = 50
+
+
+def phash_bands(phash: int) -> list:
+    return [(phash >> (16 * band)) & 0xFFFF for band in range(PHASH_BANDS)]
+
+
+def phash_is_distinctive(phash: int) -> bool:
+    ones = bin(phash).count("1")
+    return MIN_PHASH_BITS <= ones <= 64 - MIN_PHASH_BITS
+
+
+class CachedDetection:
+    """A cache hit: the stored attributes and how the image matched"""
+
+    def __init__(self, result: Dict, match: str, distance: int = 0):
+        self.result = result
+        self.match = match  # "exact" or "perceptual"
+        self.distance = distance
+
+
+class VisionCacheService:
+    """Persistent vision-result cache with TTL expiry and LRU size cap"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.writes = 0
+
+    def _cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(days=settings.VISION_CACHE_TTL_DAYS)
+
+    def _find_similar(self, db, phash: int, color: Tuple[float, float, float], prompt_version: str,
+                      cutoff: datetime):
+        max_distance = min(settings.VISION_CACHE_PHASH_DISTANCE, MAX_PHASH_DISTANCE)
+        bands = phash_bands(phash)
+        candidates = db.scalars(select(VisionCacheEntry).where(
+            VisionCacheEntry.prompt_version == prompt_version,
+            VisionCacheEntry.created_at >= cutoff,
+            VisionCacheEntry.color_l.is_not(None),
+            or_(*[getattr(VisionCacheEntry, f"phash_band{i}") == band for i, band in enumerate(bands)])
+        )).all()
+
+        best, best_distance = None, max_distance + 1
+        for entry in candidates:
+            distance = bin(int(entry.phash, 16) ^ phash).count("1")
+            if distance >= best_distance:
+                continue
+            # Same silhouette is not enough: the garment color has to match too
+            if delta_e(color, (entry.color_l, entry.color_a, entry.color_b)) > settings.VISION_CACHE_MAX_DELTA_E:
+                continue
+            best, best_distance = entry, distance
+        return best, best_distance
+
+    def get(self, image_hash: str, phash: Optional[int] = None, color: Optional[Tuple[float, float, float]] = None,
+            prompt_version: str = CLOTHING_PROMPT_VERSION) -> Optional[CachedDetection]:
+        """Cached attributes for an image, or None. Never raises."""
+        db = self.session_factory()
+        try:
+            cutoff = self._cutoff()
+            entry, match, distance = db.get(VisionCacheEntry, (image_hash, prompt_version)), "exact", 0
+            if entry and entry.created_at < cutoff:
+                entry = None
+
+            if not entry and settings.VISION_CACHE_PERCEPTUAL and phash is not None \
+                    and color is not None and phash_is_distinctive(phash):
+                entry, distance = self._find_similar(db, phash, color, prompt_version, cutoff)
+                match = "perceptual"
+
+            if not entry:
+                return None
+
+            entry.hits += 1
+            entry.last_used_at = datetime.utcnow()
+            result = dict(entry.result)
+            db.commit()
+            print(f"⚡ Vision cache hit ({match}, {image_hash[:12]})")
+            return CachedDetection(result, match, distance)
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Vision cache read failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def put(self, image_hash: str, phash: Optional[int], result: Dict,
+            color: Optional[Tuple[float, float, float]] = None, prompt_version: str = CLOTHING_PROMPT_VERSION):
+        """Store a provider result. Failures are logged, never raised."""
+        bands = phash_bands(phash) if phash is not None else [None] * PHASH_BANDS
+        L, a, b = color if color is not None else (None, None, None)
+        now = datetime.utcnow()
+
+        db = self.session_factory()
+        try:
+            db.merge(VisionCacheEntry(
+                image_hash=image_hash,
+                prompt_version=prompt_version,
+                result=result,
+                phash=f"{phash:016x}" if phash is not None else None,
+                **{f"phash_band{i}": band for i, band in enumerate(bands)},
+                color_l=L,
+                color_a=a,
+                color_b=b,
+                hits=0,
+                created_at=now,
+                last_used_at=now
+            ))
+            db.commit()
+
+            self.writes += 1
+            if self.writes % PRUNE_EVERY == 1:
+                self.prune(db)
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Vision cache write failed: {e}")
+        finally:
+            db.close()
+
+    def prune(self, db) -> int:
+        """Drop expired entries, then the least recently used ones above the size cap"""
+        removed = db.execute(
+            delete(VisionCacheEntry).where(VisionCacheEntry.created_at < self._cutoff())
+        ).rowcount
+
+        overflow = db.scalar(select(func.count()).select_from(VisionCacheEntry)) - settings.VISION_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            oldest = select(VisionCacheEntry.image_hash, VisionCacheEntry.prompt_version).order_by(
+                VisionCacheEntry.last_used_at
+            ).limit(overflow)
+            removed += db.execute(
+                delete(VisionCacheEntry).where(
+                    tuple_(VisionCacheEntry.image_hash, VisionCacheEntry.prompt_version).in_(oldest)
+                )
+            ).rowcount
+
+        db.commit()
+        if removed:
+            print(f"🧹 Vision cache: evicted {removed} entries")
+        return removed
+
+
+vision_cache_service = VisionCacheService()
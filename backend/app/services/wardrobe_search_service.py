@@ -0,0 +1,123 @@
+import re
+from typing import Dict, List
+from sqlalchemy import text, or_, cast, String
+from sqlalchemy.orm import Session
+
+from app.models.wardrobe import WardrobeItem
+
+# Indexed columns and their bm25 weights (higher = more important)
+FTS_COLUMNS = [
+    ("name", 10.0),
+    ("description", 2.0),
+    ("brand", 4.0),
+    ("color", 6.0),
+    ("type", 6.0),
+    ("occasions", 3.0),
+]
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class WardrobeSearchService:
+    """Full-text wardrobe search on a SQLite FTS5 index, with an ILIKE fallback"""
+
+    table = "wardrobe_items_fts"
+
+    def __init__(self):
+        self.fts_enabled = False
+
+    def setup(self, engine) -> bool:
+        """Create the FTS5 table and sync triggers if the database supports them"""
+        if engine.dialect.name != "sqlite":
+            print("⚠️  Full-text search needs SQLite FTS5 - using ILIKE search")
+            self.fts_enabled = False
+            return False
+
+        columns = ", ".join(name for name, _ in FTS_COLUMNS)
+
+        try:
+            with engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": self.table}
+                ).first()
+
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                    f"{columns}, content='wardrobe_items', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                ))
+                for name, sql in self._triggers().items():
+                    # Recreate a trigger whose definition changed (e.g. an older catch-all _au)
+                    current = conn.execute(
+                        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                        {"name": name}
+                    ).scalar()
+                    if current != sql:
+                        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+                        conn.execute(text(sql))
+
+                # First run on an existing wardrobe: index the rows already there
+                if not exists:
+                    conn.execute(text(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"))
+
+            self.fts_enabled = True
+            print("✅ Full-text search ready (SQLite FTS5)")
+        except Exception as e:
+            print(f"⚠️  FTS5 unavailable ({e}) - using ILIKE search")
+            self.fts_enabled = False
+
+        return self.fts_enabled
+
+    def _triggers(self) -> Dict[str, str]:
+        """Sync triggers keeping the external-content index in step with wardrobe_items"""
+        columns = ", ".join(name for name, _ in FTS_COLUMNS)
+        new_values = ", ".join(f"new.{name}" for name, _ in FTS_COLUMNS)
+        old_values = ", ".join(f"old.{name}" for name, _ in FTS_COLUMNS)
+        remove = f"INSERT INTO {self.table}({self.table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+        add = f"INSERT INTO {self.table}(rowid, {columns}) VALUES (new.id, {new_values});"
+        return {
+            f"{self.table}_ai": f"CREATE TRIGGER {self.table}_ai AFTER INSERT ON wardrobe_items BEGIN {add} END",
+            f"{self.table}_ad": f"CREATE TRIGGER {self.table}_ad AFTER DELETE ON wardrobe_items BEGIN {remove} END",
+            # Only writes to indexed columns touch the index - not wear counters or color back-fills
+            f"{self.table}_au": f"CREATE TRIGGER {self.table}_au AFTER UPDATE OF {columns} ON wardrobe_items "
+                                f"BEGIN {remove} {add} END",
+        }
+
+    def tokenize(self, query: str) -> List[str]:
+        return TOKEN_RE.findall((query or "").lower())
+
+    def build_match_query(self, query: str) -> str:
+        """Turn free text into an FTS5 query: every term must match, as a prefix"""
+        return " ".join(f'"{token}"*' for token in self.tokenize(query))
+
+    def search_ids(self, db: Session, query: str, limit: int = 50) -> List[int]:
+        """Ids of matching items, best match first"""
+        if not self.tokenize(query):
+            return []
+
+        if self.fts_enabled:
+            weights = ", ".join(str(weight) for _, weight in FTS_COLUMNS)
+            rows = db.execute(
+                text(
+                    f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH :match "
+                    f"ORDER BY bm25({self.table}, {weights}) LIMIT :limit"
+                ),
+                {"match": self.build_match_query(query), "limit": limit}
+            )
+            return [row[0] for row in rows]
+
+        return self._search_ids_ilike(db, query, limit)
+
+    def _search_ids_ilike(self, db: Session, query: str, limit: int) -> List[int]:
+        """Unranked fallback: every term must appear in some indexed column"""
+        columns = [cast(getattr(WardrobeItem, name), String) for name, _ in FTS_COLUMNS]
+
+        q = db.query(WardrobeItem.id)
+        for token in self.tokenize(query):
+            q = q.filter(or_(*[column.ilike(f"%{token}%") for column in columns]))
+
+        return [row.id for row in q.order_by(WardrobeItem.id.desc()).limit(limit)]
+
+
+wardrobe_search_service = WardrobeSearchService()
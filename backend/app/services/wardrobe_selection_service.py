@@ -0,0 +1,359 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.services.color_service import color_service
+
+# ========================================
+# SLOTS
+# ========================================
+
+# Most relevant items kept per outfit slot when a wardrobe is sent to a model
+SLOT_LIMITS = {"top": 8, "bottom": 6, "one-piece": 4, "shoes": 4, "outerwear": 3, "accessory": 4, "other": 2}
+SLOTS = list(SLOT_LIMITS)
+
+# Word prefixes per slot, matched against the type (sub-category) then the category
+SLOT_KEYWORDS = {
+    "one-piece": ("dress", "gown", "saree", "sari", "lehenga", "anarkali", "jumpsuit", "romper", "playsuit",
+                  "dungaree", "overall"),
+    "shoes": ("footwear", "shoe", "sneaker", "boot", "heel", "sandal", "loafer", "flat", "pump", "slipper",
+              "mojari", "jutti", "kolhapuri", "trainer", "stiletto", "wedge", "mule", "brogue"),
+    "outerwear": ("outerwear", "jacket", "coat", "blazer", "cardigan", "hoodie", "shrug", "parka", "windcheater",
+                  "poncho", "cape", "gilet", "vest", "waistcoat", "nehru"),
+    "bottom": ("bottom", "jean", "trouser", "pant", "skirt", "short", "legging", "palazzo", "chino", "jogger",
+               "salwar", "dhoti", "churidar", "sharara", "culotte", "cargo", "capri"),
+    "accessory": ("accessor", "bag", "belt", "scarf", "stole", "dupatta", "watch", "jewel", "necklace", "earring",
+                  "hat", "cap", "sunglass", "tie", "bracelet", "clutch", "bangle", "ring", "purse", "tote"),
+    "top": ("top", "shirt", "tee", "blouse", "kurta", "kurti", "sweater", "sweatshirt", "tank", "polo", "crop",
+            "tunic", "camisole", "cami", "bodysuit", "pullover", "jumper", "henley"),
+}
+
+# Slots that cannot be worn together with an item of the given slot
+ANCHOR_EXCLUDES = {
+    "top": ["top", "one-piece"],
+    "bottom": ["bottom", "one-piece"],
+    "one-piece": ["top", "bottom", "one-piece"],
+    "shoes": ["shoes"],
+    "outerwear": [],
+    "accessory": [],
+    "other": [],
+}
+
+WORD_RE = re.compile(r"[a-z]+")
+
+# ========================================
+# SCORING TABLES
+# ========================================
+
+# Dress-code scale: 0 athletic ... 5 black tie; looked up for formality, event
+# types, styles and free-text requests alike
+FORMALITY_LEVELS = {
+    "athletic": 0, "sport": 0, "sporty": 0, "sports": 0, "gym": 0, "workout": 0, "activewear": 0, "lounge": 0,
+    "casual": 1, "beach": 1, "travel": 1, "streetwear": 1, "boho": 1, "everyday": 1, "outing": 1,
+    "smart_casual": 2, "smart": 2, "brunch": 2, "lunch": 2, "date": 2, "date_night": 2, "party": 2,
+    "festive": 2, "festival": 2, "dinner": 2, "chic": 2,
+    "business_casual": 3, "office": 3, "work": 3, "business": 3, "interview": 3, "ethnic": 3,
+    "traditional": 3, "meeting": 3,
+    "formal": 4, "wedding": 4, "evening": 4, "reception": 4, "ceremony": 4,
+    "black_tie": 5, "gala": 5, "tuxedo": 5,
+}
+
+SEASONS = ["spring", "summer", "fall", "winter"]
+SEASON_ALIASES = {"autumn": "fall", "monsoon": "summer", "rainy": "summer"}
+
+WARM_FABRICS = ("wool", "cashmere", "fleece", "velvet", "leather", "tweed", "corduroy", "down", "fur",
+                "flannel", "suede", "knit", "sherpa", "pashmina")
+LIGHT_FABRICS = ("linen", "chiffon", "cotton", "silk", "georgette", "rayon", "mesh", "khadi", "voile", "chambray",
+                 "modal", "crepe")
+
+# Score weights; formality dominates so a ball gown never makes a gym shortlist
+WEIGHTS = {"formality": 3.0, "occasion": 2.0, "season": 1.5, "weather": 1.5, "color": 1.0, "fresh": 0.5}
+
+
+def words(value) -> List[str]:
+    if isinstance(value, (list, tuple, set)):
+        value = " ".join(str(part) for part in value)
+    return WORD_RE.findall(str(value or "").lower())
+
+
+def text_key(value) -> str:
+    """Hashable text form of a str / list field, for the memoized parsers below"""
+    if isinstance(value, (list, tuple, set)):
+        return " ".join(str(part) for part in value)
+    return str(value or "")
+
+
+# Wardrobes reuse a small vocabulary of types, styles, seasons and fabrics, so
+# each distinct value is parsed once
+@lru_cache(maxsize=4096)
+def _slot(type_: str, sub_category: str, category: str) -> str:
+    for text in (type_, sub_category, category):
+        for word in reversed(words(text)):
+            for slot, prefixes in SLOT_KEYWORDS.items():
+                if word.startswith(prefixes):
+                    return slot
+    return "other"
+
+
+def slot_of(item: Dict) -> str:
+    """Outfit slot of an item, judged by the last (head) word of its type, then its category"""
+    return _slot(text_key(item.get("type")), text_key(item.get("sub_category")), text_key(item.get("category")))
+
+
+@lru_cache(maxsize=4096)
+def _level(text: str) -> Optional[int]:
+    tokens = words(text)
+    key = "_".join(tokens)
+    if key in FORMALITY_LEVELS:
+        return FORMALITY_LEVELS[key]
+    levels = [FORMALITY_LEVELS[f"{a}_{b}"] for a, b in zip(tokens, tokens[1:]) if f"{a}_{b}" in FORMALITY_LEVELS]
+    levels += [FORMALITY_LEVELS[token] for token in tokens if token in FORMALITY_LEVELS]
+    return max(levels) if levels else None
+
+
+def formality_of(*texts) -> Optional[float]:
+    """Dress-code level named by any of `texts` (the most formal wins); None if none is recognized"""
+    levels = [level for level in (_level(text_key(text)) for text in texts) if level is not None]
+    return float(max(levels)) if levels else None
+
+
+@lru_cache(maxsize=4096)
+def _seasons(text: str) -> tuple:
+    found = []
+    for word in words(text):
+        season = SEASON_ALIASES.get(word, word)
+        if season in SEASONS and season not in found:
+            found.append(season)
+    return tuple(found)
+
+
+def seasons_of(value) -> List[str]:
+    """Seasons named in a free-text season field; [] for all-season or unknown"""
+    return list(_seasons(text_key(value)))
+
+
+@lru_cache(maxsize=4096)
+def fabric_warmth(fabric: str) -> tuple:
+    """(is warm, is light) for a free-text fabric"""
+    text = " ".join(words(fabric))
+    return any(word in text for word in WARM_FABRICS), any(word in text for word in LIGHT_FABRICS)
+
+
+@lru_cache(maxsize=4096)
+def occasion_words(occasions: str, style: str) -> frozenset:
+    return frozenset(words(occasions)) | frozenset(words(style))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count (words plus punctuation marks) - no tokenizer dependency"""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+# ========================================
+# CONTEXT
+# ========================================
+
+class SelectionContext:
+    """What wardrobe items are being picked for"""
+
+    def __init__(self, formality: Optional[float] = None, season: Optional[str] = None,
+                 occasions: Iterable[str] = (), temperature: Optional[float] = None, rainy: bool = False,
+                 preferred_colors: Sequence[str] = (), disliked_colors: Sequence[str] = (),
+                 exclude_slots: Iterable[str] = ()):
+        self.formality = formality
+        self.season = season
+        self.occasions = set(occasions)
+        self.temperature = temperature
+        self.rainy = rainy
+        self.preferred_colors = [color for color in preferred_colors if color]
+        self.disliked_colors = [color for color in disliked_colors if color]
+        self.exclude_slots = set(exclude_slots)
+        self._color_scores: Dict[str, float] = {}
+
+    def color_score(self, color: str) -> float:
+        """+0.5 for a preferred color, -2 for a disliked one; memoized, wardrobes repeat a few colors"""
+        if color not in self._color_scores:
+            score = 0.0
+            if color and any(color_service.matches(color, liked) for liked in self.preferred_colors):
+                score += 0.5
+            if color and any(color_service.matches(color, disliked) for disliked in self.disliked_colors):
+                score -= 2.0
+            self._color_scores[color] = score
+        return self._color_scores[color]
+
+    @classmethod
+    def for_event(cls, event_type: str, formality: str = "", weather: Optional[Dict] = None,
+                  preferences: Optional[Dict] = None) -> "SelectionContext":
+        """An event with its dress code, the weather (either weather-dict shape) and style preferences"""
+        weather = weather or {}
+        preferences = preferences or {}
+        temperature = weather.get("temperature_celsius", weather.get("temperature"))
+        conditions = f"{weather.get('condition', '')} {weather.get('description', '')} {weather.get('main', '')}"
+        seasons = seasons_of(weather.get("season"))
+        level = formality_of(formality)
+        return cls(
+            formality=level if level is not None else formality_of(event_type),
+            season=seasons[0] if seasons else None,
+            occasions=words(event_type),
+            temperature=float(temperature) if isinstance(temperature, (int, float)) else None,
+            rainy=(weather.get("rain_probability") or 0) >= 50 or any(
+                word in conditions.lower() for word in ("rain", "drizzle", "storm", "snow")),
+            preferred_colors=preferences.get("preferred_colors") or [],
+            disliked_colors=preferences.get("disliked_colors") or [],
+        )
+
+    @classmethod
+    def for_request(cls, text: str) -> "SelectionContext":
+        """A free-text request such as "something for a beach wedding in winter\""""
+        seasons = seasons_of(text)
+        return cls(formality=formality_of(text), season=seasons[0] if seasons else None, occasions=words(text))
+
+    @classmethod
+    def for_item(cls, item: Dict) -> "SelectionContext":
+        """Pieces to wear with `item`: its dress code, season and occasions, other slots only"""
+        slot = slot_of(item)
+        seasons = seasons_of(item.get("season"))
+        return cls(
+            formality=formality_of(item.get("style")),
+            season=seasons[0] if seasons else None,
+            occasions=words(item.get("occasions")) + words(item.get("style")),
+            exclude_slots=ANCHOR_EXCLUDES.get(slot, [slot]),
+        )
+
+
+# ========================================
+# SELECTION
+# ========================================
+
+class SiteStats:
+    def __init__(self):
+        self.requests = 0
+        self.items_in = 0
+        self.items_sent = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def to_dict(self) -> Dict:
+        saved = self.tokens_before - self.tokens_after
+        return {
+            "requests": self.requests,
+            "items_in": self.items_in,
+            "items_sent": self.items_sent,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": saved,
+            "avg_tokens_saved": round(saved / self.requests) if self.requests else None
+        }
+
+
+class WardrobeSelectionService:
+    """
+    Pre-selects the wardrobe items worth showing a model: each item is scored
+    against the event's dress code and occasion, season, weather and color
+    preferences, and only the top few per outfit slot are kept. The shortlist
+    is encoded as one compact pipe-separated line per item, grouped by slot.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, SiteStats] = {}
+        self.lock = threading.Lock()
+
+    def score(self, item: Dict, context: SelectionContext) -> float:
+        level = formality_of(item.get("style"))
+        if context.formality is None or level is None:
+            formality = 0.5
+        else:
+            formality = max(0.0, 1 - abs(level - context.formality) / 3)
+
+        item_occasions = occasion_words(text_key(item.get("occasions")), text_key(item.get("style")))
+        occasion = 1.0 if context.occasions & item_occasions else 0.0
+
+        seasons = seasons_of(item.get("season"))
+        if context.season is None or not seasons:
+            season = 0.75
+        else:
+            gaps = [abs(SEASONS.index(s) - SEASONS.index(context.season)) for s in seasons]
+            season = max(1 - min(gap, 4 - gap) / 2 for gap in gaps)
+
+        fabric = text_key(item.get("fabric") or item.get("material"))
+        weather = 0.7
+        if context.temperature is not None and fabric:
+            warm, light = fabric_warmth(fabric)
+            if context.temperature >= 26:
+                weather = 0.0 if warm else 1.0 if light else 0.6
+            elif context.temperature <= 12:
+                weather = 1.0 if warm else 0.3 if light else 0.6
+
+        color = context.color_score(item.get("color") or "")
+
+        fresh = 1 / (1 + (item.get("wear_count") or 0))
+
+        return (WEIGHTS["formality"] * formality + WEIGHTS["occasion"] * occasion + WEIGHTS["season"] * season
+                + WEIGHTS["weather"] * weather + WEIGHTS["color"] * color + WEIGHTS["fresh"] * fresh)
+
+    def select(self, items: List[Dict], context: SelectionContext,
+               limits: Optional[Dict[str, int]] = None) -> Dict[str, List[Dict]]:
+        """Best items per slot, best first; ties keep wardrobe order"""
+        limits = dict(limits or SLOT_LIMITS)
+        if context.temperature is not None and context.temperature >= 26 and not context.rainy:
+            limits["outerwear"] = min(limits.get("outerwear", 0), 1)  # one light layer is plenty
+
+        scored: Dict[str, list] = {slot: [] for slot in limits}
+        for position, item in enumerate(items):
+            slot = slot_of(item)
+            if slot in context.exclude_slots or slot not in scored:
+                continue
+            scored[slot].append((-self.score(item, context), position, item))
+
+        return {slot: [item for *_, item in sorted(candidates)[:limits[slot]]]
+                for slot, candidates in scored.items() if candidates}
+
+    @staticmethod
+    def encode(selection: Dict[str, List[Dict]], fields: Sequence[str]) -> str:
+        """One "[slot] field|field..." header per slot, then one value line per item; empty columns are dropped"""
+        fields = [field for field in fields
+                  if any(item.get(field) not in (None, "", []) for items in selection.values() for item in items)]
+        blocks = []
+        for slot, items in selection.items():
+            lines = [f"[{slot}] {'|'.join(fields)}"]
+            for item in items:
+                values = []
+                for field in fields:
+                    value = item.get(field)
+                    if isinstance(value, (list, tuple)):
+                        value = ",".join(str(part) for part in value)
+                    value = "" if value is None else str(value).replace("|", "/").replace("\n", " ")
+                    values.append("all" if value.lower() == "all-season" else value)
+                lines.append("|".join(values))
+            blocks.append("\n".join(lines))
+        return "\n".join(blocks)
+
+    def prepare(self, site: str, items: List[Dict], context: SelectionContext, fields: Sequence[str],
+                baseline: str, limits: Optional[Dict[str, int]] = None):
+        """
+        (encoded shortlist, shortlisted items) for a prompt, recording how many
+        tokens it saves against `baseline`, the listing the site used to send
+        """
+        selection = self.select(items, context, limits)
+        text = self.encode(selection, fields)
+        shortlist = [item for slot_items in selection.values() for item in slot_items]
+
+        before, after = estimate_tokens(baseline), estimate_tokens(text)
+        with self.lock:
+            stats = self.stats.setdefault(site, SiteStats())
+            stats.requests += 1
+            stats.items_in += len(items)
+            stats.items_sent += len(shortlist)
+            stats.tokens_before += before
+            stats.tokens_after += after
+        print(f"✂️  {site}: {len(items)} → {len(shortlist)} items, ~{before} → ~{after} tokens "
+              f"(saved ~{before - after})")
+        return text, shortlist
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            return {site: stats.to_dict() for site, stats in self.stats.items()}
+
+
+wardrobe_selection_service = WardrobeSelectionService()
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, delete, insert, or_, select, update
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.analytics import WearLog
+from app.models.wardrobe import WardrobeItem
+
+settings = get_settings()
+
+items_table = WardrobeItem.__table__
+
+# One row per worn item per flush: add the flush's wears, move last_worn forward only
+# (a wear logged for an earlier day must not hide a later one)
+ITEM_COUNTERS = update(items_table).where(items_table.c.id == bindparam("b_id")).values(
+    wear_count=items_table.c.wear_count + bindparam("b_count"),
+    last_worn=case(
+        (or_(items_table.c.last_worn.is_(None), items_table.c.last_worn < bindparam("b_worn")), bindparam("b_worn")),
+        else_=items_table.c.last_worn
+    )
+)
+
+
+def as_utc(value: Optional[datetime]) -> datetime:
+    """Wear time in UTC; naive datetimes are taken as UTC, None means now"""
+    if value is None:
+        return datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def settle(future: Future, result: Optional[int] = None, error: Optional[BaseException] = None):
+    """Resolve a caller's future; skip it if the caller already cancelled it (client went away)"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+@dataclass
+class PendingWear:
+    """One log request: the items worn together, and the future its caller waits on"""
+    user_id: int
+    item_ids: List[int]
+    outfit_id: Optional[int]
+    worn_date: datetime
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class WearLogWriter:
+    """
+    Batching writer for wear logs. log() queues a request and returns a
+    future; one writer thread takes everything queued while its previous
+    flush was committing (optionally holding the batch open for `flush_ms`,
+    until `max_batch` wears are queued), inserts the rows and applies the
+    per-item wear_count / last_worn changes in a single transaction - one
+    commit for all those taps - and resolves their futures. A failed batch
+    is retried request by request, so only the bad request fails.
+    """
+
+    def __init__(self, session_factory=SessionLocal, flush_ms: int = settings.WEAR_LOG_FLUSH_MS,
+                 max_batch: int = settings.WEAR_LOG_MAX_BATCH):
+        self.session_factory = session_factory
+        self.flush_ms = flush_ms
+        self.max_batch = max_batch
+        self.pending: List[PendingWear] = []
+        self.queued = 0  # wears (rows) in pending
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        self.stopping = False
+        self.stats = {"flushes": 0, "requests": 0, "wears": 0, "items_updated": 0, "failed_flushes": 0,
+                      "failed_requests": 0, "flush_ms": 0.0}
+
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+
+    def start(self):
+        with self.condition:
+            if self.thread and self.thread.is_alive():
+                return
+            self.stopping = False
+            self.thread = threading.Thread(target=self._run, name="wear-log-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Write whatever is still queued, then stop the writer thread"""
+        with self.condition:
+            thread = self.thread
+            if not thread:
+                return
+            self.stopping = True
+            self.condition.notify()
+        thread.join(timeout)
+        self.thread = None
+
+    # ========================================
+    # LOGGING
+    # ========================================
+
+    def log(self, user_id: int, item_ids: List[int], worn_date: Optional[datetime] = None,
+            outfit_id: Optional[int] = None) -> Future:
+        """Queue wears of `item_ids`; the future resolves to the number written once committed"""
+        wear = PendingWear(user_id, list(item_ids), outfit_id, as_utc(worn_date))
+        with self.condition:
+            if not self.thread or not self.thread.is_alive():
+                self.start()
+            self.pending.append(wear)
+            self.queued += len(wear.item_ids)
+            self.condition.notify()
+        return wear.future
+
+    async def log_async(self, user_id: int, item_ids: List[int], worn_date: Optional[datetime] = None,
+                        outfit_id: Optional[int] = None) -> int:
+        return await asyncio.wrap_future(self.log(user_id, item_ids, worn_date, outfit_id))
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                # Keep the batch open for later taps until it is full or the oldest has waited long enough
+                deadline = self.pending[0].queued_at + self.flush_ms / 1000
+                while self.queued < self.max_batch and not self.stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch, self.pending, self.queued = self.pending, [], 0
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # Never leave callers waiting, and keep the thread alive for the next batch
+                print(f"❌ Wear log writer error: {e}")
+                for wear in batch:
+                    settle(wear.future, error=e)
+
+    def _write(self, batch: List[PendingWear]) -> Tuple[int, int]:
+        """Insert the batch's rows and counter changes in one transaction -> (wears, items updated)"""
+        rows = [
+            {"user_id": wear.user_id, "item_id": item_id, "outfit_id": wear.outfit_id, "worn_date": wear.worn_date}
+            for wear in batch for item_id in wear.item_ids
+        ]
+
+        # Coalesce counter changes: one UPDATE per item however many taps hit it
+        counters: Dict[int, Dict] = {}
+        for row in rows:
+            counter = counters.setdefault(row["item_id"], {"b_id": row["item_id"], "b_count": 0, "b_worn": row["worn_date"]})
+            counter["b_count"] += 1
+            counter["b_worn"] = max(counter["b_worn"], row["worn_date"])
+
+        db = self.session_factory()
+        try:
+            if rows:
+                db.execute(insert(WearLog), rows)
+                db.execute(ITEM_COUNTERS, list(counters.values()))
+                # An item deleted after its wear was queued: drop those rows rather than orphan them
+                db.execute(delete(WearLog).where(
+                    WearLog.item_id.in_(list(counters)),
+                    WearLog.item_id.not_in(select(items_table.c.id))
+                ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return len(rows), len(counters)
+
+    def _flush(self, batch: List[PendingWear]):
+        start = time.perf_counter()
+        try:
+            wears, items_updated = self._write(batch)
+        except Exception as e:
+            self.stats["failed_flushes"] += 1
+            if len(batch) > 1:
+                # One bad request must not fail the whole batch: retry them one by one
+                print(f"⚠️  Wear log flush failed ({len(batch)} requests), retrying individually: {e}")
+                for wear in batch:
+                    self._flush([wear])
+                return
+            self.stats["failed_requests"] += 1
+            print(f"❌ Wear log write failed ({len(batch[0].item_ids)} wears): {e}")
+            settle(batch[0].future, error=e)
+            return
+
+        self.stats["flushes"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["wears"] += wears
+        self.stats["items_updated"] += items_updated
+        self.stats["flush_ms"] += (time.perf_counter() - start) * 1000
+        for wear in batch:
+            settle(wear.future, len(wear.item_ids))
+
+    # ========================================
+    # METRICS
+    # ========================================
+
+    def metrics(self) -> Dict:
+        stats = dict(self.stats)
+        flushes = stats["flushes"] or 1
+        with self.condition:
+            queued = self.queued
+        return {
+            **stats,
+            "flush_ms": round(stats["flush_ms"], 2),
+            "queued": queued,
+            "requests_per_flush": round(stats["requests"] / flushes, 2),
+            "wears_per_flush": round(stats["wears"] / flushes, 2),
+            "avg_flush_ms": round(stats["flush_ms"] / flushes, 2)
+        }
+
+
+wear_log_writer = WearLogWriter()
@@ -0,0 +1,193 @@
+"""
+Memory cost of handing an image to a vision provider.
+
+"before" replays the old hand-off: base64-encode the bytes, decode them again
+and pass a PIL image to Gemini (which the SDK re-encodes as lossless WebP);
+for the outfit analyzer, read the file, base64 it into a str and let
+the HTTP client json-encode the whole payload. "after" is the current code path.
+
+Provider calls are replaced by the SDK's own request conversion (Gemini) and
+by preparing - not sending - the HTTP request (GROQ), so every copy the
+client libraries make is still counted. Each measurement runs in a fresh
+process, and peak RSS is the request's high-water mark over the resident
+size before it (Linux: /proc/self/clear_refs resets VmHWM after warm-up).
+
+    cd backend
+    python -m benchmarks.bench_analysis_memory --megapixels 12
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+MODES = ["detect-before", "detect-after", "outfit-before", "outfit-after"]
+
+CANNED_DETECTION = {
+    "item_name": "Navy Cotton Shirt", "category": "Tops", "sub_category": "shirt",
+    "fabric": "cotton", "color": "navy blue", "pattern": "solid", "style": "casual",
+    "season": "all-season", "gender": "male", "occasions": ["casual", "office"]
+}
+CANNED_OUTFIT = {"choices": [{"message": {"content": '[{"type": "shirt", "color": "white", "description": "linen shirt"}]'}}]}
+
+
+def make_photo(path: str, megapixels: float, fmt: str):
+    """A noisy, camera-like photo (noise keeps the encoded size realistic)"""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([(x / width) * 180, (y / height) * 120, np.full_like(x, 90, dtype=float)], axis=-1)
+    pixels = np.clip(base + rng.normal(0, 18, base.shape), 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, fmt, **({"quality": 95} if fmt == "JPEG" else {}))
+
+
+class FakeVisionModel:
+    """Runs the SDK's request conversion and serialization, then answers"""
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        from google.generativeai import protos
+        from google.generativeai.types import content_types
+
+        for content in content_types.to_contents(contents):
+            protos.Content.serialize(content)
+        response = SimpleNamespace(text=json.dumps(CANNED_DETECTION))
+        return [response] if stream else response
+
+
+class PreparedOnly:
+    """Stands in for http_client.post: builds the request body, sends nothing"""
+
+    def __call__(self, url, headers=None, json=None, content=None, timeout=None):
+        import httpx
+        httpx.Request("POST", url, headers=headers, json=json, content=content)
+        return SimpleNamespace(status_code=200, json=lambda: CANNED_OUTFIT, text="")
+
+
+def memory_kb(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field} not in /proc/self/status")
+
+
+def reset_peak_rss():
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+
+def run_mode(mode: str, path: str) -> dict:
+    from app.services import groq_service as groq_module
+    from app.services import image_analysis_service as analysis_module
+    from app.services.image_service import ImageService
+    from app.services.image_store import ImageStore
+
+    groq = groq_module.groq_service
+    groq.vision_model = FakeVisionModel()
+    analysis_module.http_client.post = PreparedOnly()
+    analyzer = analysis_module.ImageAnalysisService()
+    analyzer.api_key = "bench-key-not-used-for-anything"
+    images = ImageService(ImageStore(Path(tempfile.mkdtemp())))
+
+    def detect_before(image_bytes: bytes):
+        master = images.ingest(image_bytes).master_bytes
+        image_base64 = base64.b64encode(master).decode("utf-8")
+        image = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+        groq.vision_model.generate_content(["prompt", image])
+
+    def detect_after(image_bytes: bytes):
+        groq.detect_clothing_from_image(images.ingest(image_bytes).master_bytes)
+
+    def outfit_before(image_path: str):
+        with open(image_path, "rb") as image_file:
+            base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+        payload = {"model": analyzer.model_id, "messages": [{"role": "user", "content": [
+            {"type": "text", "text": "prompt"},
+            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}"}}
+        ]}]}
+        analysis_module.http_client.post(analyzer.api_url, headers={}, json=payload, timeout=30)
+
+    def outfit_after(image_path: str):
+        analyzer.analyze_outfit_image(image_path, "male")
+
+    if mode.startswith("detect"):
+        action = detect_before if mode == "detect-before" else detect_after
+        with open(path, "rb") as f:
+            request_input = f.read()  # what `await file.read()` hands the route
+        warm_up = io.BytesIO()
+        Image.new("RGB", (64, 48), (10, 20, 90)).save(warm_up, "JPEG")
+        warm_up_input = warm_up.getvalue()
+    else:
+        action = outfit_before if mode == "outfit-before" else outfit_after
+        request_input = path
+        warm_up_input = os.path.join(tempfile.mkdtemp(), "warm.png")
+        Image.new("RGB", (64, 48), (10, 20, 90)).save(warm_up_input)
+
+    # Load codecs and client libraries before the baseline is taken
+    action(warm_up_input)
+
+    reset_peak_rss()
+    baseline = memory_kb("VmRSS")
+    tracemalloc.start()
+    start = time.perf_counter()
+    action(request_input)
+    elapsed = time.perf_counter() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak = memory_kb("VmHWM")
+
+    return {
+        "rss_mb": (peak - baseline) / 1024,
+        "python_mb": python_peak / 2 ** 20,
+        "ms": elapsed * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megapixels", type=float, default=12.0, help="size of the uploaded photo")
+    parser.add_argument("--outfit-megapixels", type=float, default=1.0, help="size of the generated outfit PNG")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Keep the services' start-up banners out of the JSON line
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_mode(args.child, args.path)
+        print(json.dumps(result))
+        return
+
+    tmp = tempfile.mkdtemp()
+    photo = os.path.join(tmp, "photo.jpg")
+    outfit = os.path.join(tmp, "outfit.png")
+    make_photo(photo, args.megapixels, "JPEG")
+    make_photo(outfit, args.outfit_megapixels, "PNG")
+    print(f"🧪 Upload {os.path.getsize(photo) / 2 ** 20:.1f} MB JPEG ({args.megapixels:g} MP), "
+          f"outfit {os.path.getsize(outfit) / 2 ** 20:.1f} MB PNG ({args.outfit_megapixels:g} MP)")
+    print(f"\n{'mode':<15}{'peak RSS':>12}{'py peak':>12}{'time':>11}")
+
+    for mode in MODES:
+        source = photo if mode.startswith("detect") else outfit
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_analysis_memory", "--child", mode, "--path", source],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        print(f"{mode:<15}{result['rss_mb']:>9.1f} MB{result['python_mb']:>9.1f} MB{result['ms']:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
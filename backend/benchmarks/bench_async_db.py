@@ -0,0 +1,152 @@
+"""
+Load test for the async database layer: latency of wardrobe reads while
+image analyses (slow provider calls) are in flight.
+
+"before" mounts the old handler shapes - analyze-image calling the provider
+inside `async def`, listing on a sync session - next to the current async
+routes, and both are driven with the same concurrent request mix.
+
+    cd backend
+    python -m benchmarks.bench_async_db --clients 32 --provider-ms 300
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, File, UploadFile
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.database import Base, get_db
+from app.models.wardrobe import WardrobeItem
+from app.routers import wardrobe
+from app.services import groq_service as groq_module
+from app.services.image_service import image_service
+from app.services.image_store import ImageStore
+from app.services.vision_cache_service import vision_cache_service
+
+COLORS = ["navy", "black", "white", "maroon", "olive", "beige"]
+TYPES = ["shirt", "kurta", "jeans", "saree", "blazer", "chinos"]
+
+legacy = APIRouter(prefix="/legacy")
+
+
+@legacy.post("/analyze-image")
+async def legacy_analyze_image(file: UploadFile = File(...)):
+    # Old shape: the provider call blocks the event loop
+    return wardrobe.analyze_upload(await file.read())
+
+
+@legacy.get("/items")
+def legacy_get_items(db: Session = Depends(get_db)):
+    rows = db.query(wardrobe.ITEM_FIELDS["id"], wardrobe.ITEM_FIELDS["name"]).order_by(
+        WardrobeItem.id.desc()
+    ).limit(50).all()
+    return [{"id": row.id, "name": row.name} for row in rows]
+
+
+def build_app(path: str) -> FastAPI:
+    # Rebind the session factories rather than using dependency_overrides,
+    # which make FastAPI re-analyze every dependency on each request
+    database.SessionLocal = sessionmaker(
+        bind=create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    )
+    database.AsyncSessionLocal = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False
+    )
+
+    app = FastAPI()
+    app.include_router(wardrobe.router)
+    app.include_router(legacy)
+    return app
+
+
+def seed(path: str, items: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        conn.execute(insert(WardrobeItem), [
+            {"name": f"{rng.choice(COLORS).title()} {rng.choice(TYPES).title()}", "category": "Tops",
+             "color": rng.choice(COLORS), "occasions": ["casual"]}
+            for _ in range(items)
+        ])
+    engine.dispose()
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run(app: FastAPI, prefix: str, clients: int, requests: int, analyze_every: int):
+    reads, analyses = [], []
+    image = os.urandom(32 * 1024)
+
+    async def client(client_id: int, http: httpx.AsyncClient):
+        for i in range(requests):
+            start = time.perf_counter()
+            if (client_id + i) % analyze_every == 0:
+                r = await http.post(f"{prefix}/analyze-image", files={"file": ("a.jpg", image, "image/jpeg")})
+                analyses.append((time.perf_counter() - start) * 1000)
+            else:
+                r = await http.get(f"{prefix}/items", params={"limit": 50, "fields": "id,name"})
+                reads.append((time.perf_counter() - start) * 1000)
+            r.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*[client(n, http) for n in range(clients)])
+        elapsed = time.perf_counter() - start
+    return reads, analyses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--analyze-every", type=int, default=5, help="1 in N requests is an image analysis")
+    parser.add_argument("--provider-ms", type=int, default=300, help="simulated vision provider latency")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "bench.db")
+    seed(path, args.items)
+
+    # Simulated provider and a throwaway upload directory
+    def fake_detect(image_base64):
+        time.sleep(args.provider_ms / 1000)
+        return {"item_name": "Shirt", "category": "Tops", "color": "navy"}
+
+    groq_module.groq_service.detect_clothing_from_image = fake_detect
+    image_service.store = ImageStore(Path(tmp))
+    # Every analysis should pay the provider latency, not hit the vision cache
+    vision_cache_service.get = lambda *args, **kwargs: None
+    vision_cache_service.put = lambda *args, **kwargs: None
+
+    app = build_app(path)
+    print(f"🧪 {args.clients} clients x {args.requests} requests, 1 in {args.analyze_every} "
+          f"is an analysis ({args.provider_ms} ms provider), {args.items} items")
+    print(f"\n{'mode':<8}{'read p50':>11}{'read p99':>11}{'analyze p99':>14}{'req/s':>9}")
+
+    for mode, prefix in (("before", "/legacy"), ("after", "/api/wardrobe")):
+        reads, analyses, elapsed = asyncio.run(
+            run(app, prefix, args.clients, args.requests, args.analyze_every)
+        )
+        total = len(reads) + len(analyses)
+        print(f"{mode:<8}{statistics.median(reads):>8.1f} ms{percentile(reads, 99):>8.1f} ms"
+              f"{percentile(analyses, 99):>11.1f} ms{total / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
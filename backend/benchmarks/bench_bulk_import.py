@@ -0,0 +1,90 @@
+"""
+Bulk import benchmark: throughput and peak Python memory vs. file size.
+
+    cd backend
+    python -m benchmarks.bench_bulk_import --rows 10000 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.routers.wardrobe import parse_import_row
+from app.services.bulk_import_service import BulkImportService
+
+ROW = {
+    "name": "Navy Oxford Shirt",
+    "category": "Tops",
+    "subcategory": "shirt",
+    "fabric": "cotton",
+    "color": "navy blue",
+    "style": "formal",
+    "pattern": "solid",
+    "season": "all-season",
+    "brand": "Zara",
+    "occasions": ["office", "date night"],
+}
+
+CSV_HEADER = ",".join(ROW) + "\n"
+
+
+def csv_line(i: int) -> str:
+    values = [f"{ROW['name']} {i}"] + [v if isinstance(v, str) else "|".join(v) for v in list(ROW.values())[1:]]
+    return ",".join(values) + "\n"
+
+
+async def body(rows: int, fmt: str, chunk_size: int = 64 * 1024):
+    """Generate the upload lazily, like a client streaming a large file"""
+    pending = CSV_HEADER if fmt == "csv" else ""
+    for i in range(rows):
+        pending += csv_line(i) if fmt == "csv" else json.dumps({**ROW, "name": f"{ROW['name']} {i}"}) + "\n"
+        if len(pending) >= chunk_size:
+            yield pending.encode()
+            pending = ""
+    if pending:
+        yield pending.encode()
+
+
+async def run(rows: int, fmt: str, trace: bool) -> float:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    service = BulkImportService(session_factory=sessionmaker(bind=engine))
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    async for _ in service.import_stream(body(rows, fmt), fmt, parse_import_row):
+        pass
+    elapsed = time.perf_counter() - start
+    if not trace:
+        return rows / elapsed
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"\n{'format':<7}{'rows':>9}{'rows/s':>12}{'peak mem':>15}")
+    for fmt in ("ndjson", "csv"):
+        for rows in args.rows:
+            # Separate runs: tracemalloc slows the import down several times
+            rate = asyncio.run(run(rows, fmt, trace=False))
+            peak = asyncio.run(run(rows, fmt, trace=True))
+            print(f"{fmt:<7}{rows:>9}{rate:>12.0f}{peak:>12.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time to a fallback answer while a provider is degraded, with and without the
+per-provider circuit breaker.
+
+A local upstream is switched between three modes: healthy (answers in a few
+ms), erroring (503 at once) and hanging (answers after the caller's timeout).
+The same call sequence - healthy, degraded, healthy again - runs once calling
+the upstream directly and once through a CircuitBreaker with a short open
+period so half-open probing and recovery show up in the run.
+
+    cd backend
+    python -m benchmarks.bench_circuit_breaker --mode hang --calls 40
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, http_failed
+from app.services.http_client import HttpClient
+
+
+class Upstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024
+    mode = "healthy"
+    hang_seconds = 0.0
+
+    def do_GET(self):
+        if self.mode == "hang":
+            time.sleep(self.hang_seconds)
+        status = 503 if self.mode == "error" else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def phase(calls: int, call, spacing: float):
+    """Run `calls` requests: (answered by upstream, fallbacks, mean ms, worst ms)"""
+    answered, timings = 0, []
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            answered += call().status_code == 200
+        except (httpx.HTTPError, CircuitOpenError):
+            pass
+        timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(spacing)
+    return answered, calls - answered, sum(timings) / len(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["hang", "error"], default="hang", help="how the provider degrades")
+    parser.add_argument("--calls", type=int, default=40, help="calls per phase")
+    parser.add_argument("--timeout", type=float, default=1.0, help="caller's read timeout, seconds")
+    parser.add_argument("--open-seconds", type=float, default=2.0)
+    parser.add_argument("--spacing-ms", type=float, default=50.0, help="gap between calls")
+    args = parser.parse_args()
+
+    Upstream.hang_seconds = args.timeout * 1.5
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/generate"
+    client = HttpClient()
+    breaker = CircuitBreaker("bench", slow_call_seconds=args.timeout, open_seconds=args.open_seconds,
+                             base_delay=0.05, max_delay=0.2)
+
+    runs = {
+        "direct": lambda: client.get(url, timeout=args.timeout),
+        "breaker": lambda: breaker.call(client.get, url, timeout=args.timeout, failed=http_failed),
+    }
+
+    print(f"🧪 Provider degrades by: {args.mode}; {args.calls} calls per phase, "
+          f"timeout {args.timeout:g}s, circuit open {args.open_seconds:g}s\n")
+    rows = []
+    for label, call in runs.items():
+        for mode, phase_label in (("healthy", "healthy"), (args.mode, "degraded"), ("healthy", "recovered")):
+            Upstream.mode = mode
+            rows.append((label, phase_label, *phase(args.calls, call, args.spacing_ms / 1000)))
+    server.shutdown()
+
+    print(f"\n{'client':<10}{'phase':<11}{'upstream':>9}{'fallbacks':>11}{'mean':>11}{'worst':>11}")
+    for label, phase_label, answered, fallbacks, mean, worst in rows:
+        print(f"{label:<10}{phase_label:<11}{answered:>9}{fallbacks:>11}{mean:>8.0f} ms{worst:>8.0f} ms")
+
+    status = breaker.status()
+    print(f"\n📊 Breaker: {status['state']}, opened {status['opened']}x, "
+          f"short-circuited {status['short_circuited']}, retries {status['retries']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+SQLite concurrency benchmark: reader latency while writers are busy, with
+the old engine setup (rollback journal, driver defaults) vs the tuned
+pragmas from app.database (WAL, busy_timeout, cache/mmap sizing).
+
+    cd backend
+    python -m benchmarks.bench_db_concurrency --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, event, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, apply_sqlite_pragmas
+from app.models.wardrobe import WardrobeItem
+
+COLORS = ["navy", "black", "white", "maroon", "olive", "beige"]
+
+
+def make_engine(path: str, tuned: bool):
+    if tuned:
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    else:
+        # Old setup: rollback journal, sqlite3's default 5 s lock wait
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    return engine
+
+
+def rows(rng, n):
+    return [{"name": f"Item {rng.random():.6f}", "category": "Tops", "color": rng.choice(COLORS)} for _ in range(n)]
+
+
+def run(path: str, tuned: bool, readers: int, writers: int, seconds: float, hold_ms: int, batch: int):
+    engine = make_engine(path, tuned)
+    Session = sessionmaker(bind=engine)
+    stop = time.perf_counter() + seconds
+    read_ms, errors = [], {"read": 0, "write": 0}
+    write_ms = []
+    lock = threading.Lock()
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.execute(
+                        select(WardrobeItem.id, WardrobeItem.name)
+                        .where(WardrobeItem.color == rng.choice(COLORS))
+                        .order_by(WardrobeItem.id.desc()).limit(50)
+                    ).all()
+                with lock:
+                    read_ms.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                with lock:
+                    errors["read"] += 1
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.execute(insert(WardrobeItem), rows(rng, batch))
+                    # A wardrobe-wide edit (e.g. re-normalizing colors) touches most pages
+                    db.execute(
+                        update(WardrobeItem)
+                        .where(WardrobeItem.id % 4 == rng.randint(0, 3))
+                        .values(description=f"rev {rng.random():.6f}")
+                    )
+                    time.sleep(hold_ms / 1000)  # work done inside the transaction
+                    db.commit()
+                with lock:
+                    write_ms.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                with lock:
+                    errors["write"] += 1
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(100 + n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    def p99(samples):
+        ordered = sorted(samples) or [0.0]
+        return ordered[int(0.99 * (len(ordered) - 1))]
+
+    return {
+        "reads/s": len(read_ms) / seconds,
+        "read p50": statistics.median(read_ms or [0.0]),
+        "read p99": p99(read_ms),
+        "commits": len(write_ms),
+        "write p99": p99(write_ms),
+        "read errors": errors["read"],
+        "write errors": errors["write"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=500, help="rows inserted per write transaction")
+    parser.add_argument("--hold-ms", type=int, default=20, help="time each write transaction stays open")
+    args = parser.parse_args()
+
+    print(f"🧪 {args.readers} readers, {args.writers} writers ({args.batch} rows, {args.hold_ms} ms per transaction), "
+          f"{args.seconds:.0f}s per mode, {args.items} seed items")
+    print(f"\n{'mode':<8}{'reads/s':>10}{'read p50':>12}{'read p99':>12}{'commits':>9}{'write p99':>13}"
+          f"{'read err':>10}{'write err':>11}")
+
+    for mode, tuned in (("before", False), ("after", True)):
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        seed_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=seed_engine)
+        with seed_engine.begin() as conn:
+            conn.execute(insert(WardrobeItem), rows(random.Random(7), args.items))
+        seed_engine.dispose()
+
+        r = run(path, tuned, args.readers, args.writers, args.seconds, args.hold_ms, args.batch)
+        print(f"{mode:<8}{r['reads/s']:>10.0f}{r['read p50']:>9.2f} ms{r['read p99']:>9.2f} ms"
+              f"{r['commits']:>9}{r['write p99']:>10.1f} ms{r['read errors']:>10}{r['write errors']:>11}")
+
+
+if __name__ == "__main__":
+    main()
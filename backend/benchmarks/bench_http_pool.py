@@ -0,0 +1,125 @@
+"""
+Outbound HTTP: a connection per call (what `requests.get(...)` did at every
+call site; here an httpx client with keep-alive off) versus the shared
+keep-alive pool in app.services.http_client, from threads and from
+coroutines.
+
+The upstream is a local keep-alive HTTP/1.1 server that answers after a fixed
+delay, so connection set-up cost is loopback TCP only - real APIs add DNS and a
+TLS handshake (typically 50-300 ms) per new connection on top of this.
+
+    cd backend
+    python -m benchmarks.bench_http_pool --requests 200 --threads 8
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.services.http_client import HttpClient
+
+
+class Upstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024  # one write per response (no Nagle / delayed-ACK stalls)
+    delay = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with Upstream.lock:
+            Upstream.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps({"main": {"temp": 21.5}, "name": "Bench"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def report(label: str, requests: int, elapsed: float, latencies: list):
+    latencies.sort()
+    print(f"{label:<22}{requests / elapsed:>9.0f}/s{latencies[len(latencies) // 2]:>9.2f} ms"
+          f"{latencies[int(len(latencies) * 0.95)]:>9.2f} ms{Upstream.connections:>8}")
+
+
+def run(label: str, get, url: str, requests: int, threads: int):
+    Upstream.connections = 0
+    latencies = []
+
+    def call(_):
+        start = time.perf_counter()
+        get(url, params={"q": "Paris"}, timeout=10).json()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(call, range(requests)))
+    report(label, requests, time.perf_counter() - start, latencies)
+
+
+async def arun(label: str, aget, url: str, requests: int, concurrency: int):
+    Upstream.connections = 0
+    latencies = []
+    callers = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with callers:
+            start = time.perf_counter()
+            (await aget(url, params={"q": "Paris"}, timeout=10)).json()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    report(label, requests, time.perf_counter() - start, latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers (threads or coroutines)")
+    parser.add_argument("--delay-ms", type=float, default=2.0, help="upstream response time")
+    args = parser.parse_args()
+
+    Upstream.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/weather"
+
+    print(f"🧪 {args.requests} requests, {args.threads} threads, upstream {args.delay_ms:g} ms\n")
+    print(f"{'client':<22}{'throughput':>11}{'p50':>12}{'p95':>12}{'conns':>8}")
+
+    # Not httpx.get: that also builds a client (and SSL context) per call
+    unpooled = httpx.Client(limits=httpx.Limits(max_keepalive_connections=0))
+    run("connection per call", unpooled.get, url, args.requests, args.threads)
+    unpooled.close()
+    pooled = HttpClient()
+    run("shared pool", pooled.get, url, args.requests, args.threads)
+    pooled.close()
+
+    async def async_pool():
+        await arun("shared pool (async)", pooled.aget, url, args.requests, args.threads)
+        await pooled.aclose()
+
+    asyncio.run(async_pool())
+    server.shutdown()
+
+    stats = pooled.metrics()["hosts"]["127.0.0.1"]
+    print(f"\n📊 Pool metrics: {stats['new_connections']} new / {stats['reused_connections']} reused, "
+          f"p50 {stats['latency_ms']['p50']} ms, p95 {stats['latency_ms']['p95']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Correctness and speed of pulling the JSON answer out of model output: the
+shared JSONStreamExtractor against the two ad-hoc parsers it replaced
+(first "{" to last "}" sliced and json.loads'd; greedy r'\\[.*\\]' regex).
+
+A seeded fuzz corpus wraps a clothing-detection object (or an outfit list)
+the ways models actually answer: code fences, prose with braces around the
+answer, trailing commentary, an example object before the real one, escaped
+quotes and brackets inside strings, trailing commas, and truncated output
+that must yield nothing. Each document is also fed in random-sized chunks to
+check streaming gives the same answer and to count how much of the stream is
+read before the value is known.
+
+    cd backend
+    python -m benchmarks.bench_json_extract --docs 2000
+"""
+import argparse
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Annotated, List
+
+from pydantic import Field
+
+from app.services.groq_service import ClothingDetection
+from app.services.image_analysis_service import OutfitPiece
+from app.services.json_extractor import JSONStreamExtractor, extract_json
+
+OutfitPieces = Annotated[List[OutfitPiece], Field(min_length=1)]
+
+NAMES = ["Blue Denim Jacket", 'The "Weekend" Tee', "Floral Midi Dress", "Black {Slim} Chinos",
+         "Linen Shirt [Relaxed]", "Wool Coat \\ Camel"]
+COLORS = ["blue", "white", "black", "camel", "red", "green"]
+PROSE = ["Sure! Here is the analysis.", "Based on the image, I identified the following:",
+         "Note: fields in {braces} are required.", "I looked at the [front] of the garment.",
+         "Here's what I found (confidence: high)."]
+TAILS = ["Let me know if you need anything else!", "Tip: pair it with {white sneakers}.",
+         "Options: [casual, smart]. Hope this helps.", "}", ""]
+
+
+def detection(rng: random.Random) -> dict:
+    return {
+        "item_name": rng.choice(NAMES),
+        "category": "Topwear",
+        "sub_category": "Shirt",
+        "color": rng.choice(COLORS),
+        "fabric": "cotton",
+        "pattern": "solid",
+        "style": "casual",
+        "season": "summer",
+        "gender": "unisex",
+        "occasions": ["casual", "weekend"]
+    }
+
+
+def pieces(rng: random.Random) -> list:
+    return [{"type": t, "color": rng.choice(COLORS), "description": f"{rng.choice(NAMES)} [{t}]"}
+            for t in rng.sample(["top", "bottom", "shoes", "outerwear", "bag"], rng.randint(1, 4))]
+
+
+def dump(value, rng: random.Random) -> str:
+    return json.dumps(value, indent=rng.choice([None, 2]))
+
+
+def corpus(docs: int, seed: int = 0) -> list:
+    """(case, kind, text, expected) with expected None when no valid answer is present"""
+    rng = random.Random(seed)
+    cases = []
+    for n in range(docs):
+        kind = "list" if n % 3 == 2 else "object"
+        value = pieces(rng) if kind == "list" else detection(rng)
+        body = dump(value, rng)
+        case = rng.choice(["plain", "fence", "prose-braces", "trailing", "example-first",
+                           "trailing-comma", "truncated"])
+        if case == "plain":
+            text = body
+        elif case == "fence":
+            text = f"{rng.choice(PROSE)}\n```json\n{body}\n```\n{rng.choice(TAILS)}"
+        elif case == "prose-braces":
+            text = f"Use {{this}} and [that]. {rng.choice(PROSE)} {body}"
+        elif case == "trailing":
+            text = f"{body}\n\n{rng.choice(TAILS[:3])} {{\"note\": 1}}"
+        elif case == "example-first":
+            example = '{"example": "value"}' if kind == "object" else '["a", "b"]'
+            text = f"Format: {example}\nAnswer: {body}"
+        elif case == "trailing-comma":
+            text = re.sub(r'(")(\s*[}\]])', r"\1,\2", body, count=1)
+        else:
+            text = f"{rng.choice(PROSE)} {body[:rng.randint(1, len(body) - 1)]}"
+            value = None
+        cases.append((case, kind, text, value))
+    return cases
+
+
+def slice_and_load(text: str, opener: str):
+    closer = "}" if opener == "{" else "]"
+    try:
+        if opener in text and closer in text:
+            return json.loads(text[text.index(opener):text.rindex(closer) + 1])
+    except ValueError:
+        pass
+    return None
+
+
+def greedy_regex(text: str, opener: str):
+    pattern = r"\{.*\}" if opener == "{" else r"\[.*\]"
+    match = re.search(pattern, text, re.DOTALL)
+    try:
+        return json.loads(match.group()) if match else None
+    except ValueError:
+        return None
+
+
+def shared(text: str, opener: str):
+    return extract_json(text, ClothingDetection if opener == "{" else OutfitPieces, opener)
+
+
+PARSERS = {"slice + json.loads": slice_and_load, "greedy regex": greedy_regex, "JSONStreamExtractor": shared}
+
+
+def streamed(text: str, opener: str, rng: random.Random):
+    """(value, characters fed before the extractor was done)"""
+    extractor = JSONStreamExtractor(ClothingDetection if opener == "{" else OutfitPieces, opener)
+    fed, i = 0, 0
+    while i < len(text) and not extractor.done:
+        chunk = text[i:i + rng.randint(1, 24)]
+        i += len(chunk)
+        fed += len(chunk)
+        extractor.feed(chunk)
+    return extractor.finish(), fed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cases = corpus(args.docs, args.seed)
+    print(f"🧪 {len(cases)} documents, seed {args.seed}\n")
+
+    by_case = sorted({case for case, *_ in cases})
+    print(f"{'parser':<22}" + "".join(f"{case:>16}" for case in by_case) + f"{'total':>9}{'docs/s':>10}")
+    for name, parse in PARSERS.items():
+        correct = defaultdict(int)
+        totals = defaultdict(int)
+        start = time.perf_counter()
+        for case, kind, text, expected in cases:
+            totals[case] += 1
+            correct[case] += parse(text, "[" if kind == "list" else "{") == expected
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22}" + "".join(f"{correct[c]:>9}/{totals[c]:<6}" for c in by_case)
+              + f"{sum(correct.values()) / len(cases):>8.1%}{len(cases) / elapsed:>10.0f}")
+
+    rng = random.Random(args.seed)
+    agree, fed_total, text_total, early = 0, 0, 0, 0
+    for case, kind, text, expected in cases:
+        opener = "[" if kind == "list" else "{"
+        value, fed = streamed(text, opener, rng)
+        agree += value == shared(text, opener)
+        if value is not None:
+            fed_total += fed
+            text_total += len(text)
+            early += fed < len(text)
+    print(f"\n📡 Streaming in 1-24 char chunks: {agree}/{len(cases)} match the one-shot result; "
+          f"{fed_total / text_total:.1%} of the text read before the answer was known "
+          f"({early} answers complete before the stream ended)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Provider calls and latency of the AIService text prompts with and without the
+LLM response cache.
+
+The model is replaced by a stub that sleeps for --latency-ms and returns a
+canned JSON answer, so only cache behaviour is measured. The workload is a
+burst of outfit-suggestion, body-shape and comparison requests from several
+threads; request inputs repeat with a Zipf-like skew (a few popular occasions
+and outfits, a long tail), and identical requests arrive at the same time.
+
+Runs: no cache; in-memory cache; and a "restart" - a fresh in-memory cache
+over the SQLite copy the previous run left behind.
+
+    cd backend
+    python -m benchmarks.bench_llm_cache --requests 300 --threads 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.llm_cache import LLMCacheEntry
+from app.services import ai_service as ai_module
+from app.services.json_extractor import extract_json
+from app.services.llm_cache_service import LLMCacheService
+
+OCCASIONS = ["office", "date night", "wedding", "brunch", "interview", "gym", "beach", "concert",
+             "funeral", "hike", "festival", "dinner party"]
+WEATHER = [{"description": "clear sky", "temperature": 24.0}, {"description": "light rain", "temperature": 14.5}]
+ITEMS = [{"id": f"item-{i}", "type": t, "color": c, "style": "casual"}
+         for i, (t, c) in enumerate([("shirt", "white"), ("jeans", "blue"), ("sneakers", "white"),
+                                     ("blazer", "navy"), ("dress", "red"), ("loafers", "brown")])]
+
+
+class StubModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_text(self, prompt: str) -> str:
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if "outfit suggestions" in prompt:
+            return 'Here you go: [{"name": "Smart casual", "items": ["item-0", "item-1"]}]'
+        return '```json\n{"winner": "outfit1", "body_shape": "rectangle", "confidence_score": 80}\n```'
+
+    def generate_json(self, prompt: str, schema=None, expect: str = "{"):
+        return extract_json(self.generate_text(prompt), schema, expect)
+
+
+class NoCache:
+    def get_or_call(self, site, inputs, call):
+        return call()
+
+
+def workload(requests: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(OCCASIONS))]
+    calls = []
+    for _ in range(requests):
+        occasion = rng.choices(OCCASIONS, weights)[0]
+        kind = rng.random()
+        if kind < 0.6:
+            weather = rng.choice(WEATHER)
+            calls.append(lambda o=occasion, w=weather: ai_module.ai_service.generate_outfit_suggestions(
+                o, w, {"style": "minimal"}, ITEMS))
+        elif kind < 0.8:
+            bust = rng.choice([86, 90, 94])
+            calls.append(lambda b=bust: ai_module.ai_service.analyze_body_shape(
+                {"bust": b, "waist": 70, "hips": 96}))
+        else:
+            calls.append(lambda o=occasion: ai_module.ai_service.compare_outfits(ITEMS[:3], ITEMS[3:], o))
+    return calls
+
+
+def run(label: str, cache, stub: StubModel, calls: list, threads: int):
+    ai_module.llm_cache_service = cache
+    stub.calls = 0
+    latencies = []
+
+    def timed(call):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(threads) as pool:
+        list(pool.map(timed, calls))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    metrics = cache.metrics() if hasattr(cache, "metrics") else {}
+    print(f"{label:<20}{stub.calls:>8}{elapsed:>9.2f} s{latencies[len(latencies) // 2]:>9.0f} ms"
+          f"{latencies[int(len(latencies) * 0.95)]:>9.0f} ms"
+          f"{metrics.get('hit_ratio') if metrics else '-':>8}"
+          f"{(metrics.get('saved_latency_ms', 0) / 1000 if metrics else 0):>9.1f} s")
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="stubbed model latency")
+    args = parser.parse_args()
+
+    stub = StubModel(args.latency_ms / 1000)
+    ai_module.groq_service = stub
+
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp()) / 'llm_cache.db'}")
+    LLMCacheEntry.__table__.create(engine)
+    sessions = sessionmaker(bind=engine)
+
+    calls = workload(args.requests)
+    print(f"🧪 {args.requests} requests, {args.threads} threads, model {args.latency_ms:g} ms\n")
+    print(f"{'cache':<20}{'calls':>8}{'wall':>11}{'p50':>12}{'p95':>12}{'hits':>8}{'saved':>11}")
+
+    run("none", NoCache(), stub, calls, args.threads)
+    memory = run("memory + sqlite", LLMCacheService(sessions, persist=True), stub, calls, args.threads)
+    run("after restart", LLMCacheService(sessions, persist=True), stub, calls, args.threads)
+
+    print("\n📊 Per site (memory + sqlite run):")
+    print(json.dumps(memory["sites"], indent=1))
+
+
+if __name__ == "__main__":
+    main()
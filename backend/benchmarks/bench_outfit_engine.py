@@ -0,0 +1,100 @@
+"""
+Latency, throughput and search quality of the local outfit engine.
+
+Uses the synthetic wardrobes and events of bench_prompt_selection. For each
+wardrobe size the engine picks 3 outfits per event, repeatedly, and reports
+p50/p95 latency and single-thread requests per second. Search quality is the
+gap between the best outfit the beam search returns and the best one an
+exhaustive enumeration of the same candidate pool finds (8 candidates per
+slot so the enumeration stays small), plus whether repeated runs agree.
+
+The text-model narration is not part of these timings; with it enabled a
+request adds one cached text-model call.
+
+    cd backend
+    python -m benchmarks.bench_outfit_engine --sizes 50 200 1000 5000
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from app.services.outfit_engine import MISSING_PENALTY, TEMPLATES, OutfitEngine
+from app.services.wardrobe_selection_service import SelectionContext
+from benchmarks.bench_prompt_selection import EVENTS, PREFERENCES, complete_outfit, suitable, wardrobe
+
+
+def exhaustive_best(engine: OutfitEngine, items: list, context: SelectionContext) -> float:
+    pool = engine._pool(items, context)
+    best = -np.inf
+    for template in TEMPLATES:
+        choices, missing = [], []
+        for slot, optional in template:
+            candidates = list(pool["slots"].get(slot, []))
+            if not candidates:
+                if not optional:
+                    missing.append(slot)
+                continue
+            choices.append(candidates + [None] if optional else candidates)
+        if any(slot != "shoes" for slot in missing):
+            continue
+        for combo in itertools.product(*choices):
+            chosen = [int(i) for i in combo if i is not None]
+            if len(chosen) < 2:
+                continue
+            index = np.array(chosen)
+            pair_sum = pool["pair"][np.ix_(index, index)][np.triu_indices(len(index), k=1)].sum()
+            score = engine._score(np.array([pool["relevance"][index].sum()]), np.array([pair_sum]),
+                                  np.array([float(len(index))]))[0]
+            skip_layer, take_layer = engine._layer_penalties(context)
+            if "outerwear" in pool["slots"]:
+                score -= take_layer if any(pool["item_slots"][i] == "outerwear" for i in chosen) else skip_layer
+            best = max(best, score - MISSING_PENALTY * len(missing))
+    return float(best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = OutfitEngine()
+    print(f"{'items':>6}{'p50':>10}{'p95':>10}{'req/s':>9}{'complete':>10}{'suitable':>10}")
+    for size in args.sizes:
+        items = wardrobe(size, args.seed)
+        latencies, complete, suitable_share = [], 0, []
+        for event, formality, weather in EVENTS:
+            context = SelectionContext.for_event(event, formality, weather, PREFERENCES)
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                outfits = engine.suggest(items, context)
+                latencies.append((time.perf_counter() - start) * 1000)
+            for outfit in outfits:
+                picked = [next(i for i in items if i["id"] == piece["id"]) for piece in outfit["items"]]
+                complete += complete_outfit(picked, context)
+                suitable_share.append(sum(suitable(i, context) for i in picked) / len(picked))
+        latencies.sort()
+        total = len(EVENTS) * 3
+        print(f"{size:>6}{latencies[len(latencies) // 2]:>8.1f} ms{latencies[int(len(latencies) * 0.95)]:>7.1f} ms"
+              f"{1000 / np.mean(latencies):>9.0f}{complete:>6}/{total:<3}{np.mean(suitable_share):>9.0%}")
+
+    print("\n🔎 Beam search vs exhaustive enumeration (8 candidates per slot):")
+    small = OutfitEngine(candidates_per_slot=8, beam_width=engine.beam_width)
+    items = wardrobe(300, args.seed)
+    for event, formality, weather in EVENTS:
+        context = SelectionContext.for_event(event, formality, weather, PREFERENCES)
+        start = time.perf_counter()
+        best = exhaustive_best(small, items, context)
+        exhaustive_ms = (time.perf_counter() - start) * 1000
+        first, second = small.suggest(items, context), small.suggest(items, context)
+        same = [o["items"] for o in first] == [o["items"] for o in second]
+        print(f"   {event:<11} beam {first[0]['score']:.3f}  exhaustive {best:.3f}  "
+              f"gap {max(0.0, best - first[0]['score']):.3f}  ({exhaustive_ms:,.0f} ms exhaustive)  "
+              f"deterministic: {'yes' if same else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Prompt size and wardrobe relevance of AIService's outfit-suggestion prompt
+with the old listing (first 20 items in database order, as JSON) against the
+ranked per-slot shortlist.
+
+Synthetic wardrobes of several sizes mix everyday, office, party, gym and
+traditional pieces across seasons and fabrics. For a set of events each run
+reports estimated prompt tokens, how many listed items actually suit the event
+(dress code within one level, season not opposite, fabric fine for the
+temperature) and whether a complete outfit (top + bottom + shoes, or
+one-piece + shoes) suitable for the event is among the listed items.
+
+    cd backend
+    python -m benchmarks.bench_prompt_selection --sizes 20 100 500
+"""
+import argparse
+import json
+import random
+import time
+
+from app.services.ai_service import OUTFIT_SUGGESTIONS_PROMPT
+from app.services.wardrobe_selection_service import (
+    LIGHT_FABRICS, SEASONS, WARM_FABRICS, SelectionContext, estimate_tokens, formality_of, seasons_of, slot_of,
+    wardrobe_selection_service
+)
+
+CATALOG = [
+    ("Tops", "t-shirt", "casual"), ("Tops", "oxford shirt", "formal"), ("Tops", "blouse", "smart casual"),
+    ("Tops", "tank top", "athletic"), ("Tops", "sweater", "casual"), ("Tops", "crop top", "party"),
+    ("Indian Traditional", "kurta", "traditional"), ("Indian Traditional", "kurti", "ethnic"),
+    ("Bottoms", "jeans", "casual"), ("Bottoms", "tailored trousers", "formal"), ("Bottoms", "joggers", "athletic"),
+    ("Bottoms", "midi skirt", "smart casual"), ("Bottoms", "shorts", "casual"), ("Bottoms", "palazzo", "ethnic"),
+    ("Dresses", "maxi dress", "party"), ("Dresses", "sheath dress", "formal"), ("Indian Traditional", "saree", "traditional"),
+    ("Indian Traditional", "lehenga", "festive"),
+    ("Footwear", "sneakers", "casual"), ("Footwear", "running shoes", "athletic"), ("Footwear", "heels", "formal"),
+    ("Footwear", "loafers", "smart casual"), ("Footwear", "juttis", "traditional"), ("Footwear", "sandals", "casual"),
+    ("Outerwear", "blazer", "formal"), ("Outerwear", "denim jacket", "casual"), ("Outerwear", "wool coat", "formal"),
+    ("Outerwear", "hoodie", "athletic"),
+    ("Accessories", "belt", "formal"), ("Accessories", "tote bag", "casual"), ("Accessories", "silk scarf", "smart casual"),
+    ("Accessories", "statement earrings", "party"),
+]
+COLORS = ["black", "white", "navy blue", "grey", "beige", "red", "olive green", "mustard", "pink", "maroon"]
+FABRICS = ["cotton", "linen", "wool", "polyester", "silk", "denim", "leather", "chiffon", "cashmere", "georgette"]
+SEASON_VALUES = ["summer", "winter", "spring", "fall", "all-season", "all-season"]
+
+EVENTS = [
+    ("office", "business_casual", {"temperature_celsius": 28, "condition": "sunny", "season": "summer"}),
+    ("wedding", "formal", {"temperature_celsius": 12, "condition": "clear", "season": "winter"}),
+    ("gym", "casual", {"temperature_celsius": 30, "condition": "humid", "season": "summer"}),
+    ("date_night", "smart_casual", {"temperature_celsius": 18, "condition": "light rain", "season": "fall"}),
+    ("festival", "casual", {"temperature_celsius": 24, "condition": "clear", "season": "spring"}),
+]
+PREFERENCES = {"preferred_colors": ["navy blue", "black", "grey", "white"], "disliked_colors": ["mustard"]}
+# What AIService.generate_outfit_suggestions lists per item
+FIELDS = ["id", "name", "type", "color", "style", "season"]
+OLD_LIMIT = 20
+
+
+def wardrobe(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        category, kind, style = rng.choice(CATALOG)
+        color = rng.choice(COLORS)
+        items.append({
+            "id": i + 1, "name": f"{color.title()} {kind.title()}", "type": kind, "category": category,
+            "color": color, "pattern": rng.choice(["solid", "solid", "striped", "floral", "checked"]),
+            "style": style, "fabric": rng.choice(FABRICS), "season": rng.choice(SEASON_VALUES),
+            "gender": "unisex", "occasions": [], "wear_count": rng.randint(0, 30), "last_worn": None
+        })
+    return items
+
+
+def suitable(item: dict, context: SelectionContext) -> bool:
+    level = formality_of(item["style"])
+    if context.formality is not None and level is not None and abs(level - context.formality) > 1:
+        return False
+    seasons = seasons_of(item["season"])
+    if context.season and seasons and all(abs(SEASONS.index(s) - SEASONS.index(context.season)) == 2
+                                          for s in seasons):
+        return False
+    if context.temperature is not None:
+        if context.temperature >= 26 and any(f in item["fabric"] for f in WARM_FABRICS):
+            return False
+        if context.temperature <= 12 and any(f in item["fabric"] for f in LIGHT_FABRICS):
+            return False
+    return True
+
+
+def complete_outfit(items: list, context: SelectionContext) -> bool:
+    slots = {slot_of(item) for item in items if suitable(item, context)}
+    return "shoes" in slots and ({"top", "bottom"} <= slots or "one-piece" in slots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'event':<11}{'listed':>13}{'prompt tokens':>20}{'suitable':>16}"
+          f"{'complete':>14}{'select':>10}")
+    for size in args.sizes:
+        items = wardrobe(size, args.seed)
+        for event, formality, weather in EVENTS:
+            context = SelectionContext.for_event(event, formality, weather, PREFERENCES)
+
+            start = time.perf_counter()
+            selection = wardrobe_selection_service.select(items, context)
+            new_listing = wardrobe_selection_service.encode(selection, FIELDS)
+            elapsed = (time.perf_counter() - start) * 1000
+            shortlist = [item for group in selection.values() for item in group]
+            old_items = items[:OLD_LIMIT]
+
+            def prompt(listing):
+                return OUTFIT_SUGGESTIONS_PROMPT.format(
+                    occasion=event, weather=weather["condition"], temperature=weather["temperature_celsius"],
+                    preferences=json.dumps(PREFERENCES), items=listing)
+
+            old_tokens = estimate_tokens(prompt(json.dumps(old_items)))
+            new_tokens = estimate_tokens(prompt(new_listing))
+            print(f"{size:>6} {event:<11}{len(old_items):>6} → {len(shortlist):<4}"
+                  f"{old_tokens:>9} → {new_tokens:<6}"
+                  f"{sum(suitable(i, context) for i in old_items) / len(old_items):>7.0%} → "
+                  f"{sum(suitable(i, context) for i in shortlist) / len(shortlist):<5.0%}"
+                  f"{'yes' if complete_outfit(old_items, context) else 'no':>6} → "
+                  f"{'yes' if complete_outfit(shortlist, context) else 'no':<4}"
+                  f"{elapsed:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Cost of leaving recently worn items out of outfit suggestions: the old path
+(load every WardrobeItem for the gender, build the engine dicts, then parse
+`last_worn` strings in Python and drop the recent ones) against the current
+`available_items` query (indexed `last_worn` filter, column projection, ranked
+relaxation only when too few items remain).
+
+Each wardrobe size is seeded into a temporary SQLite file with a share of
+items worn inside the avoid-days window. "all recent" wears every item inside
+the window, which the old path answered by returning the whole wardrobe and
+the new one answers by adding back the least recently worn items only.
+
+    cd backend
+    python -m benchmarks.bench_recent_filter --sizes 1000 10000 50000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.wardrobe import WardrobeItem
+from app.routers.outfit import available_items, wardrobe_query
+from benchmarks.bench_prompt_selection import CATALOG, COLORS, FABRICS, SEASON_VALUES
+
+AVOID_DAYS = 7
+
+
+def seed(path: str, size: int, recent_share: float):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(size)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for _ in range(size):
+        category, kind, style = rng.choice(CATALOG)
+        recent = rng.random() < recent_share
+        worn = None
+        if recent:
+            worn = now - timedelta(days=rng.uniform(0, AVOID_DAYS - 0.5))
+        elif rng.random() < 0.6:
+            worn = now - timedelta(days=rng.uniform(AVOID_DAYS + 1, 365))
+        rows.append({
+            "name": f"{rng.choice(COLORS).title()} {kind.title()}", "category": category, "type": kind,
+            "color": rng.choice(COLORS), "style": style, "material": rng.choice(FABRICS),
+            "season": rng.choice(SEASON_VALUES), "gender": "unisex", "occasions": [], "pattern": "solid",
+            "description": "Synthetic item " * 8, "image_variants": {"thumbnails": {"sm": "/uploads/x.webp"}},
+            "wear_count": rng.randint(1, 30) if worn else 0, "last_worn": worn
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(WardrobeItem), rows)
+    engine.dispose()
+
+
+def legacy_filter(items: list, avoid_days: int) -> list:
+    # The removed OutfitSuggestionService._filter_recent_items
+    cutoff_date = datetime.now() - timedelta(days=avoid_days)
+    filtered = []
+    for item in items:
+        if not item.get('last_worn'):
+            filtered.append(item)
+        else:
+            try:
+                last_worn = datetime.fromisoformat(item['last_worn'].replace('Z', '+00:00')).replace(tzinfo=None)
+                if last_worn < cutoff_date:
+                    filtered.append(item)
+            except Exception:
+                filtered.append(item)
+    return filtered if filtered else items
+
+
+async def legacy_path(db) -> list:
+    loaded = (await db.scalars(wardrobe_query("unisex"))).all()
+    data = [
+        {"id": item.id, "name": item.name, "type": item.type, "category": item.category or "General",
+         "color": item.color, "pattern": item.pattern, "style": item.style, "fabric": item.material,
+         "season": item.season, "gender": item.gender or "unisex", "occasions": item.occasions or [],
+         "image_url": item.image_url, "wear_count": item.wear_count,
+         "last_worn": item.last_worn.isoformat() if item.last_worn else None}
+        for item in loaded
+    ]
+    return legacy_filter(data, AVOID_DAYS)
+
+
+async def current_path(db) -> list:
+    items, _ = await available_items(db, "unisex", AVOID_DAYS)
+    return items
+
+
+async def measure(path: str, runner, repeat: int) -> tuple:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    timings = []
+    for _ in range(repeat):
+        async with sessions() as db:
+            start = time.perf_counter()
+            items = await runner(db)
+            timings.append((time.perf_counter() - start) * 1000)
+    await engine.dispose()
+    return statistics.median(timings), len(items)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--recent", type=float, default=0.2, help="share of items worn inside the window")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'items':>7} {'scenario':<11}{'old p50':>11}{'new p50':>11}{'old kept':>10}{'new kept':>10}")
+    for size in args.sizes:
+        for scenario, share in (("mixed", args.recent), ("all recent", 1.0)):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.db")
+                seed(path, size, share)
+                # Index use for the filter on the current path
+                plan_engine = create_engine(f"sqlite:///{path}")
+                with plan_engine.connect() as conn:
+                    cutoff = datetime.now(timezone.utc) - timedelta(days=AVOID_DAYS)
+                    plan = conn.exec_driver_sql(
+                        "EXPLAIN QUERY PLAN " + str(select(WardrobeItem.id).where(WardrobeItem.last_worn >= cutoff)
+                                                    .compile(compile_kwargs={"literal_binds": True}))
+                    ).fetchall()
+                plan_engine.dispose()
+                old_ms, old_kept = await measure(path, legacy_path, args.repeat)
+                new_ms, new_kept = await measure(path, current_path, args.repeat)
+            print(f"{size:>7} {scenario:<11}{old_ms:>8.1f} ms{new_ms:>8.1f} ms{old_kept:>10}{new_kept:>10}")
+    print(f"\n🔎 Recent-items plan: {plan[-1][-1]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
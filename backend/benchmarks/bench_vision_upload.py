@@ -0,0 +1,107 @@
+"""
+Bytes sent to vision providers before and after per-provider upload profiles.
+
+Samples are generated (the repo ships no photos): a phone-camera JPEG that
+goes through the normal ingest and whose master Gemini used to receive, and
+SDXL-sized PNGs like the ones Stability returns for outfit analysis on GROQ.
+
+Provider latency is not measured here - there is no network in the loop.
+Reported instead: payload bytes (raw and base64), preparation time, the
+estimated upload time on a given uplink and, for Gemini, image tokens
+(258 per 768px tile; images within 384px on both sides are a single tile).
+
+    cd backend
+    python -m benchmarks.bench_vision_upload --uplink-mbps 10
+"""
+import argparse
+import contextlib
+import io
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.services.image_service import UPLOAD_PROFILES, ImageService
+from app.services.image_store import ImageStore
+
+
+def synthetic_photo(width: int, height: int, noise: float, seed: int = 0) -> Image.Image:
+    """A garment-like subject on a soft backdrop, with sensor-style noise"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    backdrop = np.stack([200 + 30 * x / width, 195 + 20 * y / height, np.full(x.shape, 185.0)], axis=-1)
+    image = Image.fromarray(np.clip(backdrop, 0, 255).astype(np.uint8))
+
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle([width * 0.2, height * 0.1, width * 0.8, height * 0.9],
+                           radius=width // 12, fill=(30, 50, 110))
+    for stripe in range(int(height * 0.12), int(height * 0.88), max(4, height // 40)):
+        draw.line([(width * 0.22, stripe), (width * 0.78, stripe)], fill=(220, 220, 230), width=max(1, height // 160))
+    image = image.filter(ImageFilter.GaussianBlur(1))
+
+    pixels = np.asarray(image, dtype=np.float32) + rng.normal(0, noise, (height, width, 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def gemini_tokens(size) -> int:
+    width, height = size
+    if width <= 384 and height <= 384:
+        return 258
+    return math.ceil(width / 768) * math.ceil(height / 768) * 258
+
+
+def base64_size(size: int) -> int:
+    return 4 * math.ceil(size / 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uplink-mbps", type=float, default=10.0, help="for the upload-time estimate")
+    parser.add_argument("--repeat", type=int, default=5, help="preparations timed per sample")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    images = ImageService(ImageStore(tmp / "store"))
+
+    # Phone photo: before, Gemini got the ingested master as-is
+    phone = tmp / "phone.jpg"
+    synthetic_photo(4000, 3000, noise=10).save(phone, "JPEG", quality=92)
+    master = images.ingest(phone.read_bytes())
+    master_size = (master.variants["width"], master.variants["height"])
+
+    samples = [("12 MP photo master", "gemini", master.master_bytes, master_size)]
+    for width, height in ((768, 1344), (1024, 1024)):
+        path = tmp / f"sdxl_{width}x{height}.png"
+        synthetic_photo(width, height, noise=6, seed=width).save(path, "PNG")
+        samples.append((f"SDXL {width}x{height} PNG", "groq", path, (width, height)))
+
+    bytes_per_second = args.uplink_mbps * 1e6 / 8
+    print(f"🧪 Uplink {args.uplink_mbps:g} Mbps, best of {args.repeat} preparations\n")
+    print(f"{'sample':<22}{'profile':<8}{'size':>11}{'sent':>10}{'base64':>10}{'upload':>9}{'prep':>8}{'tokens':>8}")
+
+    for name, provider, source, size in samples:
+        profile = UPLOAD_PROFILES[provider]
+        raw = len(source) if isinstance(source, bytes) else source.stat().st_size
+
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                prepared = images.prepare_upload(source, profile)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        sent, sent_size = (len(prepared.data), prepared.size) if prepared else (raw, size)
+        for label, payload, dims, prep in (("before", raw, size, None), ("after", sent, sent_size, min(timings))):
+            print(f"{name if label == 'before' else '':<22}{label if label == 'before' else profile.name:<8}"
+                  f"{dims[0]:>5}x{dims[1]:<5}{payload / 1024:>7.0f} KB{base64_size(payload) / 1024:>7.0f} KB"
+                  f"{base64_size(payload) / bytes_per_second * 1000:>6.0f} ms"
+                  f"{'' if prep is None else f'{prep:.0f} ms':>8}"
+                  f"{gemini_tokens(dims) if provider == 'gemini' else '':>8}")
+        print(f"{'':<22}{'':<8}{'':>11}{f'-{100 * (1 - sent / raw):.0f}%':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Wardrobe search benchmark: FTS5 vs the ILIKE paths on a synthetic wardrobe.
+
+    cd backend
+    python -m benchmarks.bench_wardrobe_search --items 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.wardrobe import WardrobeItem
+from app.services.wardrobe_search_service import WardrobeSearchService
+
+COLORS = ["burgundy", "navy blue", "emerald green", "mustard yellow", "black", "white",
+          "beige", "blush pink", "charcoal grey", "olive", "maroon", "teal"]
+TYPES = ["shirt", "kurta", "kurti", "anarkali", "jeans", "maxi dress", "saree",
+         "lehenga", "blazer", "chinos", "sneakers", "tote bag"]
+FABRICS = ["cotton", "silk", "linen", "denim", "chiffon", "georgette", "wool"]
+BRANDS = ["Fabindia", "Zara", "H&M", "Biba", "W", "Levis", "Uniqlo", "Manyavar"]
+OCCASIONS = ["office", "party", "wedding", "casual", "festive", "vacation", "date night"]
+
+QUERIES = ["burgundy", "silk saree", "navy", "fabindia kurta", "wedd", "emerald green anarkali"]
+
+
+def synthetic_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    for _ in range(n):
+        color, type_, fabric = rng.choice(COLORS), rng.choice(TYPES), rng.choice(FABRICS)
+        yield {
+            "name": f"{color.title()} {fabric.title()} {type_.title()}",
+            "category": "Tops",
+            "type": type_,
+            "color": color,
+            "pattern": "solid",
+            "material": fabric,
+            "brand": rng.choice(BRANDS),
+            "description": f"{color} solid {type_}",
+            "occasions": rng.sample(OCCASIONS, 2),
+        }
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    print(f"🧪 Building {args.items} synthetic wardrobe items...")
+    rows = list(synthetic_rows(args.items))
+    with engine.begin() as conn:
+        conn.execute(insert(WardrobeItem), rows)
+
+    service = WardrobeSearchService()
+    start = time.perf_counter()
+    service.setup(engine)
+    print(f"   FTS index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    db = sessionmaker(bind=engine)()
+
+    print(f"\n{'query':<24}{'color ILIKE':>14}{'multi ILIKE':>14}{'FTS5':>10}{'hits':>8}")
+    for q in QUERIES:
+        # Current path: leading-wildcard scan on a single column
+        legacy_ms, _ = timed(
+            lambda: db.query(WardrobeItem.id).filter(WardrobeItem.color.ilike(f"%{q}%"))
+                .order_by(WardrobeItem.id.desc()).limit(50).all(),
+            args.repeat
+        )
+
+        service.fts_enabled = False
+        ilike_ms, _ = timed(lambda: service.search_ids(db, q, 50), args.repeat)
+
+        service.fts_enabled = True
+        fts_ms, hits = timed(lambda: service.search_ids(db, q, 50), args.repeat)
+
+        print(f"{q:<24}{legacy_ms:>11.2f} ms{ilike_ms:>11.2f} ms{fts_ms:>7.2f} ms{hits:>8}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Write cost of wear logging: one transaction per tap (insert the wear_logs
+rows, bump wear_count / last_worn, commit) against the batching WearLogWriter
+(one transaction per flush for every tap queued meanwhile).
+
+Concurrent clients each send taps - a mix of single items and 4-item outfits
+- against a temporary SQLite file with the app's pragmas, once with
+synchronous=NORMAL (the default; in WAL mode commits are not fsynced) and
+once with synchronous=FULL (every commit is fsynced). Reports taps per
+second, p50/p95 tap latency (until the wear is committed) and commits.
+
+    cd backend
+    python -m benchmarks.bench_wear_log --clients 32 --taps 40
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.database import Base, sqlite_pragmas
+from app.models.analytics import WearLog
+from app.models.wardrobe import WardrobeItem
+from app.services.wear_log_service import ITEM_COUNTERS, WearLogWriter
+
+settings = get_settings()
+
+ITEMS = 300
+
+
+def session_factory(path: str, synchronous: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        for name, value in {**sqlite_pragmas(), "synchronous": synchronous}.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(WardrobeItem), [{"name": f"Item {i}", "type": "shirt"} for i in range(ITEMS)])
+    return engine, sessionmaker(bind=engine)
+
+
+def per_tap(sessions):
+    # The straightforward handler: its own transaction and commit for every tap
+    def tap(user_id, item_ids, outfit_id):
+        worn = datetime.now(timezone.utc)
+        db = sessions()
+        try:
+            db.execute(insert(WearLog), [{"user_id": user_id, "item_id": i, "outfit_id": outfit_id, "worn_date": worn}
+                                         for i in item_ids])
+            db.execute(ITEM_COUNTERS, [{"b_id": i, "b_count": 1, "b_worn": worn} for i in item_ids])
+            db.commit()
+        finally:
+            db.close()
+    return tap
+
+
+def batched(writer):
+    def tap(user_id, item_ids, outfit_id):
+        writer.log(user_id, item_ids, outfit_id=outfit_id).result()
+    return tap
+
+
+def drive(tap, clients: int, taps: int, seed: int) -> tuple:
+    latencies, lock = [], threading.Lock()
+
+    def client(index):
+        rng = random.Random(seed + index)
+        for n in range(taps):
+            items = rng.sample(range(1, ITEMS + 1), 4 if n % 3 == 0 else 1)
+            start = time.perf_counter()
+            tap(1, items, n if len(items) > 1 else None)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client, range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--taps", type=int, default=40, help="taps per client")
+    parser.add_argument("--flush-ms", type=int, default=settings.WEAR_LOG_FLUSH_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    total = args.clients * args.taps
+    print(f"{args.clients} clients x {args.taps} taps ({total} taps)\n")
+    print(f"{'synchronous':<13}{'writer':<11}{'taps/s':>9}{'p50':>11}{'p95':>11}{'commits':>9}{'consistent':>12}")
+    for synchronous in ("NORMAL", "FULL"):
+        for name in ("per-tap", "batched"):
+            with tempfile.TemporaryDirectory() as tmp:
+                engine, sessions = session_factory(os.path.join(tmp, "bench.db"), synchronous)
+                writer = WearLogWriter(session_factory=sessions, flush_ms=args.flush_ms)
+                tap = per_tap(sessions) if name == "per-tap" else batched(writer)
+                rate, p50, p95 = drive(tap, args.clients, args.taps, args.seed)
+                writer.stop()
+                commits = total if name == "per-tap" else writer.stats["flushes"]
+                with sessions() as db:
+                    rows = db.scalar(select(func.count()).select_from(WearLog))
+                    counted = db.scalar(select(func.sum(WardrobeItem.wear_count)))
+                engine.dispose()
+            print(f"{synchronous:<13}{name:<11}{rate:>9.0f}{p50:>8.1f} ms{p95:>8.1f} ms{commits:>9}"
+                  f"{'yes' if rows == counted else 'no':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Reclaim upload blobs no wardrobe item or saved outfit points at.
+
+    cd backend
+    python -m scripts.gc_uploads --dry-run
+    python -m scripts.gc_uploads --min-age-hours 24
+"""
+import argparse
+import json
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+from app.services.image_service import image_service
+from app.services.image_store import image_store
+
+
+def referenced_urls() -> set:
+    """Every upload URL still referenced from the database"""
+    urls = set()
+    tables = set(inspect(engine).get_table_names())
+    with engine.connect() as conn:
+        if "wardrobe_items" in tables:
+            for row in conn.execute(text("SELECT image_url, image_variants FROM wardrobe_items")):
+                variants = row.image_variants
+                if isinstance(variants, str):
+                    variants = json.loads(variants or "null")
+                urls.update(image_service.urls_of(row.image_url, variants))
+        if "outfits" in tables:
+            urls.update(row[0] for row in conn.execute(text("SELECT image_path FROM outfits")) if row[0])
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-age-hours", type=float, default=24.0,
+                        help="keep newer blobs (analyzed uploads not saved as items yet)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    referenced = referenced_urls()
+    files, reclaimed = image_store.gc(referenced, args.min_age_hours * 3600, dry_run=args.dry_run)
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"🧹 {verb} {files} unreferenced blobs ({reclaimed / 1024 / 1024:.1f} MB); "
+          f"{len(referenced)} URLs referenced")
+
+
+if __name__ == "__main__":
+    main()
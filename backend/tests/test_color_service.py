@@ -0,0 +1,20 @@
+import pytest
+
+from app.services.color_service import color_service
+
+
+@pytest.mark.parametrize("family, shade", [("blue", "navy blue"), ("red", "maroon"), ("green", "olive")])
+def test_family_preference_matches_its_shades(family, shade):
+    assert color_service.matches(family, shade)
+    assert color_service.matches(shade, family)
+
+
+def test_family_preference_matches_product_title():
+    found = color_service.find_in_text("Nike Navy Blue Running Tee")
+    assert any(color_service.matches("blue", color) for color in found)
+
+
+def test_specific_shades_still_compare_by_delta_e():
+    assert not color_service.matches("navy blue", "sky blue")
+    assert not color_service.matches("light blue", "navy")
+    assert not color_service.matches("blue", "maroon")
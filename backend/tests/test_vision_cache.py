@@ -0,0 +1,54 @@
+from PIL import Image, ImageDraw
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.vision_cache import VisionCacheEntry
+from app.services import vision_cache_service as cache_module
+from app.services.image_service import color_signature, difference_hash
+from app.services.vision_cache_service import VisionCacheService
+
+TEE = [(60, 40), (110, 30), (130, 50), (150, 30), (200, 40), (240, 90), (205, 110), (200, 250),
+       (60, 250), (55, 110), (20, 90)]
+
+
+def tee(color, background=(245, 245, 245)) -> Image.Image:
+    image = Image.new("RGB", (260, 280), background)
+    draw = ImageDraw.Draw(image)
+    draw.polygon(TEE, fill=color)
+    draw.line([(130, 50), (130, 250)], fill=tuple(max(c - 40, 0) for c in color), width=6)  # placket
+    return image
+
+
+def make_cache(tmp_path, monkeypatch) -> VisionCacheService:
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(bind=engine, tables=[VisionCacheEntry.__table__])
+    monkeypatch.setattr(cache_module.settings, "VISION_CACHE_PERCEPTUAL", True)
+    return VisionCacheService(session_factory=sessionmaker(bind=engine))
+
+
+def test_same_shape_different_color_misses(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch)
+    red, navy = tee((200, 30, 30)), tee((25, 35, 110))
+    assert bin(difference_hash(red) ^ difference_hash(navy)).count("1") <= 3  # dHash alone can't tell them apart
+
+    cache.put("red-tee", difference_hash(red), {"color": "red"}, color_signature(red))
+    assert cache.get("navy-tee", difference_hash(navy), color_signature(navy)) is None
+
+
+def test_reshoot_of_same_garment_hits(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch)
+    red, reshoot = tee((200, 30, 30)), tee((205, 36, 34), background=(240, 240, 238))
+
+    cache.put("red-tee", difference_hash(red), {"color": "red"}, color_signature(red))
+    hit = cache.get("red-tee-again", difference_hash(reshoot), color_signature(reshoot))
+    assert hit is not None and hit.match == "perceptual" and hit.result == {"color": "red"}
+
+
+def test_entry_without_color_only_hits_exactly(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch)
+    red = tee((200, 30, 30))
+
+    cache.put("red-tee", difference_hash(red), {"color": "red"})
+    assert cache.get("other", difference_hash(red), color_signature(red)) is None
+    assert cache.get("red-tee", difference_hash(red), color_signature(red)).match == "exact"
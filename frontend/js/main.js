@@ -1,192 +1,192 @@
-// SmartStyle AI - Main JavaScript
-
-const SmartStyle = {
-    API_BASE_URL: 'http://127.0.0.1:8000',
-    
-    // Token management
-    getToken() {
-        return localStorage.getItem('token');
-    },
-    
-    setToken(token) {
-        localStorage.setItem('token', token);
-    },
-    
-    removeToken() {
-        localStorage.removeItem('token');
-        localStorage.removeItem('user');
-    },
-    
-    // Get current user
-    getCurrentUser() {
-        const userStr = localStorage.getItem('user');
-        return userStr ? JSON.parse(userStr) : null;
-    },
-    
-    // API request helper
-    async apiRequest(endpoint, options = {}) {
-        const url = `${this.API_BASE_URL}${endpoint}`;
-        const token = this.getToken();
-        
-        const defaultHeaders = {
-            'Content-Type': 'application/json'
-        };
-        
-        if (token) {
-            defaultHeaders['Authorization'] = `Bearer ${token}`;
-        }
-        
-        const config = {
-            ...options,
-            headers: {
-                ...defaultHeaders,
-                ...options.headers
-            }
-        };
-        
-        try {
-            const response = await fetch(url, config);
-            
-            if (response.status === 401) {
-                this.removeToken();
-                window.location.href = '/';
-                throw new Error('Unauthorized');
-            }
-            
-            const data = await response.json();
-            
-            if (!response.ok) {
-                throw new Error(data.detail || 'Request failed');
-            }
-            
-            return data;
-        } catch (error) {
-            console.error('API Error:', error);
-            throw error;
-        }
-    },
-    
-    // UI Helpers
-    showAlert(message, type = 'info') {
-        // Remove existing alerts
-        const existingAlert = document.querySelector('.alert-notification');
-        if (existingAlert) {
-            existingAlert.remove();
-        }
-        
-        const alert = document.createElement('div');
-        alert.className = `alert alert-${type} alert-notification`;
-        alert.textContent = message;
-        alert.style.cssText = `
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            z-index: 10000;
-            padding: 1rem 1.5rem;
-            border-radius: 8px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-            max-width: 400px;
-            animation: slideIn 0.3s ease;
-        `;
-        
-        document.body.appendChild(alert);
-        
-        setTimeout(() => {
-            alert.style.animation = 'slideOut 0.3s ease';
-            setTimeout(() => alert.remove(), 300);
-        }, 3000);
-    },
-    
-    showLoading() {
-        let loader = document.getElementById('global-loader');
-        if (!loader) {
-            loader = document.createElement('div');
-            loader.id = 'global-loader';
-            loader.innerHTML = '<div class="spinner"></div>';
-            loader.style.cssText = `
-                position: fixed;
-                top: 0;
-                left: 0;
-                right: 0;
-                bottom: 0;
-                background: rgba(0,0,0,0.5);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                z-index: 99999;
-            `;
-            document.body.appendChild(loader);
-        }
-        loader.style.display = 'flex';
-    },
-    
-    hideLoading() {
-        const loader = document.getElementById('global-loader');
-        if (loader) {
-            loader.style.display = 'none';
-        }
-    }
-};
-
-// Logout functionality
-document.addEventListener('DOMContentLoaded', () => {
-    const logoutBtn = document.getElementById('logout-btn');
-    if (logoutBtn) {
-        logoutBtn.addEventListener('click', (e) => {
-            e.preventDefault();
-            SmartStyle.removeToken();
-            SmartStyle.showAlert('Logged out successfully', 'success');
-            setTimeout(() => {
-                window.location.href = '/';
-            }, 1000);
-        });
-    }
-    
-    // Check auth on protected pages
-    const protectedPages = ['dashboard.html', 'wardrobe.html', 'analytics.html', 'item-details.html'];
-    const currentPage = window.location.pathname.split('/').pop();
-    
-    if (protectedPages.includes(currentPage) && !SmartStyle.getToken()) {
-        window.location.href = '/';
-    }
-});
-
-// Add animations
-const style = document.createElement('style');
-style.textContent = `
-    @keyframes slideIn {
-        from {
-            transform: translateX(100%);
-            opacity: 0;
-        }
-        to {
-            transform: translateX(0);
-            opacity: 1;
-        }
-    }
-    
-    @keyframes slideOut {
-        from {
-            transform: translateX(0);
-            opacity: 1;
-        }
-        to {
-            transform: translateX(100%);
-            opacity: 0;
-        }
-    }
-    
-    .spinner {
-        width: 50px;
-        height: 50px;
-        border: 4px solid rgba(255,255,255,0.3);
-        border-top-color: white;
-        border-radius: 50%;
-        animation: spin 1s linear infinite;
-    }
-    
-    @keyframes spin {
-        to { transform: rotate(360deg); }
-    }
-`;
-document.head.appendChild(style);
+// SmartStyle AI - Main JavaScript
+
+const SmartStyle = {
+    API_BASE_URL: 'http://127.0.0.1:8000',
+    
+    // Token management
+    getToken() {
+        return localStorage.getItem('token');
+    },
+    
+    setToken(token) {
+        localStorage.setItem('token', token);
+    },
+    
+    removeToken() {
+        localStorage.removeItem('token');
+        localStorage.removeItem('user');
+    },
+    
+    // Get current user
+    getCurrentUser() {
+        const userStr = localStorage.getItem('user');
+        return userStr ? JSON.parse(userStr) : null;
+    },
+    
+    // API request helper
+    async apiRequest(endpoint, options = {}) {
+        const url = `${this.API_BASE_URL}${endpoint}`;
+        const token = this.getToken();
+        
+        const defaultHeaders = {
+            'Content-Type': 'application/json'
+        };
+        
+        if (token) {
+            defaultHeaders['Authorization'] = `Bearer ${token}`;
+        }
+        
+        const config = {
+            ...options,
+            headers: {
+                ...defaultHeaders,
+                ...options.headers
+            }
+        };
+        
+        try {
+            const response = await fetch(url, config);
+            
+            if (response.status === 401) {
+                this.removeToken();
+                window.location.href = '/';
+                throw new Error('Unauthorized');
+            }
+            
+            const data = await response.json();
+            
+            if (!response.ok) {
+                throw new Error(data.detail || 'Request failed');
+            }
+            
+            return data;
+        } catch (error) {
+            console.error('API Error:', error);
+            throw error;
+        }
+    },
+    
+    // UI Helpers
+    showAlert(message, type = 'info') {
+        // Remove existing alerts
+        const existingAlert = document.querySelector('.alert-notification');
+        if (existingAlert) {
+            existingAlert.remove();
+        }
+        
+        const alert = document.createElement('div');
+        alert.className = `alert alert-${type} alert-notification`;
+        alert.textContent = message;
+        alert.style.cssText = `
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            z-index: 10000;
+            padding: 1rem 1.5rem;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            max-width: 400px;
+            animation: slideIn 0.3s ease;
+        `;
+        
+        document.body.appendChild(alert);
+        
+        setTimeout(() => {
+            alert.style.animation = 'slideOut 0.3s ease';
+            setTimeout(() => alert.remove(), 300);
+        }, 3000);
+    },
+    
+    showLoading() {
+        let loader = document.getElementById('global-loader');
+        if (!loader) {
+            loader = document.createElement('div');
+            loader.id = 'global-loader';
+            loader.innerHTML = '<div class="spinner"></div>';
+            loader.style.cssText = `
+                position: fixed;
+                top: 0;
+                left: 0;
+                right: 0;
+                bottom: 0;
+                background: rgba(0,0,0,0.5);
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                z-index: 99999;
+            `;
+            document.body.appendChild(loader);
+        }
+        loader.style.display = 'flex';
+    },
+    
+    hideLoading() {
+        const loader = document.getElementById('global-loader');
+        if (loader) {
+            loader.style.display = 'none';
+        }
+    }
+};
+
+// Logout functionality
+document.addEventListener('DOMContentLoaded', () => {
+    const logoutBtn = document.getElementById('logout-btn');
+    if (logoutBtn) {
+        logoutBtn.addEventListener('click', (e) => {
+            e.preventDefault();
+            SmartStyle.removeToken();
+            SmartStyle.showAlert('Logged out successfully', 'success');
+            setTimeout(() => {
+                window.location.href = '/';
+            }, 1000);
+        });
+    }
+    
+    // Check auth on protected pages
+    const protectedPages = ['dashboard.html', 'wardrobe.html', 'analytics.html', 'item-details.html'];
+    const currentPage = window.location.pathname.split('/').pop();
+    
+    if (protectedPages.includes(currentPage) && !SmartStyle.getToken()) {
+        window.location.href = '/';
+    }
+});
+
+// Add animations
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+        to {
+            transform: translateX(0);
+            opacity: 1;
+        }
+    }
+    
+    @keyframes slideOut {
+        from {
+            transform: translateX(0);
+            opacity: 1;
+        }
+        to {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+    }
+    
+    .spinner {
+        width: 50px;
+        height: 50px;
+        border: 4px solid rgba(255,255,255,0.3);
+        border-top-color: white;
+        border-radius: 50%;
+        animation: spin 1s linear infinite;
+    }
+    
+    @keyframes spin {
+        to { transform: rotate(360deg); }
+    }
+`;
+document.head.appendChild(style);